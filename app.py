@@ -4,14 +4,22 @@ Aplicación principal con navegación entre secciones
 """
 from dash import Dash, html, dcc, callback, Output, Input
 import dash_bootstrap_components as dbc
+from flask import jsonify
+from plotly.io.json import to_json_plotly
+import json
 import sys
 import os
 
 # Agregar el directorio raíz al path para imports
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from config.settings import COLORS, PORTS
+from config.settings import COLORS, PORTS, CLIENTSIDE_SERIES, WARMUP
 from src.utils.data_loader import load_fitness_data, get_date_range
+from src.utils.range_view import get_range_view
+from src.utils.result_cache import ResultCache, CALLBACK_RESULTS, data_version
+from src.utils.parallel_builders import get_builder_timings
+from src.utils.warmup import register_warmup, start_warmup, mark_ready, warmup_status
+from src.visualizations.series_payload import SERIES_STORE, build_series_payload
 from src.layouts.main_layout import create_main_layout
 from src.layouts.advanced_layout import create_advanced_layout
 from src.layouts.conclusions_layout import create_conclusions_layout
@@ -115,6 +123,9 @@ app.layout = dbc.Container([
         'end_date': default_end_date.strftime('%Y-%m-%d')
     }),
     
+    # Series diarias completas: se envían una vez y cada pestaña las recorta al rango
+    dcc.Store(id=SERIES_STORE, data=build_series_payload(df) if CLIENTSIDE_SERIES else None),
+    
     # Header
     dbc.Row([
         dbc.Col([
@@ -175,24 +186,50 @@ app.layout = dbc.Container([
 })
 
 
+# Layout de cada pestaña ya serializado, por (pestaña, versión de los datos)
+TAB_LAYOUTS = ResultCache(maxsize=8)
+
+
+def build_tab_layout(active_tab):
+    """
+    Construye el layout de una pestaña como JSON plano
+    
+    Los componentes se serializan una sola vez; Dash envía el dict tal cual.
+    El contenido de las conclusiones lo rellena su propio callback, así que el
+    layout solo lleva el marcador de carga.
+    """
+    if active_tab == "tab-principal":
+        # Días activos de todos los datos (sumas prefijas del DayStore)
+        total_days = get_range_view(df).summary()['active_days']
+        layout = create_main_layout(default_start_date, default_end_date, total_days)
+    elif active_tab == "tab-avanzado":
+        layout = create_advanced_layout(default_start_date, default_end_date)
+    elif active_tab == "tab-conclusiones":
+        layout = create_conclusions_layout(default_start_date, default_end_date)
+    else:
+        layout = html.Div("Selecciona una pestaña")
+    return json.loads(to_json_plotly(layout))
+
+
 # Callback para cambiar el contenido según la pestaña
 @callback(
     Output('tab-content', 'children'),
     Input('tabs', 'active_tab')
 )
 def render_tab_content(active_tab):
-    # Calcular días activos
-    total_days = len(df[df['Recuento de pasos'] > 0])
-    
-    if active_tab == "tab-principal":
-        return create_main_layout(default_start_date, default_end_date, total_days)
-    elif active_tab == "tab-avanzado":
-        return create_advanced_layout(default_start_date, default_end_date)
-    elif active_tab == "tab-conclusiones":
-        from src.utils.data_loader import filter_data_by_date
-        filtered_df = filter_data_by_date(df, default_start_date, default_end_date)
-        return create_conclusions_layout(default_start_date, default_end_date, filtered_df)
-    return html.Div("Selecciona una pestaña")
+    key = (active_tab, data_version(df))
+    found, layout = TAB_LAYOUTS.get(key)
+    if not found:
+        layout = build_tab_layout(active_tab)
+        TAB_LAYOUTS.put(key, layout)
+    return layout
+
+
+# Las pestañas se construyen en el calentamiento: cambiar de pestaña es una consulta a la caché
+register_warmup(
+    'render_tab_content',
+    lambda start_date, end_date: [render_tab_content(tab_id) for tab_id in ("tab-principal", "tab-avanzado", "tab-conclusiones")]
+)
 
 
 # Registrar callbacks de cada sección
@@ -204,6 +241,29 @@ register_conclusions_callbacks(app, df)
 # Servidor para producción
 server = app.server
 
+
+@server.route(WARMUP['ready_path'])
+def ready():
+    """Disponibilidad para el balanceador: 503 hasta terminar el calentamiento"""
+    status = warmup_status()
+    status['callback_cache'] = CALLBACK_RESULTS.stats()
+    status['builders'] = get_builder_timings()
+    return jsonify(status), 200 if status['ready'] else 503
+
+
+# Calentamiento en segundo plano del rango por defecto y de todos los datos (con
+# las fechas como las envía el DatePickerRange, para que coincidan las claves de
+# caché); /ready responde 503 hasta que termina. Con debug=True el proceso padre
+# del recargador solo vigila los archivos y no sirve peticiones: no se calienta.
+_reloader_parent = __name__ == '__main__' and os.environ.get('WERKZEUG_RUN_MAIN') != 'true'
+if not WARMUP['enabled']:
+    mark_ready()
+elif not _reloader_parent:
+    start_warmup({
+        'default': (default_start_date.strftime('%Y-%m-%d'), default_end_date.strftime('%Y-%m-%d')),
+        'all': (min_date.strftime('%Y-%m-%d'), max_date.strftime('%Y-%m-%d'))
+    })
+
 if __name__ == '__main__':
     import os
     print("=" * 60)
@@ -0,0 +1,34 @@
+/*
+ * Sincronización de fechas entre el DatePickerRange de cada pestaña y el
+ * Store compartido ('shared-date-store'), sin ida y vuelta al servidor.
+ *
+ * Las fechas se comparan por día (los valores pueden venir como '2025-01-01'
+ * o '2025-01-01T00:00:00'): si ya coinciden no se escribe nada, así el Store
+ * no vuelve a disparar los callbacks pesados de la pestaña.
+ */
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    fitness: Object.assign({}, (window.dash_clientside || {}).fitness, {
+        // DatePickerRange -> Store
+        pushDates: function(startDate, endDate, current) {
+            if (current && sameDay(current.start_date, startDate) && sameDay(current.end_date, endDate)) {
+                return window.dash_clientside.no_update;
+            }
+            return {start_date: startDate, end_date: endDate};
+        },
+
+        // Store -> DatePickerRange
+        pullDates: function(data, startDate, endDate) {
+            var noUpdate = window.dash_clientside.no_update;
+            if (!data || (sameDay(data.start_date, startDate) && sameDay(data.end_date, endDate))) {
+                return [noUpdate, noUpdate];
+            }
+            return [data.start_date, data.end_date];
+        }
+    })
+});
+
+function sameDay(a, b) {
+    var dayA = a ? String(a).slice(0, 10) : null;
+    var dayB = b ? String(b).slice(0, 10) : null;
+    return dayA === dayB;
+}
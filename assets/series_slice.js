@@ -0,0 +1,232 @@
+/*
+ * Recorte en el navegador de las series diarias (pasos, peso, velocidad, FC).
+ *
+ * El Store 'series-store' trae cada figura construida una vez con todos los
+ * datos (src/visualizations/series_payload.py). Al cambiar el rango solo se
+ * recortan las trazas por fecha y se recalcula lo que depende del rango, con
+ * las mismas reglas que filter_data_by_date y las funciones de gráficos:
+ * una fecha de inicio con hora empieza el día siguiente y una de fin con hora
+ * incluye su día.
+ *
+ * Después cada traza se reduce con LTTB al ancho del gráfico en px (el mismo
+ * algoritmo que src/utils/downsample.py) y pasa a WebGL si sigue siendo larga.
+ * Un zoom (relayoutData) vuelve a recortar la serie completa a la ventana
+ * visible, con más detalle cuanto más estrecha es la ventana.
+ */
+(function() {
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        fitness: Object.assign({}, (window.dash_clientside || {}).fitness, {
+            sliceSeries: function(payload, panelId, startDate, endDate, relayout) {
+                var panel = payload && payload[panelId];
+                // relayout solo llega cuando el callback lo dispara un zoom
+                var ranges = relayout ? zoomRanges(relayout) : {};
+                if (!panel || ranges === null) {
+                    return window.dash_clientside.no_update;
+                }
+                var first = startDate ? firstDay(startDate) : null;
+                var last = endDate ? String(endDate).slice(0, 10) : null;
+
+                var data = panel.figure.data.map(function(trace) {
+                    return sliceTrace(trace, first, last);
+                }).filter(function(trace) {
+                    return panel.optional.indexOf(trace.name) === -1 || sumValues(trace.y) > 0;
+                });
+
+                if (panel.required) {
+                    var required = data.filter(function(trace) { return trace.name === panel.required; })[0];
+                    if (!required || !required.x.length) {
+                        return copy(panel.empty);
+                    }
+                }
+
+                var layout = copy(panel.figure.layout);
+                if (panel.mean_line) {
+                    setMeanLine(layout, data[0].y);
+                }
+
+                var visible = null;
+                Object.keys(ranges).forEach(function(axis) {
+                    layout[axis] = Object.assign(layout[axis] || {}, {range: ranges[axis], autorange: false});
+                });
+                if (ranges.xaxis) {
+                    visible = [String(ranges.xaxis[0]).slice(0, 10), String(ranges.xaxis[1]).slice(0, 10)];
+                }
+                var maxPoints = chartWidth(panelId) || panel.max_points;
+                data = data.map(function(trace) {
+                    return downsampleTrace(trace, visible, maxPoints, panel.webgl_threshold);
+                });
+                return {data: data, layout: layout};
+            }
+        })
+    });
+
+    // Primer día incluido: una fecha con hora distinta de medianoche pasa al día siguiente
+    function firstDay(value) {
+        var text = String(value);
+        var day = text.slice(0, 10);
+        if (text.slice(11).replace(/[0:.]/g, '') === '') {
+            return day;
+        }
+        var next = new Date(day + 'T00:00:00Z');
+        next.setUTCDate(next.getUTCDate() + 1);
+        return next.toISOString().slice(0, 10);
+    }
+
+    // Primera posición de un array ordenado de fechas con valor > day (o >= si inclusive)
+    function bisect(days, day, inclusive) {
+        var lo = 0;
+        var hi = days.length;
+        while (lo < hi) {
+            var mid = (lo + hi) >> 1;
+            if (days[mid] < day || (!inclusive && days[mid] === day)) {
+                lo = mid + 1;
+            } else {
+                hi = mid;
+            }
+        }
+        return lo;
+    }
+
+    function sliceTrace(trace, first, last) {
+        var x = trace.x || [];
+        var lo = first === null ? 0 : bisect(x, first, true);
+        var hi = last === null ? x.length : bisect(x, last, false);
+        var sliced = copy(Object.assign({}, trace, {x: [], y: []}));
+        sliced.x = x.slice(lo, Math.max(lo, hi));
+        sliced.y = (trace.y || []).slice(lo, Math.max(lo, hi));
+        return sliced;
+    }
+
+    // Rangos de ejes de un zoom; {} si vuelve al rango completo y null si no cambia el eje x
+    function zoomRanges(relayout) {
+        if (relayout['xaxis.autorange']) {
+            return {};
+        }
+        var ranges = {};
+        Object.keys(relayout).forEach(function(key) {
+            var dot = key.indexOf('.');
+            var axis = key.slice(0, dot);
+            var prop = key.slice(dot + 1);
+            if (prop === 'range') {
+                ranges[axis] = relayout[key].slice();
+            } else if (prop === 'range[0]' || prop === 'range[1]') {
+                ranges[axis] = ranges[axis] || [null, null];
+                ranges[axis][Number(prop.charAt(6))] = relayout[key];
+            }
+        });
+        if (!ranges.xaxis || ranges.xaxis[0] === null || ranges.xaxis[1] === null) {
+            return null;
+        }
+        return ranges;
+    }
+
+    function chartWidth(panelId) {
+        var el = typeof document !== 'undefined' ? document.getElementById(panelId) : null;
+        return el ? el.offsetWidth : 0;
+    }
+
+    // Ventana visible (con un punto más a cada lado), LTTB y tipo de traza
+    function downsampleTrace(trace, visible, maxPoints, webglThreshold) {
+        var x = trace.x;
+        var y = trace.y;
+        if (visible) {
+            var lo = Math.max(bisect(x, visible[0], true) - 1, 0);
+            var hi = Math.min(bisect(x, visible[1], false) + 1, x.length);
+            x = x.slice(lo, Math.max(lo, hi));
+            y = y.slice(lo, Math.max(lo, hi));
+        }
+        var keep = lttbIndices(x.map(dayNumber), y, maxPoints);
+        trace.x = keep.map(function(i) { return x[i]; });
+        trace.y = keep.map(function(i) { return y[i]; });
+        trace.type = keep.length > webglThreshold ? 'scattergl' : 'scatter';
+        return trace;
+    }
+
+    function dayNumber(day) {
+        return Date.parse(day.slice(0, 10) + 'T00:00:00Z') / 86400000;
+    }
+
+    function isMissing(value) {
+        return value === null || value === undefined || value !== value;
+    }
+
+    // Largest-Triangle-Three-Buckets: igual que lttb_indices en src/utils/downsample.py
+    function lttbIndices(x, y, maxPoints) {
+        var size = x.length;
+        var all = [];
+        if (!maxPoints || maxPoints >= size || maxPoints < 3) {
+            for (var k = 0; k < size; k++) { all.push(k); }
+            return all;
+        }
+        var xSums = [0];
+        var ySums = [0];
+        for (var i = 0; i < size; i++) {
+            xSums.push(xSums[i] + x[i]);
+            ySums.push(ySums[i] + (isMissing(y[i]) ? 0 : y[i]));
+        }
+        var every = (size - 2) / (maxPoints - 2);
+        var indices = [0];
+        var a = 0;
+        for (var bucket = 0; bucket < maxPoints - 2; bucket++) {
+            var start = Math.floor(bucket * every) + 1;
+            var end = Math.floor((bucket + 1) * every) + 1;
+            var nextEnd = Math.min(Math.floor((bucket + 2) * every) + 1, size);
+            var count = nextEnd - end;
+            var avgX = (xSums[nextEnd] - xSums[end]) / count;
+            var avgY = (ySums[nextEnd] - ySums[end]) / count;
+            var ax = x[a];
+            var ay = isMissing(y[a]) ? 0 : y[a];
+            var best = start;
+            var bestArea = -1;
+            for (var j = start; j < end; j++) {
+                if (isMissing(y[j])) {
+                    continue;
+                }
+                var area = Math.abs((ax - avgX) * (y[j] - ay) - (ax - x[j]) * (avgY - ay));
+                if (area > bestArea) {
+                    bestArea = area;
+                    best = j;
+                }
+            }
+            indices.push(best);
+            a = best;
+        }
+        indices.push(size - 1);
+        return indices;
+    }
+
+    function sumValues(values) {
+        var total = 0;
+        for (var i = 0; i < values.length; i++) {
+            total += values[i] || 0;
+        }
+        return total;
+    }
+
+    // Línea horizontal del promedio de los días con valor > 0 (la primera forma y anotación)
+    function setMeanLine(layout, values) {
+        var total = 0;
+        var count = 0;
+        for (var i = 0; i < values.length; i++) {
+            if (values[i] > 0) {
+                total += values[i];
+                count += 1;
+            }
+        }
+        if (!count) {
+            layout.shapes = [];
+            layout.annotations = [];
+            return;
+        }
+        var mean = total / count;
+        var label = String(Math.floor(mean)).replace(/\B(?=(\d{3})+(?!\d))/g, ',');
+        layout.shapes[0].y0 = mean;
+        layout.shapes[0].y1 = mean;
+        layout.annotations[0].y = mean;
+        layout.annotations[0].text = 'Promedio: ' + label;
+    }
+
+    function copy(value) {
+        return JSON.parse(JSON.stringify(value));
+    }
+})();
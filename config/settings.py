@@ -3,9 +3,89 @@ Configuración global del dashboard de fitness
 """
 import os
 
-# Ruta al archivo CSV de datos
+# Ruta al archivo CSV de datos (también puede ser el directorio 'Daily activity
+# metrics' de Google Takeout con un CSV de intervalos por día)
 DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'Daily activity metrics.csv')
 
+# Caché columnar del DataFrame ya procesado (se invalida sola si cambia el CSV)
+DATA_CACHE = {
+    'enabled': os.environ.get('FITNESS_DATA_CACHE', '1') != '0',
+    'dir': os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', '.cache')
+}
+
+# Filas por bloque al leer exportaciones muy grandes (None = leer el CSV de una vez)
+DATA_CHUNK_ROWS = int(os.environ['FITNESS_CHUNK_ROWS']) if os.environ.get('FITNESS_CHUNK_ROWS') else None
+
+# Importación de directorios de Takeout: procesos del pool (None = núcleos de la
+# CPU) y mínimo de archivos nuevos para usar el pool en lugar de leer en serie
+TAKEOUT = {
+    'workers': int(os.environ['FITNESS_TAKEOUT_WORKERS']) if os.environ.get('FITNESS_TAKEOUT_WORKERS') else None,
+    'min_parallel_files': 64
+}
+
+# Caché LRU de las salidas de los callbacks por rango de fechas (ttl en segundos, None = sin caducidad)
+CALLBACK_CACHE = {
+    'enabled': os.environ.get('FITNESS_CALLBACK_CACHE', '1') != '0',
+    'maxsize': 128,
+    'ttl': 3600
+}
+
+# Vistas de rango (RangeView) que se conservan para compartir filas, máscaras y
+# agregados de un mismo rango entre los callbacks de todas las pestañas
+RANGE_VIEW_CACHE = {
+    'maxsize': 32
+}
+
+# Calentamiento al arrancar: antes de servir se ejecutan los cálculos registrados
+# (callbacks por rango, pestañas...) con el rango por defecto y con todos los
+# datos, llenando las cachés. El endpoint ready_path responde 200 al terminar
+# (con los tiempos por cálculo) y 503 mientras tanto (FITNESS_WARMUP=0 lo omite)
+WARMUP = {
+    'enabled': os.environ.get('FITNESS_WARMUP', '1') != '0',
+    'ready_path': '/ready'
+}
+
+# Hilos para construir en paralelo las figuras de un callback (1 = en serie)
+FIGURE_WORKERS = int(os.environ.get('FITNESS_FIGURE_WORKERS', '4'))
+
+# Comprobar cada figura construida como dict contra la que genera plotly
+# (depuración: mucho más lento; ver src/visualizations/figure_builder.py)
+FIGURE_CHECK = os.environ.get('FITNESS_FIGURE_CHECK', '0') == '1'
+
+# Series temporales diarias enviadas una sola vez al navegador, que las recorta
+# al cambiar el rango sin pedir nada al servidor (0 = construirlas en el servidor)
+CLIENTSIDE_SERIES = os.environ.get('FITNESS_CLIENTSIDE_SERIES', '1') != '0'
+
+# Series diarias largas: max_points es el objetivo de la reducción LTTB (≈ ancho
+# del gráfico en px si no se conoce el real) y por encima de webgl_threshold
+# puntos por traza se dibujan con WebGL (Scattergl)
+SERIES_RENDER = {
+    'max_points': 1200,
+    'webgl_threshold': 1000
+}
+
+# Estadísticas móviles superpuestas a las series diarias: columna, (estadístico,
+# días de la ventana) y decimales con los que se envían, por panel. Estadísticos:
+# 'mean', 'median', 'p25', 'p75'. La primera se muestra al cargar; el resto se
+# activan desde la leyenda
+ROLLING_OVERLAYS = {
+    'steps-trend': {
+        'column': 'Recuento de pasos',
+        'stats': [('mean', 7), ('mean', 30), ('mean', 90), ('median', 30)],
+        'decimals': 0
+    },
+    'weight-trend': {
+        'column': 'Peso medio (kg)',
+        'stats': [('mean', 7), ('median', 30)],
+        'decimals': 1
+    },
+    'heart-rate-analysis': {
+        'column': 'Frecuencia cardiaca media (ppm)',
+        'stats': [('median', 7), ('mean', 30)],
+        'decimals': 0
+    }
+}
+
 # Puertos de los servidores
 PORTS = {
     'main': 8050,
@@ -32,6 +112,46 @@ GOALS = {
     'daily_calories': 2000
 }
 
+# Proyección de pasos (pestaña avanzada): regresión con tendencia y efecto por día
+# de la semana sobre los últimos 'window' días del rango, 'horizon' días
+# proyectados, banda de confianza de ±z desviaciones (1.96 = 95%) y modelos
+# ajustados que se conservan por (versión de datos, fin del rango, ventana)
+FORECAST = {
+    'window': 84,
+    'horizon': 30,
+    'z': 1.96,
+    'cache_size': 32
+}
+
+# Explorador de objetivos: límites y paso de cada control deslizante (claves de GOALS)
+GOAL_SLIDERS = {
+    'daily_steps': {'min': 1000, 'max': 25000, 'step': 500},
+    'daily_distance': {'min': 0.5, 'max': 20, 'step': 0.5},
+    'daily_calories': {'min': 1000, 'max': 4000, 'step': 50}
+}
+
+# Rachas de días seguidos (pestaña de conclusiones): 'active' son los días con
+# pasos y el resto los días que alcanzan el objetivo de GOALS indicado
+STREAKS = {
+    'active': {'label': 'Días activos', 'goal': None},
+    'steps': {'label': 'Objetivo de pasos', 'goal': 'daily_steps'},
+    'distance': {'label': 'Objetivo de distancia', 'goal': 'daily_distance'},
+    'calories': {'label': 'Objetivo de calorías', 'goal': 'daily_calories'}
+}
+
+# Límites inferiores (días) de los tramos de la distribución de huecos entre
+# rachas de días activos: 1, 2-3, 4-7, 8-14, 15-30 y 31 o más
+STREAK_GAP_BINS = [1, 2, 4, 8, 15, 31]
+
+# Tramos de pasos diarios de la distribución de actividad (en el orden en que se
+# muestran). 'min' es el límite inferior incluido; con 0 el tramo empieza en los
+# días con algún paso (los días sin pasos no cuentan)
+STEP_BANDS = [
+    {'label': '🏆 Excelente (≥10k)', 'min': 10000, 'color': COLORS['success']},
+    {'label': '😊 Bueno (5k-10k)', 'min': 5000, 'color': COLORS['warning']},
+    {'label': '📉 Bajo (<5k)', 'min': 0, 'color': COLORS['secondary']}
+]
+
 # Configuración de visualizaciones
 CHART_CONFIG = {
     'plot_bgcolor': 'rgba(0,0,0,0)',
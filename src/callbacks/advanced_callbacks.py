@@ -1,48 +1,33 @@
 """
 Callbacks del dashboard avanzado
 """
-from dash import Output, Input, callback, html
+from dash import Output, Input, State, Patch, callback, ctx, html
+from dash.exceptions import PreventUpdate
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from config.settings import COLORS
-from src.utils.data_loader import filter_data_by_date
-from src.utils.formatters import (
-    format_number, format_distance, format_calories,
-    format_time_minutes, format_world_laps
-)
+from config.settings import COLORS, CLIENTSIDE_SERIES, GOALS
+from src.callbacks.date_sync import register_date_sync
+from src.callbacks.series_callbacks import register_series_panels, register_series_zoom
+from src.utils.data_loader import count_days_at_least
+from src.utils.range_view import get_range_view
+from src.utils.result_cache import cached_range_callback
+from src.utils.warmup import register_warmup
+from src.utils.formatters import format_summary_cards
+from src.layouts.advanced_layout import LAZY_PANELS, VISIBILITY_STORE, VISIBILITY_JS
 from src.visualizations.advanced_charts import (
-    create_heatmap_calendar, create_weight_trend_chart, create_speed_analysis_chart,
-    create_heart_rate_chart, create_year_comparison_chart, create_goals_progress_chart,
+    create_heatmap_calendar, create_year_comparison_chart, create_goals_progress_chart, goal_bars,
     create_intensity_chart, create_predictive_chart
 )
+from src.visualizations.series_payload import build_series_figure
 
 
 def register_advanced_callbacks(app, df):
     """Registra todos los callbacks del dashboard avanzado"""
     
-    # Callback para sincronizar fechas al Store compartido
-    @callback(
-        Output('shared-date-store', 'data', allow_duplicate=True),
-        Input('adv-date-range', 'start_date'),
-        Input('adv-date-range', 'end_date'),
-        prevent_initial_call=True
-    )
-    def sync_adv_dates(start_date, end_date):
-        """Actualiza el store compartido cuando cambian las fechas en análisis avanzado"""
-        return {'start_date': start_date, 'end_date': end_date}
-    
-    # Callback para actualizar el DatePickerRange desde el Store
-    @callback(
-        Output('adv-date-range', 'start_date', allow_duplicate=True),
-        Output('adv-date-range', 'end_date', allow_duplicate=True),
-        Input('shared-date-store', 'data'),
-        prevent_initial_call=True
-    )
-    def update_adv_date_picker(date_data):
-        """Actualiza el DatePickerRange cuando cambia el store compartido"""
-        return date_data['start_date'], date_data['end_date']
+    # Sincronizar fechas con el Store compartido (en el navegador)
+    register_date_sync(app, 'adv-date-range')
     
     @callback(
         Output('adv-total-steps', 'children'),
@@ -53,63 +38,147 @@ def register_advanced_callbacks(app, df):
         Output('adv-avg-calories', 'children'),
         Output('adv-total-active-minutes', 'children'),
         Output('adv-active-hours', 'children'),
-        Output('heatmap-calendar', 'figure'),
-        Output('weight-trend', 'figure'),
-        Output('speed-analysis', 'figure'),
-        Output('heart-rate-analysis', 'figure'),
-        Output('year-comparison', 'figure'),
-        Output('goals-progress', 'figure'),
-        Output('top-rankings', 'children'),
-        Output('intensity-analysis', 'figure'),
-        Output('predictive-analysis', 'figure'),
         Input('adv-date-range', 'start_date'),
         Input('adv-date-range', 'end_date')
     )
-    def update_advanced_dashboard(start_date, end_date):
-        # Filtrar datos
-        filtered_df = filter_data_by_date(df, start_date, end_date)
-        
-        # Calcular métricas para tarjetas
-        filtered_total_steps = filtered_df['Recuento de pasos'].sum()
-        filtered_total_distance = filtered_df['Distancia_km'].sum()
-        filtered_total_calories = filtered_df['Calorías (kcal)'].sum()
-        filtered_total_active_minutes = filtered_df['Recuento de Minutos Activos'].sum()
-        filtered_days = len(filtered_df[filtered_df['Recuento de pasos'] > 0])
-        filtered_avg_steps = filtered_df[filtered_df['Recuento de pasos'] > 0]['Recuento de pasos'].mean() if filtered_days > 0 else 0
-        
-        # Formatear valores de tarjetas
-        card_total_steps = format_number(filtered_total_steps)
-        card_avg_steps = f"~{format_number(filtered_avg_steps)} pasos/día" if filtered_days > 0 else "Sin datos"
-        card_total_distance = format_distance(filtered_total_distance)
-        card_distance_world = format_world_laps(filtered_total_distance)
-        card_total_calories = format_number(filtered_total_calories)
-        card_avg_calories = f"~{format_number(filtered_total_calories/filtered_days)} kcal/día" if filtered_days > 0 else "Sin datos"
-        card_total_active_minutes = format_number(filtered_total_active_minutes)
-        card_active_hours = format_time_minutes(filtered_total_active_minutes)
-        
-        # Crear visualizaciones
-        heatmap_fig = create_heatmap_calendar(filtered_df)
-        weight_fig = create_weight_trend_chart(filtered_df)
-        speed_fig = create_speed_analysis_chart(filtered_df)
-        hr_fig = create_heart_rate_chart(filtered_df)
-        year_fig = create_year_comparison_chart(df)  # Usar df completo para comparar años
-        goals_fig = create_goals_progress_chart(filtered_df)
-        intensity_fig = create_intensity_chart(filtered_df)
-        predictive_fig = create_predictive_chart(filtered_df)
-        
-        # Crear tabla de rankings
-        rankings_table = create_top_rankings_table(filtered_df)
+    @cached_range_callback(df)
+    def update_advanced_cards(start_date, end_date):
+        """Tarjetas: totales del rango en O(1) con el índice de sumas prefijas (primer pintado)"""
+        return format_summary_cards(get_range_view(df, start_date, end_date).summary())
+    
+    # Paneles que dependen del rango: cada uno con su propio callback
+    range_builders = {
+        'top-rankings': create_top_rankings_table,
+        'intensity-analysis': create_intensity_chart
+    }
+    for panel_id, builder in range_builders.items():
+        _register_range_panel(df, panel_id, builder)
+    
+    # Series diarias (con sus estadísticas móviles): se recortan en el navegador
+    # sin volver al servidor, o se construyen aquí con FITNESS_CLIENTSIDE_SERIES=0
+    series_panels = ['weight-trend', 'speed-analysis', 'heart-rate-analysis']
+    if CLIENTSIDE_SERIES:
+        register_series_panels(app, 'adv-date-range', series_panels)
+    else:
+        for panel_id in series_panels:
+            _register_range_panel(
+                df, panel_id, lambda view, panel_id=panel_id: build_series_figure(view, panel_id)
+            )
+        register_series_zoom(df, 'adv-date-range', series_panels)
+    
+    # Heatmap, objetivos y proyección: estructuras precalculadas del DayStore (no recorren los días del rango)
+    _register_range_panel(df, 'heatmap-calendar', lambda view: create_heatmap_calendar(view.calendar()))
+    _register_range_panel(df, 'goals-progress', lambda view: create_goals_progress_chart(view.goal_days()))
+    _register_range_panel(df, 'predictive-analysis', create_predictive_chart)
+    
+    # Explorador de objetivos: los umbrales de los controles deslizantes se
+    # cuentan con búsquedas binarias en los valores ordenados por año
+    goal_inputs = [Input(f'goal-explorer-{goal}', 'value') for goal in GOALS]
+    
+    @callback(
+        Output('goal-explorer', 'figure'),
+        *goal_inputs,
+        Input('adv-date-range', 'start_date'),
+        Input('adv-date-range', 'end_date'),
+        Input(VISIBILITY_STORE, 'data')
+    )
+    def update_goal_explorer(*args):
+        """Mientras se arrastra un control solo se envían las barras (Patch), no la figura"""
+        *values, start_date, end_date, visibility = args
+        _require_visible('goal-explorer', visibility)
+        goals = {goal: GOALS[goal] if value is None else value for goal, value in zip(GOALS, values)}
+        goal_days = count_days_at_least(df, goals, start_date, end_date)
+        if not str(ctx.triggered_id).startswith('goal-explorer-'):
+            return create_goals_progress_chart(goal_days, goals)
         
-        return (card_total_steps, card_avg_steps, card_total_distance, card_distance_world,
-                card_total_calories, card_avg_calories, card_total_active_minutes, card_active_hours,
-                heatmap_fig, weight_fig, speed_fig, hr_fig, year_fig, goals_fig,
-                rankings_table, intensity_fig, predictive_fig)
+        bars = goal_bars(goal_days, goals)
+        patch = Patch()
+        for prop, value in bars.items():
+            patch['data'][0][prop] = value
+        return patch
+    
+    # Calentamiento del explorador con los objetivos por defecto (no usa la caché
+    # de callbacks: solo recorre en frío el índice de umbrales)
+    register_warmup(
+        'advanced:goal-explorer',
+        lambda start_date, end_date: create_goals_progress_chart(count_days_at_least(df, GOALS, start_date, end_date))
+    )
+    
+    # Comparativa anual: usa todos los años, se calcula una sola vez
+    year_fig = []
+    
+    def year_comparison_figure():
+        """Comparativa año vs año de todos los datos (memorizada)"""
+        if not year_fig:
+            year_fig.append(create_year_comparison_chart(get_range_view(df).aggregate('year')))
+        return year_fig[0]
+    
+    register_warmup('advanced:year-comparison', lambda start_date, end_date: year_comparison_figure())
+    
+    @callback(
+        Output('year-comparison', 'figure'),
+        Input(VISIBILITY_STORE, 'data')
+    )
+    def update_year_comparison(visibility):
+        """Renderiza la comparativa año vs año cuando el panel entra en pantalla"""
+        _require_visible('year-comparison', visibility)
+        return year_comparison_figure()
+    
+    # Detección de paneles visibles en el navegador (sin ida y vuelta al servidor)
+    app.clientside_callback(
+        VISIBILITY_JS,
+        Output(VISIBILITY_STORE, 'data'),
+        Output('adv-visibility-check', 'disabled'),
+        Input('adv-visibility-check', 'n_intervals'),
+        State(VISIBILITY_STORE, 'data')
+    )
+
+
+def _register_range_panel(df, panel_id, builder):
+    """
+    Registra el callback de un panel que depende del rango de fechas
+    
+    El panel se calcula solo cuando está (o ha estado) en pantalla y su
+    resultado se memoriza por rango como el resto de callbacks.
+    
+    Args:
+        df: DataFrame con todos los datos
+        panel_id: ID del componente (su propiedad se toma de LAZY_PANELS)
+        builder: Función que recibe el RangeView del rango (compartido con el
+            resto de paneles y pestañas) y devuelve el contenido
+    """
+    @cached_range_callback(df, name=f'advanced:{panel_id}')
+    def build_panel(start_date, end_date):
+        return builder(get_range_view(df, start_date, end_date))
+    
+    @callback(
+        Output(panel_id, LAZY_PANELS[panel_id]),
+        Input('adv-date-range', 'start_date'),
+        Input('adv-date-range', 'end_date'),
+        Input(VISIBILITY_STORE, 'data')
+    )
+    def update_panel(start_date, end_date, visibility):
+        _require_visible(panel_id, visibility)
+        return build_panel(start_date, end_date)
+
+
+def _require_visible(panel_id, visibility):
+    """
+    Cancela la actualización de un panel que no está en pantalla
+    
+    Un cambio de fechas solo recalcula los paneles ya vistos; un cambio de
+    visibilidad solo dispara los paneles que acaban de aparecer.
+    """
+    visibility = visibility or {}
+    if panel_id not in visibility.get('seen', []):
+        raise PreventUpdate
+    if ctx.triggered_id == VISIBILITY_STORE and panel_id not in visibility.get('new', []):
+        raise PreventUpdate
 
 
-def create_top_rankings_table(df):
-    """Crea tabla con top 10 mejores días"""
-    top_pasos = df.nlargest(10, 'Recuento de pasos')[['Fecha', 'Recuento de pasos', 'Distancia_km']].copy()
-    top_pasos['Ranking'] = range(1, len(top_pasos) + 1)
+def create_top_rankings_table(view):
+    """Crea tabla con top 10 mejores días del RangeView"""
+    top_pasos = view.recorded().nlargest(10, 'Recuento de pasos')
     
     return html.Div([
         html.Table([
@@ -121,10 +190,10 @@ def create_top_rankings_table(df):
             ])),
             html.Tbody([
                 html.Tr([
-                    html.Td(f"{row['Ranking']}", style={
+                    html.Td(f"{ranking}", style={
                         'text-align': 'center',
                         'padding': '8px',
-                        'color': COLORS['warning'] if row['Ranking'] <= 3 else COLORS['text']
+                        'color': COLORS['warning'] if ranking <= 3 else COLORS['text']
                     }),
                     html.Td(row['Fecha'].strftime('%d/%m/%Y'), style={'padding': '8px', 'color': COLORS['text']}),
                     html.Td(f"{int(row['Recuento de pasos']):,}", style={
@@ -133,7 +202,7 @@ def create_top_rankings_table(df):
                         'font-weight': 'bold'
                     }),
                     html.Td(f"{row['Distancia_km']:.2f} km", style={'padding': '8px', 'color': COLORS['text']})
-                ]) for _, row in top_pasos.iterrows()
+                ]) for ranking, (_, row) in enumerate(top_pasos.iterrows(), start=1)
             ])
         ], style={'width': '100%', 'border-collapse': 'collapse'})
     ])
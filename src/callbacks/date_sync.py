@@ -0,0 +1,38 @@
+"""
+Sincronización de fechas entre pestañas mediante el Store compartido
+"""
+from dash import Output, Input, State, ClientsideFunction
+
+
+def register_date_sync(app, picker_id):
+    """
+    Registra la sincronización (en el navegador) entre un DatePickerRange y el Store compartido
+
+    Ambas direcciones son callbacks de cliente (assets/date_sync.js) con una
+    guarda: si las fechas ya coinciden no se escribe nada, así que un cambio
+    de fecha solo dispara una petición al servidor (la del callback de la pestaña).
+
+    Args:
+        app: Instancia de la aplicación Dash
+        picker_id: ID del DatePickerRange de la pestaña
+    """
+    # DatePickerRange -> Store compartido
+    app.clientside_callback(
+        ClientsideFunction(namespace='fitness', function_name='pushDates'),
+        Output('shared-date-store', 'data', allow_duplicate=True),
+        Input(picker_id, 'start_date'),
+        Input(picker_id, 'end_date'),
+        State('shared-date-store', 'data'),
+        prevent_initial_call=True
+    )
+
+    # Store compartido -> DatePickerRange
+    app.clientside_callback(
+        ClientsideFunction(namespace='fitness', function_name='pullDates'),
+        Output(picker_id, 'start_date', allow_duplicate=True),
+        Output(picker_id, 'end_date', allow_duplicate=True),
+        Input('shared-date-store', 'data'),
+        State(picker_id, 'start_date'),
+        State(picker_id, 'end_date'),
+        prevent_initial_call=True
+    )
@@ -6,42 +6,39 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from config.settings import COLORS
-from src.utils.data_loader import filter_data_by_date
-from src.utils.formatters import (
-    format_number, format_distance, format_calories,
-    format_time_minutes, format_world_laps
-)
+from config.settings import COLORS, CLIENTSIDE_SERIES
+from src.callbacks.date_sync import register_date_sync
+from src.callbacks.series_callbacks import register_series_panels, register_series_zoom
+from src.utils.range_view import get_range_view
+from src.utils.result_cache import cached_range_callback
+from src.utils.parallel_builders import run_builders
+from src.utils.formatters import format_summary_cards
 from src.visualizations.basic_charts import (
-    create_steps_trend_chart, create_activity_pie_chart,
-    create_monthly_metrics_chart, create_weekday_chart
+    create_activity_pie_chart, create_monthly_metrics_chart, create_weekday_chart
 )
+from src.visualizations.series_payload import build_series_figure
 
 
 def register_main_callbacks(app, df):
     """Registra todos los callbacks del dashboard principal"""
     
-    # Callback para sincronizar fechas al Store compartido
-    @callback(
-        Output('shared-date-store', 'data', allow_duplicate=True),
-        Input('date-range', 'start_date'),
-        Input('date-range', 'end_date'),
-        prevent_initial_call=True
-    )
-    def sync_main_dates(start_date, end_date):
-        """Actualiza el store compartido cuando cambian las fechas en el dashboard principal"""
-        return {'start_date': start_date, 'end_date': end_date}
+    # Sincronizar fechas con el Store compartido (en el navegador)
+    register_date_sync(app, 'date-range')
     
-    # Callback para actualizar el DatePickerRange desde el Store
-    @callback(
-        Output('date-range', 'start_date', allow_duplicate=True),
-        Output('date-range', 'end_date', allow_duplicate=True),
-        Input('shared-date-store', 'data'),
-        prevent_initial_call=True
-    )
-    def update_main_date_picker(date_data):
-        """Actualiza el DatePickerRange cuando cambia el store compartido"""
-        return date_data['start_date'], date_data['end_date']
+    # Gráficos del callback: nombre del constructor -> (ID, propiedad)
+    chart_outputs = {
+        'steps_trend': ('steps-trend', 'figure'),
+        'activity_pie': ('activity-distribution', 'figure'),
+        'monthly_metrics': ('monthly-metrics', 'figure'),
+        'weekday': ('weekday-activity', 'figure'),
+        'hierarchical_table': ('hierarchical-table', 'children')
+    }
+    if CLIENTSIDE_SERIES:
+        # La serie diaria de pasos se recorta en el navegador
+        del chart_outputs['steps_trend']
+        register_series_panels(app, 'date-range', ['steps-trend'])
+    else:
+        register_series_zoom(df, 'date-range', ['steps-trend'])
     
     @callback(
         Output('total-steps', 'children'),
@@ -52,59 +49,54 @@ def register_main_callbacks(app, df):
         Output('avg-calories', 'children'),
         Output('total-active-minutes', 'children'),
         Output('active-hours', 'children'),
-        Output('steps-trend', 'figure'),
-        Output('activity-distribution', 'figure'),
-        Output('monthly-metrics', 'figure'),
-        Output('weekday-activity', 'figure'),
-        Output('hierarchical-table', 'children'),
+        *[Output(component_id, prop) for component_id, prop in chart_outputs.values()],
         Input('date-range', 'start_date'),
         Input('date-range', 'end_date')
     )
+    @cached_range_callback(df)
     def update_dashboard(start_date, end_date):
-        # Filtrar datos
-        filtered_df = filter_data_by_date(df, start_date, end_date)
+        # Vista del rango compartida con las otras pestañas (filas, máscaras y agregados una vez)
+        view = get_range_view(df, start_date, end_date)
         
-        # Calcular métricas
-        filtered_total_steps = filtered_df['Recuento de pasos'].sum()
-        filtered_total_distance = filtered_df['Distancia_km'].sum()
-        filtered_total_calories = filtered_df['Calorías (kcal)'].sum()
-        filtered_total_active_minutes = filtered_df['Recuento de Minutos Activos'].sum()
-        filtered_days = len(filtered_df[filtered_df['Recuento de pasos'] > 0])
-        filtered_avg_steps = filtered_df[filtered_df['Recuento de pasos'] > 0]['Recuento de pasos'].mean() if filtered_days > 0 else 0
+        # Tarjetas: totales del rango en O(1) con el índice de sumas prefijas
+        (card_total_steps, card_avg_steps, card_total_distance, card_distance_world,
+         card_total_calories, card_avg_calories, card_total_active_minutes,
+         card_active_hours) = format_summary_cards(view.summary())
         
-        # Formatear valores de tarjetas
-        card_total_steps = format_number(filtered_total_steps)
-        card_avg_steps = f"~{format_number(filtered_avg_steps)} pasos/día" if filtered_days > 0 else "Sin datos"
-        card_total_distance = format_distance(filtered_total_distance)
-        card_distance_world = format_world_laps(filtered_total_distance)
-        card_total_calories = format_number(filtered_total_calories)
-        card_avg_calories = f"~{format_number(filtered_total_calories/filtered_days)} kcal/día" if filtered_days > 0 else "Sin datos"
-        card_total_active_minutes = format_number(filtered_total_active_minutes)
-        card_active_hours = format_time_minutes(filtered_total_active_minutes)
+        # Agregados por periodo desde el cubo precalculado (coste por periodo, no por día)
+        yearly_data = view.aggregate('year')
+        monthly_data = view.aggregate('month')
+        weekday_data = view.aggregate('weekday')
+        band_counts = view.step_bands()
         
-        # Crear gráficos
-        steps_fig = create_steps_trend_chart(filtered_df)
-        activity_fig = create_activity_pie_chart(filtered_df)
-        monthly_fig = create_monthly_metrics_chart(filtered_df)
-        weekday_fig = create_weekday_chart(filtered_df)
-        
-        # Crear tabla jerárquica
-        hierarchical_table = create_hierarchical_table(filtered_df)
+        # Crear gráficos y tabla jerárquica en paralelo (son independientes)
+        builders = {
+            'steps_trend': lambda: build_series_figure(view, 'steps-trend'),
+            'activity_pie': lambda: create_activity_pie_chart(band_counts),
+            'monthly_metrics': lambda: create_monthly_metrics_chart(monthly_data),
+            'weekday': lambda: create_weekday_chart(weekday_data),
+            'hierarchical_table': lambda: create_hierarchical_table(yearly_data, monthly_data)
+        }
+        outputs = run_builders({name: builders[name] for name in chart_outputs}, group='update_dashboard')
         
         return (card_total_steps, card_avg_steps, card_total_distance, card_distance_world,
                 card_total_calories, card_avg_calories, card_total_active_minutes, card_active_hours,
-                steps_fig, activity_fig, monthly_fig, weekday_fig, hierarchical_table)
+                *outputs.values())
 
 
-def create_hierarchical_table(df):
-    """Crea tabla jerárquica año → mes → totales"""
-    import pandas as pd
+def create_hierarchical_table(yearly_data, monthly_data):
+    """
+    Crea tabla jerárquica año → mes → totales
     
-    yearly_data = df.groupby('Año').agg({
-        'Recuento de pasos': 'sum',
-        'Distancia_km': 'sum',
-        'Calorías (kcal)': 'sum'
-    }).reset_index().sort_values('Año', ascending=False)
+    Args:
+        yearly_data: Totales por año (aggregate_by_period(df, 'year', ...))
+        monthly_data: Totales por mes (aggregate_by_period(df, 'month', ...))
+    """
+    yearly_data = yearly_data.sort_values('Año', ascending=False)
+    months_by_year = {
+        year: months.sort_values('Mes', ascending=False)
+        for year, months in monthly_data.groupby('Año')
+    }
     
     rows = []
     for _, year_row in yearly_data.iterrows():
@@ -137,13 +129,7 @@ def create_hierarchical_table(df):
             })
         ]))
         
-        monthly_data = df[df['Año'] == year].groupby(['Mes', 'MesNombre']).agg({
-            'Recuento de pasos': 'sum',
-            'Distancia_km': 'sum',
-            'Calorías (kcal)': 'sum'
-        }).reset_index().sort_values('Mes', ascending=False)
-        
-        for _, month_row in monthly_data.iterrows():
+        for _, month_row in months_by_year.get(year, monthly_data.iloc[:0]).iterrows():
             rows.append(html.Tr([
                 html.Td(f"  ↳ {month_row['MesNombre']}", style={
                     'padding': '10px 15px 10px 40px',
@@ -0,0 +1,83 @@
+"""
+Callbacks de las series temporales diarias (recorte por rango y zoom)
+"""
+from dash import Output, Input, State, callback
+from dash.exceptions import PreventUpdate
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.utils.range_view import get_range_view
+from src.visualizations.series_payload import SERIES_STORE, build_series_figure
+from src.visualizations.series_traces import zoom_ranges, day_window
+
+
+# Callback de cliente: recorta al rango (o a la ventana del zoom) la figura
+# completa del panel y la reduce al ancho del gráfico (assets/series_slice.js)
+SLICE_JS = """
+function(start_date, end_date, relayout, payload) {
+    var triggered = window.dash_clientside.callback_context.triggered.map(function(t) { return t.prop_id; });
+    var zoomed = triggered.indexOf('%(panel)s.relayoutData') !== -1;
+    return window.dash_clientside.fitness.sliceSeries(payload, '%(panel)s', start_date, end_date, zoomed ? relayout : null);
+}
+"""
+
+
+def register_series_panels(app, picker_id, panel_ids):
+    """
+    Registra los paneles de series que se recortan en el navegador
+
+    Un cambio de fechas o un zoom actualiza estos gráficos sin ninguna
+    petición al servidor; las series completas llegan una vez en SERIES_STORE.
+
+    Args:
+        app: Instancia de la aplicación Dash
+        picker_id: ID del DatePickerRange de la pestaña
+        panel_ids: IDs de los dcc.Graph (claves de SERIES_PANELS)
+    """
+    for panel_id in panel_ids:
+        app.clientside_callback(
+            SLICE_JS % {'panel': panel_id},
+            Output(panel_id, 'figure'),
+            Input(picker_id, 'start_date'),
+            Input(picker_id, 'end_date'),
+            Input(panel_id, 'relayoutData'),
+            State(SERIES_STORE, 'data')
+        )
+
+
+def register_series_zoom(df, picker_id, panel_ids):
+    """
+    Registra el zoom de los paneles de series construidos en el servidor
+
+    Sin CLIENTSIDE_SERIES la figura llega reducida con LTTB al ancho nominal;
+    al hacer zoom se vuelve a construir solo con la ventana visible, así que
+    los puntos se reparten en un intervalo más corto (más detalle).
+
+    Args:
+        df: DataFrame con todos los datos
+        picker_id: ID del DatePickerRange de la pestaña
+        panel_ids: IDs de los dcc.Graph (claves de SERIES_PANELS)
+    """
+    for panel_id in panel_ids:
+        _register_zoom_panel(df, picker_id, panel_id)
+
+
+def _register_zoom_panel(df, picker_id, panel_id):
+    """Registra el callback de zoom de un panel de series"""
+    @callback(
+        Output(panel_id, 'figure', allow_duplicate=True),
+        Input(panel_id, 'relayoutData'),
+        State(picker_id, 'start_date'),
+        State(picker_id, 'end_date'),
+        prevent_initial_call=True
+    )
+    def zoom_panel(relayout, start_date, end_date):
+        ranges = zoom_ranges(relayout)
+        if ranges is None:
+            raise PreventUpdate
+        x_range = day_window(ranges['xaxis']) if ranges else None
+        fig = build_series_figure(get_range_view(df, start_date, end_date), panel_id, x_range=x_range)
+        for axis, axis_range in ranges.items():
+            fig['layout'][axis] = {**fig['layout'].get(axis, {}), 'range': axis_range, 'autorange': False}
+        return fig
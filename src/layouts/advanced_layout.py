@@ -1,20 +1,66 @@
 """
 Layout del dashboard avanzado
 """
+import json
 from dash import html, dcc
 import dash_bootstrap_components as dbc
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from config.settings import COLORS, CARD_STYLE
+from config.settings import COLORS, CARD_STYLE, GOALS, GOAL_SLIDERS, FORECAST
 from src.components.cards import create_stat_card
 from src.components.navigation import create_back_button, PORTS
 
 
+# Paneles que se calculan al entrar en pantalla: ID del componente -> propiedad
+LAZY_PANELS = {
+    'heatmap-calendar': 'figure',
+    'weight-trend': 'figure',
+    'speed-analysis': 'figure',
+    'heart-rate-analysis': 'figure',
+    'year-comparison': 'figure',
+    'goals-progress': 'figure',
+    'goal-explorer': 'figure',
+    'top-rankings': 'children',
+    'intensity-analysis': 'figure',
+    'predictive-analysis': 'figure'
+}
+
+# Store con los paneles vistos ('seen') y los que acaban de aparecer ('new')
+VISIBILITY_STORE = 'adv-visible-panels'
+
+# Margen (px) por debajo de la pantalla con el que un panel ya cuenta como visible
+VISIBILITY_MARGIN = 200
+
+# Callback de cliente: comprueba qué paneles están en pantalla y solo actualiza
+# el Store cuando aparece alguno nuevo; con todos vistos desactiva el intervalo
+VISIBILITY_JS = """
+function(n_intervals, visibility) {
+    var panels = %s;
+    var margin = %d;
+    var seen = (visibility && visibility.seen) || [];
+    var fresh = panels.filter(function(id) {
+        if (seen.indexOf(id) !== -1) { return false; }
+        var el = document.getElementById(id);
+        if (!el || el.offsetParent === null) { return false; }
+        var rect = el.getBoundingClientRect();
+        return rect.top < window.innerHeight + margin && rect.bottom > -margin;
+    });
+    var done = seen.length + fresh.length >= panels.length;
+    if (!fresh.length) { return [window.dash_clientside.no_update, done]; }
+    return [{seen: seen.concat(fresh), new: fresh}, done];
+}
+""" % (json.dumps(list(LAZY_PANELS)), VISIBILITY_MARGIN)
+
+
 def create_advanced_layout(first_date, last_date):
     """Crea el layout del dashboard avanzado"""
     return dbc.Container([
+        # Paneles en pantalla (los gráficos se calculan al hacerse visibles)
+        dcc.Store(id=VISIBILITY_STORE, data={'seen': [], 'new': []}),
+        dcc.Interval(id='adv-visibility-check', interval=400),
+        
         # Header
         dbc.Row([
             dbc.Col([
@@ -120,6 +166,20 @@ def create_advanced_layout(first_date, last_date):
             ])
         ], className='mb-4'),
         
+        dbc.Row([
+            dbc.Col([
+                html.Div([
+                    html.H3("🎚️ Explorador de Objetivos", style={'color': COLORS['primary'], 'font-size': '20px', 'margin-bottom': '15px'}),
+                    dbc.Row([
+                        create_goal_slider('daily_steps', "Pasos/día"),
+                        create_goal_slider('daily_distance', "km/día"),
+                        create_goal_slider('daily_calories', "kcal/día")
+                    ]),
+                    dcc.Graph(id='goal-explorer', config={'displayModeBar': False})
+                ], style=CARD_STYLE)
+            ])
+        ], className='mb-4'),
+        
         dbc.Row([
             dbc.Col([
                 html.Div([
@@ -138,10 +198,28 @@ def create_advanced_layout(first_date, last_date):
         dbc.Row([
             dbc.Col([
                 html.Div([
-                    html.H3("🔮 Análisis Predictivo (30 días)", style={'color': COLORS['success'], 'font-size': '20px', 'margin-bottom': '15px'}),
+                    html.H3(f"🔮 Análisis Predictivo ({FORECAST['horizon']} días)", style={'color': COLORS['success'], 'font-size': '20px', 'margin-bottom': '15px'}),
                     dcc.Graph(id='predictive-analysis', config={'displayModeBar': False})
                 ], style=CARD_STYLE)
             ])
         ])
         
     ], fluid=True, style={'background': COLORS['background'], 'padding': '30px', 'min-height': '100vh'})
+
+
+def create_goal_slider(goal, label):
+    """
+    Control deslizante de un objetivo del explorador (ID 'goal-explorer-<clave de GOALS>')
+    
+    Se actualiza mientras se arrastra: cada posición es una petición al servidor.
+    """
+    limits = GOAL_SLIDERS[goal]
+    return dbc.Col([
+        html.Label(label, style={'color': COLORS['text_secondary'], 'font-size': '14px'}),
+        dcc.Slider(
+            id=f'goal-explorer-{goal}',
+            min=limits['min'], max=limits['max'], step=limits['step'], value=GOALS[goal],
+            marks=None, updatemode='drag',
+            tooltip={'placement': 'bottom', 'always_visible': True}
+        )
+    ], xs=12, md=4)
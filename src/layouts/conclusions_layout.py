@@ -4,18 +4,18 @@ Análisis detallado y hallazgos clave
 """
 from dash import html, dcc
 import dash_bootstrap_components as dbc
-import pandas as pd
-from config.settings import COLORS, CARD_STYLE
+from config.settings import COLORS, CARD_STYLE, STREAKS
+from src.visualizations.advanced_charts import create_streaks_chart
+from src.utils.formatters import format_count
 
 
-def create_conclusions_layout(first_date, last_date, df=None):
+def create_conclusions_layout(first_date, last_date):
     """
     Crea el layout de conclusiones con análisis detallado
     
     Args:
         first_date: Fecha inicial del filtro
         last_date: Fecha final del filtro
-        df: DataFrame con los datos (opcional, para contenido inicial)
         
     Returns:
         Layout de Dash con las conclusiones
@@ -75,49 +75,23 @@ def create_conclusions_layout(first_date, last_date, df=None):
             ])
         ], className='mb-4', style={'position': 'relative', 'z-index': '1000'}),
         
-        # Contenido dinámico - generar contenido inicial si hay datos
-        html.Div(
-            id='conclusions-content',
-            children=create_conclusions_content(df) if df is not None else html.Div("Cargando datos...")
-        )
+        # Contenido dinámico: lo rellena el callback de conclusiones con el rango actual
+        html.Div(id='conclusions-content', children=html.Div("Cargando datos..."))
     ])
     
     return layout
 
 
-def create_conclusions_content(df):
+def create_conclusions_content(view):
     """
-    Crea el contenido dinámico de conclusiones basado en datos filtrados
+    Crea el contenido dinámico de conclusiones de un rango
     
     Args:
-        df: DataFrame filtrado con los datos de fitness
+        view: RangeView del rango (estadísticas de view.conclusions())
         
     Returns:
         Layout con las estadísticas y conclusiones
     """
-    # Mapeo de nombres de columnas (por si vienen en inglés o español)
-    col_mapping = {
-        'pasos': ['Recuento de pasos', 'Step count', 'pasos', 'steps'],
-        'distancia': ['Distancia_km', 'Distancia (m)', 'Distance (m)', 'distance'],
-        'calorias': ['Calorías (kcal)', 'Calories (kcal)', 'calorias', 'calories'],
-        'activos': ['Recuento de Minutos Activos', 'Move Minutes count', 'Active minutes count', 'active_minutes'],
-        'fecha': ['Fecha', 'Date', 'fecha', 'date']
-    }
-    
-    # Función para encontrar la columna correcta
-    def find_column(df, possible_names):
-        for name in possible_names:
-            if name in df.columns:
-                return name
-        return None
-    
-    # Filtrar datos activos
-    col_pasos = find_column(df, col_mapping['pasos'])
-    if col_pasos:
-        df_activo = df[df[col_pasos] > 0].copy()
-    else:
-        df_activo = df.copy()
-    
     conclusion_card = {
         'background': f'linear-gradient(135deg, {COLORS["surface"]} 0%, #252b4a 100%)',
         'border-radius': '20px',
@@ -127,90 +101,25 @@ def create_conclusions_content(df):
         'margin-bottom': '20px'
     }
     
-    # Calcular estadísticas con manejo de errores
-    try:
-        # Encontrar columnas correctas
-        col_pasos = find_column(df, col_mapping['pasos'])
-        col_distancia = find_column(df, col_mapping['distancia'])
-        col_calorias = find_column(df, col_mapping['calorias'])
-        col_activos = find_column(df, col_mapping['activos'])
-        col_fecha = find_column(df, col_mapping['fecha'])
-        
-        # Calcular total de pasos
-        if col_pasos and len(df) > 0:
-            total_pasos_raw = df[col_pasos].sum()
-            # Convertir a Python int/float directamente
-            total_pasos = int(float(total_pasos_raw)) if not pd.isna(total_pasos_raw) else 0
-        else:
-            total_pasos = 0
-            
-        # Calcular distancia
-        if col_distancia and len(df) > 0:
-            total_distancia_raw = df[col_distancia].sum()
-            # Si la columna es en metros, convertir a km
-            if 'Distance (m)' in col_distancia or 'Distancia (m)' in col_distancia:
-                total_distancia_raw = total_distancia_raw / 1000
-            total_distancia = float(total_distancia_raw) if not pd.isna(total_distancia_raw) else 0.0
-        else:
-            total_distancia = 0.0
-            
-        # Calcular calorías
-        if col_calorias and len(df) > 0:
-            total_calorias_raw = df[col_calorias].sum()
-            total_calorias = int(float(total_calorias_raw)) if not pd.isna(total_calorias_raw) else 0
-        else:
-            total_calorias = 0
-            
-        # Calcular minutos activos
-        if col_activos and len(df) > 0:
-            total_activos_raw = df[col_activos].sum()
-            total_activos = float(total_activos_raw) if not pd.isna(total_activos_raw) else 0.0
-        else:
-            total_activos = 0.0
-            
-    except (ValueError, TypeError, KeyError, AttributeError) as e:
-        total_pasos = 0
-        total_distancia = 0.0
-        total_calorias = 0
-        total_activos = 0.0
-    
-    # Manejar valores NaN o cero
-    total_activos_valor = total_activos if isinstance(total_activos, (int, float)) else 0
-    if total_activos_valor == 0:
-        horas_activas = 0
-    else:
-        horas_activas = int(total_activos_valor / 60)
-    
-    # Calcular promedio de pasos de forma segura
-    if len(df_activo) > 0 and col_pasos and col_pasos in df_activo.columns:
-        promedio_pasos_raw = df_activo[col_pasos].mean()
-        promedio_pasos = float(promedio_pasos_raw) if not pd.isna(promedio_pasos_raw) else 0.0
-    else:
-        promedio_pasos = 0.0
-        
-    dias_activos = len(df_activo)
-    
-    # Calcular total de días de forma segura
-    if len(df) > 0 and col_fecha and col_fecha in df.columns:
-        fecha_min = df[col_fecha].min()
-        fecha_max = df[col_fecha].max()
-        
-        # Convertir a datetime si es necesario
-        if hasattr(fecha_min, 'to_pydatetime'):
-            fecha_min = fecha_min.to_pydatetime()
-        if hasattr(fecha_max, 'to_pydatetime'):
-            fecha_max = fecha_max.to_pydatetime()
-            
-        if fecha_min is not None and fecha_max is not None:
-            total_dias = max((fecha_max - fecha_min).days + 1, 1)
-        else:
-            total_dias = 1
-    else:
-        total_dias = 1
+    # Todas las estadísticas del rango en un registro (una sola resolución del rango)
+    resumen = view.conclusions()
+    total_pasos = resumen.total_steps
+    total_distancia = resumen.total_distance
+    total_calorias = resumen.total_calories
+    horas_activas = resumen.active_hours
+    dias_activos = resumen.active_days
+    promedio_pasos = resumen.avg_steps
+    total_dias = resumen.total_days
+    años_registro = resumen.years
+    porcentaje_consistencia = resumen.consistency
+    band_counts = resumen.step_bands
+    streaks = resumen.streaks
     
-    # Calcular años y porcentaje de días activos
-    años_registro = total_dias / 365.25
-    porcentaje_consistencia = (dias_activos/total_dias*100) if total_dias > 0 else 0
+    # Rachas de días activos y del objetivo de pasos
+    racha_activa = streaks['active']
+    racha_objetivo = streaks['steps']
+    inicio_racha = (f" (desde el {racha_activa['longest_start']:%d/%m/%Y})"
+                    if racha_activa['longest_start'] is not None else "")
     
     # Determinar mensaje de consistencia
     if porcentaje_consistencia >= 80:
@@ -288,6 +197,8 @@ def create_conclusions_content(df):
                                 f"{dias_activos} días activos de {total_dias} días totales"]),
                         html.Li([html.Strong("Promedio actual: "), 
                                 f"{promedio_pasos:,.0f} pasos por día"]),
+                        html.Li([html.Strong("Días por nivel: "), 
+                                " · ".join(f"{band['label']}: {band['days']:,}" for band in band_counts)]),
                         html.Li([html.Strong("Total recorrido: "), 
                                 f"{total_distancia:,.1f} km"]),
                     ], style={'color': COLORS['text'], 'line-height': '2'}),
@@ -302,6 +213,30 @@ def create_conclusions_content(df):
             ], width=12)
         ]),
         
+        # Rachas
+        dbc.Row([
+            dbc.Col([
+                html.Div([
+                    html.H3("🔥 Rachas y Constancia", 
+                           style={'color': COLORS['primary'], 'margin-bottom': '20px'}),
+                    html.Ul([
+                        html.Li([html.Strong("Racha más larga de actividad: "), 
+                                f"{format_count(racha_activa['longest'], 'día seguido', 'días seguidos')}{inicio_racha}"]),
+                        html.Li([html.Strong("Racha más larga con el objetivo de pasos: "), 
+                                format_count(racha_objetivo['longest'], 'día seguido', 'días seguidos')]),
+                        html.Li([html.Strong("Racha actual: "), 
+                                f"{format_count(racha_activa['current'], 'día activo', 'días activos')} · {format_count(racha_objetivo['current'], 'día', 'días')} con el objetivo de pasos"]),
+                        html.Li([html.Strong("Mayor pausa: "), 
+                                f"{format_count(racha_activa['longest_gap'], 'día seguido', 'días seguidos')} sin actividad"]),
+                        html.Li([html.Strong("Rachas por objetivo: "), 
+                                " · ".join(f"{STREAKS[name]['label']}: {format_count(streak['runs'], 'racha', 'rachas')}, máx. {format_count(streak['longest'], 'día', 'días')}"
+                                           for name, streak in streaks.items() if name != 'active')]),
+                    ], style={'color': COLORS['text'], 'line-height': '2'}),
+                    dcc.Graph(figure=create_streaks_chart(streaks), config={'displayModeBar': False})
+                ], style=conclusion_card)
+            ], width=12)
+        ]),
+        
         # Recomendaciones
         dbc.Row([
             dbc.Col([
@@ -0,0 +1,107 @@
+"""
+Clasificación de días por tramos de una métrica
+
+Cada día se clasifica una sola vez (búsqueda binaria sobre los límites de los
+tramos) y se guardan los conteos acumulados por tramo, así que los días de
+cada tramo en cualquier rango de filas son una resta, O(1). Los tramos de
+pasos (STEP_BANDS) y los objetivos diarios (GOALS) son límites de este índice.
+"""
+import numpy as np
+from config.settings import STEP_BANDS, GOALS
+
+
+class BandIndex:
+    """
+    Conteos acumulados de días por tramo
+
+    El tramo 0 son los días sin valor (NaN o <= 0), el tramo 1 los días con
+    0 < valor < edges[0] y el tramo i + 2 los días con edges[i] <= valor <
+    edges[i + 1] (el último tramo no tiene límite superior).
+
+    Args:
+        values: Valor diario de la métrica (en el orden de las filas)
+        edges: Límites inferiores (incluidos, > 0) de los tramos
+    """
+
+    def __init__(self, values, edges):
+        values = np.asarray(values, dtype=np.float64)
+        self.edges = sorted(set(float(edge) for edge in edges))
+        if any(edge <= 0 for edge in self.edges):
+            raise ValueError("Los límites de los tramos deben ser > 0")
+
+        bands = np.searchsorted(self.edges, values, side='right') + 1
+        bands[~(values > 0)] = 0
+        one_hot = np.zeros((len(values) + 1, len(self.edges) + 2), dtype=np.int64)
+        one_hot[np.arange(1, len(values) + 1), bands] = 1
+        self.prefix = np.cumsum(one_hot, axis=0)
+
+    def counts(self, start, end):
+        """Días de cada tramo entre las posiciones [start, end)"""
+        return self.prefix[end] - self.prefix[start]
+
+    def at_least(self, threshold, start, end):
+        """
+        Días con valor >= threshold entre las posiciones [start, end)
+
+        Args:
+            threshold: 0 (días con valor > 0) o uno de los límites del índice
+        """
+        if threshold <= 0:
+            first_band = 1
+        elif float(threshold) in self.edges:
+            first_band = self.edges.index(float(threshold)) + 2
+        else:
+            raise ValueError(f"{threshold} no es un límite de los tramos ({self.edges})")
+        return int(self.counts(start, end)[first_band:].sum())
+
+
+def build_band_indexes(steps, distance, calories):
+    """
+    Índices de tramos de las métricas con tramos u objetivos diarios
+
+    Args:
+        steps, distance, calories: Valores diarios (en el orden de las filas)
+
+    Returns:
+        dict: 'steps', 'distance' y 'calories' -> BandIndex
+    """
+    step_edges = [band['min'] for band in STEP_BANDS if band['min'] > 0] + [GOALS['daily_steps']]
+    return {
+        'steps': BandIndex(steps, step_edges),
+        'distance': BandIndex(distance, [GOALS['daily_distance']]),
+        'calories': BandIndex(calories, [GOALS['daily_calories']])
+    }
+
+
+def step_band_counts(indexes, start, end):
+    """
+    Días activos de cada tramo de STEP_BANDS entre las posiciones [start, end)
+
+    Returns:
+        list: Un dict por tramo (en el orden de STEP_BANDS) con 'label', 'color' y 'days'
+    """
+    steps = indexes['steps']
+    result = []
+    for band in STEP_BANDS:
+        # Días >= límite del tramo menos los de los tramos superiores
+        above = [other['min'] for other in STEP_BANDS if other['min'] > band['min']]
+        days = steps.at_least(band['min'], start, end)
+        if above:
+            days -= steps.at_least(min(above), start, end)
+        result.append({'label': band['label'], 'color': band['color'], 'days': days})
+    return result
+
+
+def goal_day_counts(indexes, start, end):
+    """
+    Días que alcanzan cada objetivo de GOALS entre las posiciones [start, end)
+
+    Returns:
+        dict: 'active_days' (pasos > 0), 'steps', 'distance' y 'calories'
+    """
+    return {
+        'active_days': indexes['steps'].at_least(0, start, end),
+        'steps': indexes['steps'].at_least(GOALS['daily_steps'], start, end),
+        'distance': indexes['distance'].at_least(GOALS['daily_distance'], start, end),
+        'calories': indexes['calories'].at_least(GOALS['daily_calories'], start, end)
+    }
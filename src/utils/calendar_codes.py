@@ -0,0 +1,97 @@
+"""
+Códigos de calendario y etiquetas en español
+
+Año, mes, día de la semana y semana ISO se calculan como enteros con
+aritmética de datetime64 (sin formatear cadenas fila a fila) y las etiquetas
+se obtienen de tablas pequeñas: el resultado no depende del locale del proceso.
+Las columnas de etiquetas son categóricas, así que guardan solo un código por
+fila y los nombres se materializan cuando un gráfico los necesita.
+"""
+import numpy as np
+import pandas as pd
+
+
+MONTH_NAMES = [
+    'Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
+    'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre'
+]
+MONTH_ABBR = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun', 'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic']
+WEEKDAY_NAMES = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
+
+MONTH_DTYPE = pd.CategoricalDtype(MONTH_NAMES)
+WEEKDAY_DTYPE = pd.CategoricalDtype(WEEKDAY_NAMES)
+
+
+def calendar_codes(dates):
+    """
+    Calcula los códigos de calendario de un array de fechas
+
+    Args:
+        dates: Fechas (array/Series datetime64); NaT produce NaN en año/mes y -1 en el resto
+
+    Returns:
+        dict: 'year' (int16), 'month' (1-12, int8), 'weekday' (lunes=0, int8),
+        'iso_year' (int16) e 'iso_week' (int8)
+    """
+    days = np.asarray(dates).astype('datetime64[D]')
+    valid = ~np.isnat(days)
+    day_numbers = np.where(valid, days.astype(np.int64), 0)
+
+    months = days.astype('datetime64[M]').astype(np.int64)
+    # 1970-01-01 fue jueves
+    weekday = (day_numbers + 3) % 7
+    # La semana ISO pertenece al año de su jueves
+    thursday = day_numbers - weekday + 3
+    iso_year = thursday.astype('datetime64[D]').astype('datetime64[Y]').astype(np.int64) + 1970
+    jan_first = (iso_year - 1970).astype('datetime64[Y]').astype('datetime64[D]').astype(np.int64)
+    iso_week = (thursday - jan_first) // 7 + 1
+
+    codes = {
+        'year': months // 12 + 1970,
+        'month': months % 12 + 1,
+        'weekday': weekday,
+        'iso_year': iso_year,
+        'iso_week': iso_week
+    }
+    dtypes = {'year': np.int16, 'month': np.int8, 'weekday': np.int8, 'iso_year': np.int16, 'iso_week': np.int8}
+    if valid.all():
+        return {key: values.astype(dtypes[key]) for key, values in codes.items()}
+
+    # Con fechas vacías año y mes quedan NaN (como Series.dt.year) y el resto -1
+    result = {}
+    for key, values in codes.items():
+        if key in ('year', 'month'):
+            result[key] = np.where(valid, values, np.nan)
+        else:
+            result[key] = np.where(valid, values, -1).astype(dtypes[key])
+    return result
+
+
+def month_labels(months, abbr=False):
+    """
+    Nombres de mes en español a partir de los números de mes (1-12)
+
+    Args:
+        months: Números de mes (NaN o valores fuera de rango dan NaN)
+        abbr: Usar la abreviatura de tres letras
+
+    Returns:
+        pd.Categorical: Etiquetas con las 12 categorías en orden de calendario
+    """
+    codes = np.nan_to_num(np.asarray(months, dtype=np.float64), nan=0).astype(np.int64) - 1
+    codes[(codes < 0) | (codes > 11)] = -1
+    dtype = pd.CategoricalDtype(MONTH_ABBR) if abbr else MONTH_DTYPE
+    return pd.Categorical.from_codes(codes, dtype=dtype)
+
+
+def weekday_labels(weekdays):
+    """
+    Nombres de día de la semana en español a partir de los códigos (lunes=0)
+
+    Args:
+        weekdays: Códigos de día de la semana (-1 da NaN)
+
+    Returns:
+        pd.Categorical: Etiquetas con los 7 días en orden
+    """
+    return pd.Categorical.from_codes(np.asarray(weekdays, dtype=np.int64), dtype=WEEKDAY_DTYPE)
@@ -0,0 +1,79 @@
+"""
+Rejilla de calendario (semana ISO x día de la semana) para el heatmap
+
+Cada día cae en la fila de su semana (lunes a domingo) y en la columna de su
+día de la semana; las filas son todas las semanas consecutivas de los datos,
+así que la semana 12 de cada año es una fila distinta. La rejilla se llena una
+vez con aritmética de días (sin pivot_table) y un rango de fechas solo recorta
+filas y anula los días de las semanas de los extremos que quedan fuera.
+"""
+import numpy as np
+import pandas as pd
+from src.utils.calendar_codes import calendar_codes
+
+
+class CalendarGrid:
+    """
+    Pasos por semana y día de la semana sobre todos los datos
+
+    Args:
+        days: Días (desde 1970-01-01) de cada fila de datos, en cualquier orden
+        values: Pasos de cada día (solo cuentan los valores > 0; días repetidos se suman)
+    """
+
+    def __init__(self, days, values):
+        days = np.asarray(days, dtype=np.int64)
+        values = np.asarray(values)
+        weekday = (days + 3) % 7
+        mondays = days - weekday
+
+        if len(days):
+            self.first_day = int(days.min())
+            self.last_day = int(days.max())
+            self.first_monday = int(mondays.min())
+            rows = (mondays - self.first_monday) // 7
+            size = int(rows.max()) + 1
+        else:
+            self.first_day = self.last_day = self.first_monday = 0
+            rows = mondays
+            size = 0
+
+        self.values = np.zeros((size, 7), dtype=values.dtype)
+        np.add.at(self.values, (rows, weekday), np.where(values > 0, values, 0))
+
+        # Año y semana ISO de cada fila (los de su lunes)
+        codes = calendar_codes((self.first_monday + 7 * np.arange(size)).astype('datetime64[D]'))
+        self.iso_year = codes['iso_year'].astype(np.int64)
+        self.iso_week = codes['iso_week'].astype(np.int64)
+
+    def slice(self, first_day=None, last_day=None):
+        """
+        Filas de las semanas del rango, con los días fuera del rango a 0
+
+        Args:
+            first_day: Primer día incluido (días desde 1970-01-01, None = sin límite)
+            last_day: Último día incluido (None = sin límite)
+
+        Returns:
+            pd.DataFrame: Índice (AñoISO, SemanaISO), columnas 0-6 (lunes a domingo)
+        """
+        first = self.first_day if first_day is None else max(first_day, self.first_day)
+        last = self.last_day if last_day is None else min(last_day, self.last_day)
+        if not len(self.values) or last < first:
+            return self._frame(slice(0, 0))
+
+        first_weekday = (first + 3) % 7
+        last_weekday = (last + 3) % 7
+        start = (first - first_weekday - self.first_monday) // 7
+        end = (last - last_weekday - self.first_monday) // 7 + 1
+        grid = self._frame(slice(start, end))
+        grid.iloc[0, :first_weekday] = 0
+        grid.iloc[-1, last_weekday + 1:] = 0
+        return grid
+
+    def _frame(self, rows):
+        """DataFrame (copia) de un tramo de filas"""
+        index = pd.MultiIndex.from_arrays(
+            [self.iso_year[rows], self.iso_week[rows]], names=['AñoISO', 'SemanaISO']
+        )
+        return pd.DataFrame(self.values[rows].copy(), index=index, columns=range(7))
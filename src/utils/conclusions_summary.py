@@ -0,0 +1,87 @@
+"""
+Estadísticas de la pestaña de conclusiones en una sola pasada
+
+La página de conclusiones necesita totales, días activos, promedio, días del
+rango, tramos de pasos y rachas. summarize_conclusions() resuelve las filas
+del rango una sola vez y lee todo de las estructuras del DayStore (sumas
+prefijas, tramos y rachas precalculados); sin DayStore recorre una única
+matriz con las columnas de las métricas. El resultado es un registro con
+tipos de Python listo para formatear.
+"""
+from typing import NamedTuple
+import numpy as np
+from src.utils.day_store import get_day_store, SUMMARY_COLUMNS
+from src.utils.data_loader import filter_data_by_date
+from src.utils.bands import build_band_indexes, step_band_counts
+from src.utils.streaks import build_streak_index, with_dates
+
+
+class ConclusionSummary(NamedTuple):
+    """Estadísticas de un rango para la pestaña de conclusiones"""
+    total_steps: int
+    total_distance: float
+    total_calories: int
+    active_hours: int
+    active_days: int
+    # Días naturales entre la primera y la última fecha (al menos 1)
+    total_days: int
+    # Promedio de pasos de los días activos (0 si no hay ninguno)
+    avg_steps: float
+    # Porcentaje de días activos sobre total_days
+    consistency: float
+    years: float
+    # Días por tramo de STEP_BANDS (step_band_counts())
+    step_bands: list
+    # Rachas por condición de STREAKS (como streak_stats())
+    streaks: dict
+
+
+def summarize_conclusions(df, start_date=None, end_date=None):
+    """
+    Calcula todas las estadísticas de la pestaña de conclusiones de un rango
+
+    Args:
+        df: DataFrame con los datos
+        start_date: Fecha de inicio (None para desde el principio)
+        end_date: Fecha de fin (None para hasta el final)
+
+    Returns:
+        ConclusionSummary
+    """
+    store = get_day_store(df)
+    if store is not None:
+        start, end = store.bounds(start_date, end_date)
+        totals = {key: store.range_sum(key, start, end) for key in SUMMARY_COLUMNS}
+        active_days = int(store.range_sum('active_days', start, end))
+        days, bands, streaks = store.days, store.bands, store.streaks
+    else:
+        # Sin DayStore: una matriz días x métricas y una reducción por columnas
+        df = filter_data_by_date(df, start_date, end_date).sort_values('Fecha')
+        values = np.column_stack([
+            df[col].to_numpy(dtype=np.float64, na_value=0.0) for col in SUMMARY_COLUMNS.values()
+        ]) if len(df) else np.zeros((0, len(SUMMARY_COLUMNS)))
+        totals = dict(zip(SUMMARY_COLUMNS, values.sum(axis=0)))
+        columns = dict(zip(SUMMARY_COLUMNS, values.T))
+        steps, distance, calories = columns['total_steps'], columns['total_distance'], columns['total_calories']
+        active_days = int(np.count_nonzero(steps > 0))
+        days = df['Fecha'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        bands = build_band_indexes(steps, distance, calories)
+        streaks = build_streak_index(days, steps, distance, calories)
+        start, end = 0, len(df)
+
+    total_steps = totals['total_steps']
+    first_day, last_day = (int(days[start]), int(days[end - 1])) if end > start else (0, -1)
+    total_days = max(last_day - first_day + 1, 1)
+    return ConclusionSummary(
+        total_steps=int(total_steps),
+        total_distance=float(totals['total_distance']),
+        total_calories=int(totals['total_calories']),
+        active_hours=int(totals['total_active_minutes'] / 60),
+        active_days=active_days,
+        total_days=total_days,
+        avg_steps=float(total_steps / active_days) if active_days > 0 else 0.0,
+        consistency=active_days / total_days * 100,
+        years=total_days / 365.25,
+        step_bands=step_band_counts(bands, start, end),
+        streaks=with_dates(streaks.summary(first_day, last_day))
+    )
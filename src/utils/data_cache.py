@@ -0,0 +1,164 @@
+"""
+Caché columnar en disco del DataFrame procesado
+
+Guarda el DataFrame final de load_fitness_data() en un archivo .npz (una
+entrada por columna) para que cada worker arranque con una sola lectura
+binaria en lugar de volver a parsear el CSV y recalcular las columnas derivadas.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+
+def source_fingerprint(path):
+    """
+    Calcula la huella del archivo de origen (tamaño, mtime y hash del contenido)
+
+    Args:
+        path: Ruta del archivo de datos
+
+    Returns:
+        dict: Huella que identifica la versión exacta del archivo
+    """
+    stat = os.stat(path)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hash': digest.hexdigest()
+    }
+
+
+def _cache_file(path, cache_dir):
+    """Ruta del archivo de caché asociado a un archivo de origen"""
+    path_id = hashlib.blake2b(os.path.abspath(path).encode('utf-8'), digest_size=6).hexdigest()
+    return os.path.join(cache_dir, f"{os.path.basename(path)}.{path_id}.npz")
+
+
+def read_cached_frame(path, fingerprint, version, cache_dir):
+    """
+    Lee el DataFrame cacheado si sigue siendo válido
+
+    Args:
+        path: Ruta del archivo de origen
+        fingerprint: Huella actual del archivo (ver source_fingerprint)
+        version: Versión del esquema de derivación de columnas
+        cache_dir: Directorio de la caché
+
+    Returns:
+        pd.DataFrame o None si no hay caché válida
+    """
+    entry = read_cached_entry(path, version, cache_dir, fingerprint)
+    return None if entry is None else entry[0]
+
+
+def read_cached_entry(path, version, cache_dir, fingerprint=None):
+    """
+    Lee el DataFrame cacheado junto con la huella con la que se guardó
+
+    Sin fingerprint no se valida la huella: el llamador decide qué partes
+    reutilizar (p. ej. los archivos de un directorio que no han cambiado).
+
+    Args:
+        path: Ruta del archivo (o directorio) de origen
+        version: Versión del esquema de derivación de columnas
+        cache_dir: Directorio de la caché
+        fingerprint: Huella esperada (None para no comprobarla)
+
+    Returns:
+        tuple: (pd.DataFrame, huella guardada) o None si no hay caché válida
+    """
+    cache_path = _cache_file(path, cache_dir)
+    if not os.path.exists(cache_path):
+        return None
+
+    try:
+        with np.load(cache_path, allow_pickle=False) as data:
+            meta = json.loads(str(data['__meta__']))
+            if meta['version'] != version:
+                return None
+            if fingerprint is not None and meta['fingerprint'] != fingerprint:
+                return None
+
+            columns = {}
+            for i, col in enumerate(meta['columns']):
+                values = data[f'c{i}']
+                if col['kind'] == 'string':
+                    values = values.astype(object)
+                    values[data[f'c{i}_na']] = np.nan
+                elif col['kind'] == 'category':
+                    values = pd.Categorical.from_codes(
+                        values, categories=data[f'c{i}_cat'].astype(object), ordered=col['ordered']
+                    )
+                elif col['kind'] == 'sparse':
+                    dense = np.full(col['length'], col['fill_value'], dtype=values.dtype)
+                    dense[data[f'c{i}_idx']] = values
+                    values = pd.arrays.SparseArray(dense, fill_value=col['fill_value'])
+                columns[col['name']] = values
+    except (OSError, ValueError, KeyError):
+        # Caché corrupta o de un formato anterior: se regenera
+        return None
+
+    frame = pd.DataFrame(columns, columns=[col['name'] for col in meta['columns']])
+    return frame, meta['fingerprint']
+
+
+def write_cached_frame(df, path, fingerprint, version, cache_dir):
+    """
+    Escribe el DataFrame procesado en la caché de forma atómica
+
+    Args:
+        df: DataFrame ya procesado
+        path: Ruta del archivo de origen
+        fingerprint: Huella del archivo de origen
+        version: Versión del esquema de derivación de columnas
+        cache_dir: Directorio de la caché
+    """
+    arrays = {}
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df[name]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            arrays[f'c{i}'] = series.cat.codes.to_numpy()
+            arrays[f'c{i}_cat'] = series.cat.categories.to_numpy().astype(str)
+            columns.append({'name': name, 'kind': 'category', 'ordered': bool(series.cat.ordered)})
+        elif isinstance(series.dtype, pd.SparseDtype):
+            sparse = series.array
+            arrays[f'c{i}'] = sparse.sp_values
+            arrays[f'c{i}_idx'] = sparse.sp_index.to_int_index().indices
+            columns.append({
+                'name': name, 'kind': 'sparse', 'length': len(sparse),
+                'fill_value': np.asarray(sparse.fill_value).item()
+            })
+        elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+            arrays[f'c{i}'] = series.to_numpy()
+            columns.append({'name': name, 'kind': 'native'})
+        else:
+            na_mask = series.isna().to_numpy()
+            arrays[f'c{i}'] = series.fillna('').to_numpy().astype(str)
+            arrays[f'c{i}_na'] = na_mask
+            columns.append({'name': name, 'kind': 'string'})
+
+    meta = {'version': version, 'fingerprint': fingerprint, 'columns': columns}
+    arrays['__meta__'] = np.array(json.dumps(meta))
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Escribir a un temporal y renombrar: varios workers pueden arrancar a la vez
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, _cache_file(path, cache_dir))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        # La caché es opcional: en un sistema de solo lectura simplemente no se usa
+        pass
@@ -1,78 +1,402 @@
 """
 Utilidades para cargar y procesar datos
 """
+import os
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from config.settings import DATA_PATH
+from config.settings import DATA_PATH, DATA_CACHE, DATA_CHUNK_ROWS, FORECAST, ROLLING_OVERLAYS
+from src.utils.data_cache import source_fingerprint, read_cached_frame, write_cached_frame
+from src.utils.day_store import get_day_store, register_day_store, range_key, THRESHOLD_METRICS
+from src.utils.calendar_grid import CalendarGrid
+from src.utils.bands import build_band_indexes, step_band_counts, goal_day_counts
+from src.utils.forecast import TrendSeasonIndex
+from src.utils.rolling import rolling_stat
+from src.utils.streaks import build_streak_index, with_dates
+from src.utils.result_cache import ResultCache
+from src.utils.rollup import ROLLUP_METRICS, LEVEL_KEYS
+from src.utils.calendar_codes import calendar_codes, month_labels, weekday_labels
+from src.utils.takeout_loader import load_takeout_intervals, reduce_to_daily, takeout_fingerprint
 
+# Versión del procesamiento de columnas: incrementarla invalida la caché en disco
+SCHEMA_VERSION = 5
 
-def load_fitness_data():
+# Modelos de proyección ajustados por (versión de datos, fin del rango, ventana)
+FORECAST_MODELS = ResultCache(maxsize=FORECAST['cache_size'])
+
+# Mapear columnas en inglés a español para compatibilidad con el resto del código
+COLUMN_MAPPING = {
+    'Date': 'Fecha',
+    'Step count': 'Recuento de pasos',
+    'Distance (m)': 'Distancia (m)',
+    'Calories (kcal)': 'Calorías (kcal)',
+    'Move Minutes count': 'Recuento de Minutos Activos',
+    'Active minutes count': 'Recuento de Minutos Activos',
+    'Heart Minutes': 'Recuento de Minutos Activos',
+    'Heart Points': 'Puntos Cardio',
+    'Cardio minutes': 'Minutos de cardio',
+    'Average speed (m/s)': 'Velocidad media (m/s)',
+    'Max speed (m/s)': 'Velocidad máxima (m/s)',
+    'Average weight (kg)': 'Peso medio (kg)',
+    'Max weight (kg)': 'Peso máximo (kg)',
+    'Min weight (kg)': 'Peso mínimo (kg)',
+    'Average heart rate (bpm)': 'Frecuencia cardiaca media (ppm)',
+    'Max heart rate (bpm)': 'Frecuencia cardiaca máxima (ppm)',
+    'Min heart rate (bpm)': 'Frecuencia cardiaca mínima (ppm)'
+}
+
+# Columnas que el resto del código espera y su valor por defecto si faltan
+REQUIRED_COLUMNS = {
+    'Recuento de Minutos Activos': 0,
+    'Velocidad media (m/s)': 0,
+    'Velocidad máxima (m/s)': 0,
+    'Peso medio (kg)': 0,
+    'Peso promedio (kg)': 0,
+    'Peso máximo (kg)': 0,
+    'Peso mínimo (kg)': 0,
+    'Frecuencia cardiaca media (ppm)': 0,
+    'Frecuencia cardiaca máxima (ppm)': 0,
+    'Frecuencia cardiaca mínima (ppm)': 0,
+    'Minutos de cardio': 0,
+    'Puntos Cardio': 0
+}
+
+# Métricas acumulables: los días sin registro cuentan como 0 (el resto queda NaN)
+ZERO_FILL_COLUMNS = {
+    'Recuento de pasos',
+    'Distancia (m)',
+    'Calorías (kcal)',
+    'Recuento de Minutos Activos',
+    'Minutos de cardio',
+    'Puntos Cardio'
+}
+
+# Columna que marca las filas del CSV (False en los días sin registro que añade _densify_days)
+RECORD_COLUMN = 'Día con registro'
+
+# Esquema compacto en memoria. Los conteos enteros solo se reducen si no tienen
+# NaN (en ese caso pasan a float32), las métricas float que se suman en tarjetas
+# y tablas mantienen float64 para no alterar los totales mostrados, el resto de
+# columnas float pasa a float32 y las columnas que son todo ceros se guardan
+# como dispersas.
+COMPACT_SCHEMA = {
+    'Distancia (m)': 'float64',
+    'Distancia_km': 'float64',
+    'Calorías (kcal)': 'float64',
+    'Recuento de pasos': 'int32',
+    'Recuento de Minutos Activos': 'int32',
+    'Minutos de cardio': 'int32',
+    'Puntos Cardio': 'int32',
+    'Año': 'int16',
+    'Mes': 'int8',
+    'DíaSemanaNum': 'int8',
+    'MesNombre': 'category',
+    'DíaSemana': 'category'
+}
+
+
+def load_fitness_data(path=None, use_cache=None, chunk_rows=None, compact=True):
     """
     Carga y preprocesa los datos de Google Fit
     
+    Si la caché está activada, reutiliza el DataFrame ya procesado mientras el
+    archivo de origen no cambie (mismo tamaño, fecha de modificación y contenido).
+    
+    Si path es un directorio de Google Takeout con un CSV por día, los archivos
+    se leen en paralelo y sus intervalos se agregan por día (ver takeout_loader).
+    
+    Args:
+        path: Ruta del CSV o del directorio de Takeout (por defecto DATA_PATH)
+        use_cache: Usar la caché columnar en disco (por defecto DATA_CACHE['enabled'])
+        chunk_rows: Leer el CSV por bloques de este tamaño para acotar la memoria
+            (por defecto DATA_CHUNK_ROWS; None lee el archivo completo; no aplica
+            a directorios de Takeout)
+        compact: Aplicar COMPACT_SCHEMA (con False se obtiene el DataFrame con
+            int64/float64; no usa la caché)
+    
+    Returns:
+        pd.DataFrame: DataFrame con los datos procesados
+    """
+    path = path or DATA_PATH
+    if use_cache is None:
+        use_cache = DATA_CACHE['enabled'] and compact
+    
+    is_takeout = os.path.isdir(path)
+    
+    if use_cache:
+        fingerprint = takeout_fingerprint(path) if is_takeout else source_fingerprint(path)
+        df = read_cached_frame(path, fingerprint, SCHEMA_VERSION, DATA_CACHE['dir'])
+        if df is not None:
+            register_day_store(df)
+            return df
+    
+    if chunk_rows is None:
+        chunk_rows = DATA_CHUNK_ROWS
+    if is_takeout:
+        df = _process_raw_frame(reduce_to_daily(load_takeout_intervals(path, use_cache=use_cache)))
+    elif chunk_rows:
+        df = _build_fitness_frame_chunked(path, chunk_rows)
+    else:
+        df = _build_fitness_frame(path)
+    
+    if compact:
+        df = apply_compact_schema(df)
+    
+    if use_cache:
+        write_cached_frame(df, path, fingerprint, SCHEMA_VERSION, DATA_CACHE['dir'])
+    
+    # Construir el índice por día y las sumas prefijas una sola vez, al cargar
+    register_day_store(df)
+    return df
+
+
+def _build_fitness_frame(path):
+    """
+    Lee el CSV completo y calcula todas las columnas derivadas
+    
+    Args:
+        path: Ruta del CSV
+    
     Returns:
         pd.DataFrame: DataFrame con los datos procesados
     """
     try:
-        df = pd.read_csv(DATA_PATH, encoding='utf-8')
+        df = pd.read_csv(path, encoding='utf-8')
     except UnicodeDecodeError:
-        df = pd.read_csv(DATA_PATH, encoding='latin-1')
-    
-    # Mapear columnas en inglés a español para compatibilidad con el resto del código
-    column_mapping = {
-        'Date': 'Fecha',
-        'Step count': 'Recuento de pasos',
-        'Distance (m)': 'Distancia (m)',
-        'Calories (kcal)': 'Calorías (kcal)',
-        'Move Minutes count': 'Recuento de Minutos Activos',
-        'Active minutes count': 'Recuento de Minutos Activos',
-        'Heart Minutes': 'Recuento de Minutos Activos',
-        'Heart Points': 'Puntos Cardio',
-        'Cardio minutes': 'Minutos de cardio',
-        'Average speed (m/s)': 'Velocidad media (m/s)',
-        'Max speed (m/s)': 'Velocidad máxima (m/s)',
-        'Average weight (kg)': 'Peso medio (kg)',
-        'Max weight (kg)': 'Peso máximo (kg)',
-        'Min weight (kg)': 'Peso mínimo (kg)',
-        'Average heart rate (bpm)': 'Frecuencia cardiaca media (ppm)',
-        'Max heart rate (bpm)': 'Frecuencia cardiaca máxima (ppm)',
-        'Min heart rate (bpm)': 'Frecuencia cardiaca mínima (ppm)'
-    }
+        df = pd.read_csv(path, encoding='latin-1')
+    
+    return _process_raw_frame(df)
+
+
+def _process_raw_frame(df):
+    """
+    Normaliza, completa los días sin registro y calcula las columnas derivadas
+    
+    Args:
+        df: DataFrame con el esquema del CSV diario de Google Fit
+    
+    Returns:
+        pd.DataFrame: DataFrame con los datos procesados
+    """
+    return _derive_columns(_densify_days(_normalize_columns(df)))
+
+
+def _build_fitness_frame_chunked(path, chunk_rows):
+    """
+    Lee el CSV por bloques con memoria acotada
+    
+    Una primera pasada lee solo la columna de fecha para conocer la posición
+    final de cada fila. Después cada bloque se normaliza y deriva por separado
+    y se copia directamente en su posición dentro de arrays reservados de
+    antemano, de modo que el pico de memoria es el tamaño del resultado más un
+    bloque. El resultado es idéntico al de _build_fitness_frame.
+    
+    Args:
+        path: Ruta del CSV
+        chunk_rows: Filas por bloque
+    
+    Returns:
+        pd.DataFrame: DataFrame con los datos procesados
+    """
+    try:
+        return _assemble_chunks(path, chunk_rows, 'utf-8')
+    except UnicodeDecodeError:
+        return _assemble_chunks(path, chunk_rows, 'latin-1')
+
+
+def _assemble_chunks(path, chunk_rows, encoding):
+    """Copia los bloques procesados en su posición final dentro de arrays preasignados"""
+    is_date = lambda col: COLUMN_MAPPING.get(col, col) == 'Fecha'
+    dates = [
+        pd.to_datetime(chunk.iloc[:, 0], format='%Y-%m-%d').to_numpy()
+        for chunk in pd.read_csv(path, encoding=encoding, chunksize=chunk_rows, usecols=is_date)
+    ]
+    if not dates:
+        return _build_fitness_frame(path)
+    dates = np.concatenate(dates)
+    if np.isnat(dates).any():
+        # Sin fecha en alguna fila: se conserva el orden original (igual que _densify_days)
+        positions, n_days = np.arange(len(dates)), len(dates)
+    else:
+        positions, n_days = _day_positions(dates)
+    
+    arrays = {}
+    categories = {}
+    columns = None
+    base_columns = None
+    n_rows = 0
+    
+    for chunk in pd.read_csv(path, encoding=encoding, chunksize=chunk_rows):
+        chunk = _normalize_columns(chunk)
+        if base_columns is None:
+            base_columns = list(chunk.columns)
+        chunk = _derive_columns(chunk)
+        if columns is None:
+            columns = list(chunk.columns)
+        
+        end = n_rows + len(chunk)
+        _scatter(arrays, chunk, columns, positions[n_rows:end], n_days, categories)
+        n_rows = end
+    
+    # Días sin registro: se normalizan y derivan igual que el resto de filas
+    filled = np.zeros(n_days, dtype=bool)
+    filled[positions] = True
+    gaps = np.flatnonzero(~filled)
+    if len(gaps):
+        gap_rows = pd.DataFrame({
+            col: np.full(len(gaps), _gap_fill_value(col, arrays[col].dtype))
+            for col in base_columns if col != 'Fecha'
+        })
+        gap_rows.insert(base_columns.index('Fecha'), 'Fecha', dates.min() + gaps.astype('timedelta64[D]'))
+        _scatter(arrays, _derive_columns(gap_rows), columns, gaps, n_days, categories)
+    
+    for col, dtype in categories.items():
+        arrays[col] = pd.Categorical.from_codes(arrays[col], dtype=dtype)
+    return pd.DataFrame({col: arrays[col] for col in columns}, columns=columns, copy=False)
+
+
+def _scatter(arrays, chunk, columns, positions, size, categories):
+    """
+    Escribe las filas de un bloque en las posiciones indicadas de los arrays finales
+    
+    Las columnas categóricas de calendario tienen categorías fijas: se copian
+    sus códigos y se guarda el dtype en categories para reconstruirlas al final.
+    """
+    for col in columns:
+        series = chunk[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories[col] = series.dtype
+            values = series.cat.codes.to_numpy()
+        else:
+            values = series.to_numpy()
+        target = arrays.get(col)
+        if target is None:
+            target = arrays[col] = np.empty(size, dtype=values.dtype)
+        elif target.dtype != values.dtype:
+            # Un bloque con NaN convierte enteros en float (igual que read_csv completo)
+            dtype = np.result_type(target.dtype, values.dtype)
+            if dtype != target.dtype:
+                target = arrays[col] = target.astype(dtype)
+        target[positions] = values
+
+
+def _day_positions(dates):
+    """
+    Calcula la fila final de cada registro en el DataFrame ordenado por fecha
+    
+    Si cada fecha aparece una sola vez la fila es el número de días desde la
+    primera fecha, dejando huecos para los días sin registro. Con fechas
+    repetidas (o muy dispersas) solo se ordena de forma estable.
+    
+    Args:
+        dates: Array datetime64 con la fecha de cada registro en orden de lectura
+    
+    Returns:
+        tuple: (posiciones, número total de filas)
+    """
+    days = dates.astype('datetime64[D]').astype(np.int64)
+    offsets = days - days.min()
+    n_days = int(offsets.max()) + 1
+    
+    if n_days <= 2 * len(days) + 31 and np.bincount(offsets, minlength=n_days).max() <= 1:
+        return offsets, n_days
+    
+    positions = np.empty(len(days), dtype=np.int64)
+    positions[np.argsort(days, kind='stable')] = np.arange(len(days))
+    return positions, len(days)
+
+
+def _gap_fill_value(col, dtype):
+    """Valor para los días sin registro: 0 en métricas acumulables y enteros, NaN en el resto"""
+    if col == RECORD_COLUMN:
+        return False
+    if col in ZERO_FILL_COLUMNS or np.issubdtype(dtype, np.integer):
+        return 0
+    return np.nan
+
+
+def _densify_days(df):
+    """
+    Ordena por fecha y crea una fila por cada día sin registro
+    
+    Args:
+        df: DataFrame normalizado
+    
+    Returns:
+        pd.DataFrame: DataFrame con un día por fila (o solo ordenado si hay fechas repetidas)
+    """
+    if len(df) == 0 or df['Fecha'].isna().any():
+        return df
+    
+    dates = df['Fecha'].to_numpy()
+    positions, n_rows = _day_positions(dates)
+    if n_rows == len(df) and (positions == np.arange(n_rows)).all():
+        return df
+    
+    gaps = np.ones(n_rows, dtype=bool)
+    gaps[positions] = False
+    columns = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if col == 'Fecha':
+            full = np.empty(n_rows, dtype=dates.dtype)
+            full[gaps] = dates.min() + np.flatnonzero(gaps).astype('timedelta64[D]')
+        else:
+            fill = _gap_fill_value(col, values.dtype)
+            full = np.empty(n_rows, dtype=np.result_type(values.dtype, np.min_scalar_type(fill)))
+            full[gaps] = fill
+        full[positions] = values
+        columns[col] = full
+    
+    return pd.DataFrame(columns, columns=df.columns, copy=False)
+
+
+def _normalize_columns(df):
+    """
+    Renombra columnas, elimina duplicadas, crea las faltantes y convierte la fecha
+    
+    Args:
+        df: DataFrame (o bloque) leído del CSV
     
+    Returns:
+        pd.DataFrame: DataFrame con el esquema en español
+    """
     # Renombrar columnas que existan
-    df.rename(columns={k: v for k, v in column_mapping.items() if k in df.columns}, inplace=True)
+    df = df.rename(columns={k: v for k, v in COLUMN_MAPPING.items() if k in df.columns})
     
     # Eliminar columnas duplicadas (mantener solo la primera ocurrencia)
     df = df.loc[:, ~df.columns.duplicated()]
     
     # Crear columnas faltantes con valores por defecto si no existen
-    required_columns = {
-        'Recuento de Minutos Activos': 0,
-        'Velocidad media (m/s)': 0,
-        'Velocidad máxima (m/s)': 0,
-        'Peso medio (kg)': 0,
-        'Peso promedio (kg)': 0,
-        'Peso máximo (kg)': 0,
-        'Peso mínimo (kg)': 0,
-        'Frecuencia cardiaca media (ppm)': 0,
-        'Frecuencia cardiaca máxima (ppm)': 0,
-        'Frecuencia cardiaca mínima (ppm)': 0,
-        'Minutos de cardio': 0,
-        'Puntos Cardio': 0
-    }
-    for col, default_value in required_columns.items():
+    for col, default_value in REQUIRED_COLUMNS.items():
         if col not in df.columns:
             df[col] = default_value
     
     # Convertir fecha
     df['Fecha'] = pd.to_datetime(df['Fecha'], format='%Y-%m-%d')
+    df[RECORD_COLUMN] = True
     
-    # Calcular métricas derivadas
+    return df
+
+
+def _derive_columns(df):
+    """
+    Calcula las métricas derivadas (fila a fila, válido también por bloques)
+    
+    Args:
+        df: DataFrame normalizado
+    
+    Returns:
+        pd.DataFrame: DataFrame con las columnas derivadas
+    """
     df['Distancia_km'] = (df['Distancia (m)'] / 1000).round(2)
-    df['Año'] = df['Fecha'].dt.year
-    df['Mes'] = df['Fecha'].dt.month
-    df['MesNombre'] = df['Fecha'].dt.strftime('%B')
-    df['DíaSemana'] = df['Fecha'].dt.day_name()
+    # Calendario: códigos enteros vectorizados y etiquetas en español por tabla
+    codes = calendar_codes(df['Fecha'])
+    df['Año'] = codes['year']
+    df['Mes'] = codes['month']
+    df['MesNombre'] = month_labels(codes['month'])
+    df['DíaSemana'] = weekday_labels(codes['weekday'])
+    df['DíaSemanaNum'] = codes['weekday']
     df['Velocidad_kmh'] = (df['Velocidad media (m/s)'] * 3.6).round(2)
     df['Velocidad_max_kmh'] = (df['Velocidad máxima (m/s)'] * 3.6).round(2)
     
@@ -84,16 +408,112 @@ def load_fitness_data():
     return df
 
 
-def calculate_summary_stats(df):
+def apply_compact_schema(df):
     """
-    Calcula estadísticas resumidas del dataset
+    Reduce los tipos de datos del DataFrame según COMPACT_SCHEMA
+    
+    Args:
+        df: DataFrame procesado con tipos por defecto (int64/float64/object)
+    
+    Returns:
+        pd.DataFrame: DataFrame con tipos compactos
+    """
+    for col in df.columns:
+        series = df[col]
+        target = COMPACT_SCHEMA.get(col)
+        
+        if target == 'category':
+            df[col] = series.astype('category')
+            continue
+        if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            continue
+        
+        if pd.api.types.is_integer_dtype(series):
+            dtype = np.dtype(target) if target else series.dtype
+            # Columnas float del esquema que llegan con valores enteros (p. ej. metros sin decimales)
+            if dtype.kind in 'iu' and (series.max() > np.iinfo(dtype).max or series.min() < np.iinfo(dtype).min):
+                dtype = series.dtype
+        else:
+            dtype = np.dtype(target if target and target.startswith('float') else 'float32')
+        
+        if len(series) > 0 and (series == 0).all():
+            # Columnas de relleno (p. ej. peso o frecuencia cardiaca sin datos)
+            df[col] = pd.arrays.SparseArray(np.zeros(len(series), dtype=dtype), fill_value=0)
+        elif dtype != series.dtype:
+            df[col] = series.astype(dtype)
+    
+    return df
+
+
+def original_dtypes(df):
+    """
+    Copia del DataFrame con los tipos de la derivación original
+    
+    Deshace todas las reducciones de memoria, no solo COMPACT_SCHEMA: año, mes
+    y día de la semana como los enteros de los accesores .dt y los nombres de
+    mes y día como cadenas object en lugar de categorías. Los conteos ya son
+    int64, las métricas float64 y las columnas de relleno densas con
+    load_fitness_data(compact=False).
+    
+    Args:
+        df: DataFrame de load_fitness_data(compact=False)
+    
+    Returns:
+        pd.DataFrame: Copia con los tipos originales
+    """
+    df = df.copy()
+    dates = df['Fecha']
+    df['Año'] = dates.dt.year
+    df['Mes'] = dates.dt.month
+    df['DíaSemanaNum'] = dates.dt.dayofweek
+    for col in ('MesNombre', 'DíaSemana'):
+        df[col] = df[col].astype(str).astype(object)
+    return df
+
+
+def get_memory_report(before, after):
+    """
+    Compara los bytes por columna de dos versiones del DataFrame
+    
+    Args:
+        before: DataFrame con los tipos originales
+            (original_dtypes(load_fitness_data(compact=False)))
+        after: DataFrame compacto
+    
+    Returns:
+        pd.DataFrame: Bytes antes/después por columna, con una fila TOTAL
+    """
+    report = pd.DataFrame({
+        'antes': before.memory_usage(deep=True, index=False),
+        'después': after.memory_usage(deep=True, index=False)
+    })
+    report['tipo'] = after.dtypes.astype(str)
+    report.loc['TOTAL', ['antes', 'después']] = report[['antes', 'después']].sum()
+    report['ahorro (%)'] = ((1 - report['después'] / report['antes']) * 100).round(1)
+    return report
+
+
+def calculate_summary_stats(df, start_date=None, end_date=None):
+    """
+    Calcula estadísticas resumidas del dataset o de un rango de fechas
+    
+    Con los DataFrame de load_fitness_data() usa el índice de sumas prefijas
+    del DayStore: cada total es una resta de dos posiciones, O(1) por rango.
     
     Args:
         df: DataFrame con los datos
+        start_date: Fecha de inicio (None para desde el principio)
+        end_date: Fecha de fin (None para hasta el final)
         
     Returns:
         dict: Diccionario con estadísticas clave
     """
+    store = get_day_store(df)
+    if store is not None:
+        return store.summary(start_date, end_date)
+    
+    if start_date is not None or end_date is not None:
+        df = filter_data_by_date(df, start_date, end_date)
     return {
         'total_steps': df['Recuento de pasos'].sum(),
         'total_distance': df['Distancia_km'].sum(),
@@ -106,10 +526,287 @@ def calculate_summary_stats(df):
     }
 
 
+def aggregate_by_period(df, level, start_date=None, end_date=None):
+    """
+    Totales por año, mes, semana ISO o día de la semana en un rango de fechas
+    
+    Con los DataFrame de load_fitness_data() se consulta el cubo de agregados
+    del DayStore, así que el coste depende del número de periodos, no de días.
+    
+    Args:
+        df: DataFrame con los datos
+        level: 'year', 'month', 'week' o 'weekday'
+        start_date: Fecha de inicio (None para desde el principio)
+        end_date: Fecha de fin (None para hasta el final)
+    
+    Returns:
+        pd.DataFrame: Claves del periodo (LEVEL_KEYS), sumas de pasos, distancia,
+        calorías y minutos activos, 'dias_activos' y 'dias'
+    """
+    store = get_day_store(df)
+    if store is not None:
+        return store.rollup.aggregate(level, start_date, end_date)
+    
+    df = filter_data_by_date(df, start_date, end_date)
+    if level == 'week':
+        codes = calendar_codes(df['Fecha'])
+        keys = [
+            pd.Series(codes['iso_year'].astype(np.int64), index=df.index, name='AñoISO'),
+            pd.Series(codes['iso_week'].astype(np.int64), index=df.index, name='SemanaISO')
+        ]
+    else:
+        keys = [df[col] for col in LEVEL_KEYS[level]]
+    
+    steps = df['Recuento de pasos'].to_numpy(dtype=np.float64, na_value=0.0)
+    values = pd.DataFrame({
+        col: df[col].to_numpy(dtype=np.float64, na_value=0.0)
+        for col in ROLLUP_METRICS.values() if col in df.columns
+    }, index=df.index)
+    values['dias_activos'] = (steps > 0).astype(np.int64)
+    values['dias'] = 1
+    result = values.groupby(keys, observed=True).sum()
+    if level == 'weekday':
+        result = result.reindex(range(7), fill_value=0).rename_axis('DíaSemanaNum')
+    return result.reset_index()
+
+
+def calendar_grid(df, start_date=None, end_date=None):
+    """
+    Pasos por semana ISO y día de la semana en un rango de fechas (heatmap)
+    
+    Con los DataFrame de load_fitness_data() se recortan las filas de la
+    rejilla precalculada del DayStore, sin recorrer los días del rango.
+    
+    Args:
+        df: DataFrame con los datos
+        start_date: Fecha de inicio (None para desde el principio)
+        end_date: Fecha de fin (None para hasta el final)
+    
+    Returns:
+        pd.DataFrame: Una fila por semana (AñoISO, SemanaISO), columnas 0-6 (lunes a domingo)
+    """
+    store = get_day_store(df)
+    if store is not None:
+        return store.calendar.slice(*range_key(start_date, end_date))
+    
+    df = filter_data_by_date(df, start_date, end_date)
+    days = df['Fecha'].to_numpy().astype('datetime64[D]').astype(np.int64)
+    steps = df['Recuento de pasos'].to_numpy(dtype=np.float64, na_value=0.0)
+    return CalendarGrid(days, steps).slice()
+
+
+def count_step_bands(df, start_date=None, end_date=None):
+    """
+    Días activos por tramo de pasos (STEP_BANDS) en un rango de fechas
+    
+    Con los DataFrame de load_fitness_data() se leen los conteos acumulados
+    del DayStore: O(1) por rango.
+    
+    Args:
+        df: DataFrame con los datos
+        start_date: Fecha de inicio (None para desde el principio)
+        end_date: Fecha de fin (None para hasta el final)
+    
+    Returns:
+        list: Un dict por tramo con 'label', 'color' y 'days'
+    """
+    return step_band_counts(*_band_indexes(df, start_date, end_date))
+
+
+def count_goal_days(df, start_date=None, end_date=None):
+    """
+    Días que alcanzan cada objetivo diario (GOALS) en un rango de fechas
+    
+    Args:
+        df: DataFrame con los datos
+        start_date: Fecha de inicio (None para desde el principio)
+        end_date: Fecha de fin (None para hasta el final)
+    
+    Returns:
+        dict: 'active_days', 'steps', 'distance' y 'calories'
+    """
+    return goal_day_counts(*_band_indexes(df, start_date, end_date))
+
+
+def count_days_at_least(df, goals, start_date=None, end_date=None):
+    """
+    Días que alcanzan objetivos arbitrarios (los del explorador de objetivos)
+    
+    Igual que count_goal_days() pero con umbrales libres: con los DataFrame de
+    load_fitness_data() cada umbral es una búsqueda binaria por año en los
+    valores ordenados del DayStore.
+    
+    Args:
+        df: DataFrame con los datos
+        goals: Umbrales con las claves de GOALS ('daily_steps', 'daily_distance',
+            'daily_calories')
+        start_date: Fecha de inicio (None para desde el principio)
+        end_date: Fecha de fin (None para hasta el final)
+    
+    Returns:
+        dict: 'active_days' (pasos > 0), 'steps', 'distance' y 'calories'
+    """
+    store = get_day_store(df)
+    if store is not None:
+        start, end = store.bounds(start_date, end_date)
+        counts = {'active_days': int(store.range_sum('active_days', start, end))}
+        for goal, (name, _) in THRESHOLD_METRICS.items():
+            counts[name] = store.thresholds[name].count_at_least(goals[goal], start, end)
+        return counts
+    
+    df = filter_data_by_date(df, start_date, end_date)
+    return {
+        'active_days': int((df['Recuento de pasos'] > 0).sum()),
+        'steps': int((df['Recuento de pasos'] >= goals['daily_steps']).sum()),
+        'distance': int((df['Distancia_km'] >= goals['daily_distance']).sum()),
+        'calories': int((df['Calorías (kcal)'] >= goals['daily_calories']).sum())
+    }
+
+
+def forecast_steps(df, end_date=None, window=None, horizon=None):
+    """
+    Proyección de pasos de los días siguientes al final de un rango
+    
+    El modelo (tendencia + efecto por día de la semana) se ajusta con los
+    últimos window días hasta end_date. Con los DataFrame de load_fitness_data()
+    el ajuste sale de las sumas acumuladas del DayStore y se conserva por
+    (versión de datos, fin del rango, ventana): volver a un rango ya visto solo
+    recalcula la proyección vectorial.
+    
+    Args:
+        df: DataFrame con los datos
+        end_date: Fecha de fin (None para hasta el final)
+        window: Días de historia del ajuste (por defecto FORECAST['window'])
+        horizon: Días a proyectar (por defecto FORECAST['horizon'])
+    
+    Returns:
+        dict o None: 'dates', 'mean', 'lower' y 'upper' (banda de ±FORECAST['z']
+        desviaciones), o None si la ventana no tiene suficientes días con pasos
+    """
+    window = window or FORECAST['window']
+    horizon = horizon or FORECAST['horizon']
+    store = get_day_store(df)
+    if store is None:
+        df = filter_data_by_date(df, None, end_date).sort_values('Fecha')
+        days = df['Fecha'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        model = TrendSeasonIndex(days, df['Recuento de pasos'].to_numpy(dtype=np.float64, na_value=0.0)).fit(len(df), window)
+    else:
+        _, end = store.bounds(None, end_date)
+        key = (store.version, end, window)
+        found, model = FORECAST_MODELS.get(key)
+        if not found:
+            model = store.forecast.fit(end, window)
+            FORECAST_MODELS.put(key, model)
+    
+    return model.forecast(horizon, FORECAST['z']) if model is not None else None
+
+
+def rolling_overlays(df, panel_id, start_date=None, end_date=None):
+    """
+    Estadísticas móviles de un panel de series (ROLLING_OVERLAYS) en un rango
+    
+    Las ventanas cubren también los días anteriores al rango. Con los
+    DataFrame de load_fitness_data() cada (columna, estadístico, ventana) se
+    calcula una sola vez en el DayStore y el rango es un slice.
+    
+    Args:
+        df: DataFrame con todos los datos
+        panel_id: ID del panel (clave de ROLLING_OVERLAYS)
+        start_date: Fecha de inicio (None para desde el principio)
+        end_date: Fecha de fin (None para hasta el final)
+    
+    Returns:
+        list: Un dict por estadístico con 'stat', 'window', 'decimals' y 'values'
+        (alineados con las filas de filter_data_by_date(df, start_date, end_date))
+    """
+    spec = ROLLING_OVERLAYS.get(panel_id)
+    if spec is None or spec['column'] not in df.columns:
+        return []
+    
+    store = get_day_store(df)
+    if store is not None:
+        start, end = store.bounds(start_date, end_date)
+        return [
+            {
+                'stat': stat, 'window': window, 'decimals': spec['decimals'],
+                'values': store.rolling(spec['column'], stat, window)[start:end]
+            }
+            for stat, window in spec['stats']
+        ]
+    
+    # Sin DayStore: ventanas sobre las filas ordenadas por fecha, devueltas en el orden original
+    order = np.argsort(df['Fecha'].to_numpy(), kind='stable')
+    values = df[spec['column']].to_numpy(dtype=np.float64, na_value=np.nan)[order]
+    in_range = filter_data_by_date(df, start_date, end_date).index
+    overlays = []
+    for stat, window in spec['stats']:
+        ordered = rolling_stat(values, stat, window)
+        result = np.empty_like(ordered)
+        result[order] = ordered
+        overlays.append({
+            'stat': stat, 'window': window, 'decimals': spec['decimals'],
+            'values': result[df.index.get_indexer(in_range)]
+        })
+    return overlays
+
+
+def streak_stats(df, start_date=None, end_date=None):
+    """
+    Rachas de días seguidos de cada condición de STREAKS en un rango de fechas
+    
+    Con los DataFrame de load_fitness_data() las rachas están precalculadas en
+    el DayStore y el rango solo recorta las de los extremos.
+    
+    Args:
+        df: DataFrame con los datos
+        start_date: Fecha de inicio (None para desde el principio)
+        end_date: Fecha de fin (None para hasta el final)
+    
+    Returns:
+        dict: Clave de STREAKS -> 'days', 'runs', 'longest', 'longest_start'
+        (pd.Timestamp o None), 'current', 'longest_gap' y 'gaps' (huecos por
+        tramo de STREAK_GAP_BINS)
+    """
+    store = get_day_store(df)
+    if store is not None:
+        index, days = store.streaks, store.days
+        start, end = store.bounds(start_date, end_date)
+    else:
+        df = filter_data_by_date(df, start_date, end_date).sort_values('Fecha')
+        days = df['Fecha'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        index = build_streak_index(days, *(
+            df[col].to_numpy(dtype=np.float64, na_value=0.0)
+            for col in ('Recuento de pasos', 'Distancia_km', 'Calorías (kcal)')
+        ))
+        start, end = 0, len(df)
+    
+    # Rango vacío: ningún día (el último antes del primero)
+    first_day, last_day = (int(days[start]), int(days[end - 1])) if end > start else (0, -1)
+    return with_dates(index.summary(first_day, last_day))
+
+
+def _band_indexes(df, start_date, end_date):
+    """Índices de tramos y posiciones [inicio, fin) de las filas del rango"""
+    store = get_day_store(df)
+    if store is not None:
+        return (store.bands, *store.bounds(start_date, end_date))
+    
+    df = filter_data_by_date(df, start_date, end_date)
+    indexes = build_band_indexes(*(
+        df[col].to_numpy(dtype=np.float64, na_value=0.0)
+        for col in ('Recuento de pasos', 'Distancia_km', 'Calorías (kcal)')
+    ))
+    return indexes, 0, len(df)
+
+
 def filter_data_by_date(df, start_date, end_date):
     """
     Filtra datos por rango de fechas
     
+    Los DataFrame de load_fitness_data() están ordenados y tienen un día por
+    fila, así que el rango se resuelve con el DayStore asociado sin recorrer
+    la columna de fechas.
+    
     Args:
         df: DataFrame con los datos
         start_date: Fecha de inicio
@@ -118,7 +815,16 @@ def filter_data_by_date(df, start_date, end_date):
     Returns:
         pd.DataFrame: DataFrame filtrado
     """
-    mask = (df['Fecha'] >= start_date) & (df['Fecha'] <= end_date)
+    store = get_day_store(df)
+    if store is not None:
+        # Rango por aritmética de días: vista sin copia, O(1)
+        return store.slice(start_date, end_date)
+    
+    mask = pd.Series(True, index=df.index)
+    if start_date is not None:
+        mask &= df['Fecha'] >= start_date
+    if end_date is not None:
+        mask &= df['Fecha'] <= end_date
     return df[mask]
 
 
@@ -133,3 +839,9 @@ def get_date_range(df):
         tuple: (fecha_inicio, fecha_fin)
     """
     return df['Fecha'].min(), df['Fecha'].max()
+
+
+if __name__ == '__main__':
+    # Informe de memoria: python -m src.utils.data_loader
+    pd.set_option('display.width', 120)
+    print(get_memory_report(original_dtypes(load_fitness_data(compact=False)), load_fitness_data(use_cache=False)))
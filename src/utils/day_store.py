@@ -0,0 +1,304 @@
+"""
+Almacén de columnas indexado por día
+
+Los datos diarios tienen una fila por día natural y load_fitness_data() los
+devuelve ordenados y sin huecos, así que la fila de una fecha es simplemente
+(fecha - primera_fecha) en días. Un rango de fechas se resuelve con aritmética
+y se devuelve como una vista (slice) del DataFrame, sin máscaras ni copias.
+"""
+import hashlib
+import weakref
+import numpy as np
+import pandas as pd
+from src.utils.rollup import RollupCube
+from src.utils.calendar_grid import CalendarGrid
+from src.utils.bands import build_band_indexes
+from src.utils.threshold_index import ThresholdIndex
+from src.utils.forecast import TrendSeasonIndex
+from src.utils.rolling import rolling_stat
+from src.utils.streaks import build_streak_index
+
+
+# Métricas acumulables con índice de sumas prefijas (clave del resumen -> columna)
+SUMMARY_COLUMNS = {
+    'total_steps': 'Recuento de pasos',
+    'total_distance': 'Distancia_km',
+    'total_calories': 'Calorías (kcal)',
+    'total_active_minutes': 'Recuento de Minutos Activos'
+}
+
+# Decimales máximos con los que una columna float se acumula como entero exacto
+# (Distancia_km tiene 2 y las calorías de Google Fit 3)
+EXACT_DECIMALS = 3
+
+# Métricas con índice de umbrales: clave de GOALS -> (clave del conteo, clave de las sumas prefijas)
+THRESHOLD_METRICS = {
+    'daily_steps': ('steps', 'total_steps'),
+    'daily_distance': ('distance', 'total_distance'),
+    'daily_calories': ('calories', 'total_calories')
+}
+
+
+class DayStore:
+    """
+    Índice por día sobre un DataFrame ordenado por 'Fecha'
+
+    Si el DataFrame es denso (un día por fila, sin huecos) las posiciones se
+    calculan por aritmética; si tiene fechas repetidas (p. ej. exportaciones de
+    varias personas en un mismo CSV) se usa búsqueda binaria sobre las fechas.
+    """
+
+    def __init__(self, df):
+        self._frame = weakref.ref(df)
+        self.days = df['Fecha'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        self.size = len(self.days)
+        self.origin = int(self.days[0]) if self.size else 0
+        self.dense = bool(self.size) and int(self.days[-1]) - self.origin + 1 == self.size
+        daily = _daily_values(df)
+        self.prefix = _build_prefix_sums(daily)
+        self.rollup = RollupCube(self, daily)
+        self.calendar = CalendarGrid(self.days, daily['total_steps'])
+        self.bands = build_band_indexes(daily['total_steps'], daily['total_distance'], daily['total_calories'])
+        year_starts = self.rollup.levels['year']['starts']
+        self.thresholds = {
+            name: ThresholdIndex(daily[key], year_starts)
+            for name, key in THRESHOLD_METRICS.values()
+        }
+        self.forecast = TrendSeasonIndex(self.days, daily['total_steps'])
+        self.streaks = build_streak_index(self.days, daily['total_steps'], daily['total_distance'], daily['total_calories'])
+        self._rolling = {}
+        self.version = _data_version(self.days, daily)
+
+    @property
+    def frame(self):
+        """DataFrame indexado (referencia débil: el store no lo mantiene vivo)"""
+        return self._frame()
+
+    def bounds(self, start_date, end_date):
+        """
+        Posiciones [inicio, fin) de las filas dentro del rango (ambos extremos incluidos)
+
+        Args:
+            start_date: Fecha de inicio (str, datetime o None para sin límite)
+            end_date: Fecha de fin (str, datetime o None para sin límite)
+
+        Returns:
+            tuple: (inicio, fin) como posiciones de fila
+        """
+        first = _to_day(start_date, ceil=True)
+        last = _to_day(end_date, ceil=False)
+
+        if self.dense:
+            start = 0 if first is None else min(max(first - self.origin, 0), self.size)
+            end = self.size if last is None else min(max(last - self.origin + 1, 0), self.size)
+        else:
+            start = 0 if first is None else int(np.searchsorted(self.days, first, side='left'))
+            end = self.size if last is None else int(np.searchsorted(self.days, last, side='right'))
+
+        return start, max(start, end)
+
+    def slice(self, start_date, end_date):
+        """Vista del DataFrame con las filas del rango (sin copiar datos)"""
+        start, end = self.bounds(start_date, end_date)
+        return self.frame.iloc[start:end]
+
+    def range_sum(self, key, start, end):
+        """Suma de una métrica del índice entre las posiciones [start, end) en O(1)"""
+        return self.prefix[key].range_sum(start, end)
+
+    def summary(self, start_date=None, end_date=None):
+        """
+        Estadísticas resumidas de un rango con dos lecturas por métrica
+
+        Args:
+            start_date: Fecha de inicio (None para sin límite)
+            end_date: Fecha de fin (None para sin límite)
+
+        Returns:
+            dict: Totales, días activos, promedio de pasos y fechas extremas
+        """
+        start, end = self.bounds(start_date, end_date)
+        stats = {key: self.range_sum(key, start, end) for key in SUMMARY_COLUMNS}
+        active_days = int(self.range_sum('active_days', start, end))
+        stats['active_days'] = active_days
+        stats['avg_steps'] = stats['total_steps'] / active_days if active_days > 0 else np.nan
+        dates = self.frame['Fecha']
+        stats['first_date'] = dates.iloc[start] if end > start else pd.NaT
+        stats['last_date'] = dates.iloc[end - 1] if end > start else pd.NaT
+        return stats
+
+    def rolling(self, name, stat, window):
+        """
+        Estadístico móvil de una columna sobre todas las filas (rolling_stat)
+
+        Se calcula la primera vez que se pide cada (columna, estadístico,
+        ventana) y se conserva; un rango es un slice del array devuelto.
+        """
+        key = (name, stat, window)
+        if key not in self._rolling:
+            values = self.frame[name].to_numpy(dtype=np.float64, na_value=np.nan)
+            self._rolling[key] = rolling_stat(values, stat, window)
+        return self._rolling[key]
+
+    def column(self, name, start_date=None, end_date=None):
+        """Vista NumPy de una columna dentro del rango"""
+        start, end = self.bounds(start_date, end_date)
+        return self.frame[name].to_numpy()[start:end]
+
+
+def _daily_values(df):
+    """
+    Valores diarios de las métricas de SUMMARY_COLUMNS y de 'active_days'
+
+    Las columnas enteras se leen como int64 (sumas exactas) y las float como
+    float64 tratando NaN como 0, igual que Series.sum(). 'active_days' vale 1
+    en los días con pasos > 0.
+    """
+    daily = {}
+    for key, col in SUMMARY_COLUMNS.items():
+        series = df[col]
+        if pd.api.types.is_integer_dtype(series.dtype):
+            daily[key] = series.to_numpy(dtype=np.int64)
+        else:
+            daily[key] = series.to_numpy(dtype=np.float64, na_value=0.0)
+
+    daily['active_days'] = (df['Recuento de pasos'].to_numpy(dtype=np.float64, na_value=0.0) > 0).astype(np.int64)
+    return daily
+
+
+class PrefixSum:
+    """
+    Sumas acumuladas de una métrica sin error de redondeo en las restas
+
+    Restar dos sumas acumuladas en float64 arrastra el error de todo lo
+    acumulado antes del rango (1229.9500000000062 en lugar de 1229.95), y eso
+    cambia el redondeo de las tarjetas. Las columnas enteras y las float con
+    hasta EXACT_DECIMALS decimales se acumulan como enteros exactos (p. ej.
+    centésimas de km); el resto guarda junto a cada suma su error de redondeo
+    (suma compensada) y la resta los combina.
+
+    Args:
+        values: Valores diarios (int64 o float64 con NaN como 0)
+    """
+
+    def __init__(self, values):
+        self.scale = None
+        self.errors = None
+        if values.dtype.kind in 'iub':
+            self.sums = _cumsum(values.astype(np.int64))
+            return
+        for decimals in range(EXACT_DECIMALS + 1):
+            scaled = np.rint(values * 10 ** decimals)
+            if np.array_equal(scaled / 10 ** decimals, values) and np.abs(scaled).sum() < 2 ** 53:
+                self.scale = 10 ** decimals
+                self.sums = _cumsum(scaled.astype(np.int64))
+                return
+        # Suma compensada: el error de cada paso de cumsum (TwoSum) se acumula aparte
+        self.sums = _cumsum(values)
+        before, after = self.sums[:-1], self.sums[1:]
+        added = after - before
+        self.errors = _cumsum((before - (after - added)) + (values - added))
+
+    def range_sum(self, start, end):
+        """Suma de las posiciones [start, end)"""
+        if self.errors is None:
+            total = self.sums[end] - self.sums[start]
+            return total if self.scale is None else total / self.scale
+        high, low = self.sums[end], -self.sums[start]
+        total = high + low
+        added = total - high
+        error = (high - (total - added)) + (low - added)
+        return total + (error + (self.errors[end] - self.errors[start]))
+
+
+def _cumsum(values):
+    """Sumas acumuladas con un 0 inicial"""
+    return np.concatenate(([values.dtype.type(0)], np.cumsum(values)))
+
+
+def _build_prefix_sums(daily):
+    """Índice PrefixSum de cada métrica diaria"""
+    return {key: PrefixSum(values) for key, values in daily.items()}
+
+
+def _data_version(days, daily):
+    """Huella del contenido (fechas y métricas): igual en todos los workers con los mismos datos"""
+    digest = hashlib.blake2b(days.tobytes(), digest_size=8)
+    for key in sorted(daily):
+        digest.update(key.encode('utf-8'))
+        digest.update(np.ascontiguousarray(daily[key]).tobytes())
+    return digest.hexdigest()
+
+
+def range_key(start_date, end_date):
+    """
+    Normaliza un rango de fechas a (primer día, último día) en días desde 1970-01-01
+
+    Usa la misma regla que DayStore.bounds, así que dos rangos con la misma
+    clave seleccionan exactamente las mismas filas.
+    """
+    return _to_day(start_date, ceil=True), _to_day(end_date, ceil=False)
+
+
+def _to_day(value, ceil):
+    """
+    Convierte una fecha a días desde 1970-01-01
+
+    Las filas representan días a medianoche: una fecha de inicio con hora
+    empieza en el día siguiente y una fecha de fin con hora incluye su día,
+    igual que la comparación directa con la columna 'Fecha'.
+    """
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_localize(None)
+    ts = ts.ceil('D') if ceil else ts.floor('D')
+    return int(np.datetime64(ts.date(), 'D').astype(np.int64))
+
+
+# DataFrame -> DayStore (referencia débil para no retener DataFrames descartados)
+_STORES = {}
+
+
+def register_day_store(df):
+    """
+    Crea y registra el DayStore de un DataFrame de load_fitness_data()
+
+    Solo el cargador registra DataFrames: sus filas son todos los datos, un
+    día por fila. Los recortes o copias que se pasen después a las funciones
+    de datos no tienen DayStore y usan el cálculo directo en pandas.
+
+    Args:
+        df: DataFrame devuelto por load_fitness_data()
+
+    Returns:
+        DayStore o None si el DataFrame está vacío o no está ordenado por fecha
+    """
+    store = get_day_store(df)
+    if store is not None:
+        return store
+
+    if len(df) == 0 or 'Fecha' not in df.columns or not df['Fecha'].is_monotonic_increasing:
+        return None
+
+    store = DayStore(df)
+    key = id(df)
+    _STORES[key] = (weakref.ref(df, lambda _, key=key: _STORES.pop(key, None)), store)
+    return store
+
+
+def get_day_store(df):
+    """
+    Devuelve el DayStore registrado para un DataFrame (register_day_store())
+
+    Args:
+        df: DataFrame con columna 'Fecha'
+
+    Returns:
+        DayStore o None si el DataFrame no viene de load_fitness_data()
+    """
+    entry = _STORES.get(id(df))
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    return None
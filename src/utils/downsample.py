@@ -0,0 +1,86 @@
+"""
+Reducción de series temporales largas para dibujarlas
+
+Largest-Triangle-Three-Buckets (LTTB) reparte la serie en tantos cubos como
+puntos se quieren conservar y de cada cubo se queda con el punto que forma el
+triángulo de mayor área con el punto elegido en el cubo anterior y la media
+del cubo siguiente: conserva picos y valles, que es lo que se ve en la línea.
+El primer y el último punto se conservan siempre.
+
+assets/series_slice.js implementa el mismo algoritmo (mismos cubos, mismas
+sumas acumuladas y mismo desempate) para reducir en el navegador.
+"""
+import numpy as np
+
+
+def lttb_indices(x, y, max_points):
+    """
+    Posiciones de los puntos que conserva LTTB
+
+    Args:
+        x: Valores del eje x en orden creciente (números)
+        y: Valores del eje y (NaN cuenta como 0 en las medias y nunca se elige
+           si el cubo tiene algún valor)
+        max_points: Número de puntos a conservar (None o >= len(x) = todos)
+
+    Returns:
+        np.ndarray: Posiciones (int64) en orden creciente
+    """
+    size = len(x)
+    if max_points is None or max_points >= size or max_points < 3:
+        return np.arange(size, dtype=np.int64)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Medias de cada cubo con sumas acumuladas (orden secuencial, como en el navegador)
+    x_sums = np.concatenate(([0.0], np.cumsum(x))).tolist()
+    y_sums = np.concatenate(([0.0], np.cumsum(np.nan_to_num(y)))).tolist()
+    xs = x.tolist()
+    ys = y.tolist()
+
+    every = (size - 2) / (max_points - 2)
+    indices = [0]
+    a = 0
+    for bucket in range(max_points - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, size)
+        count = next_end - end
+        avg_x = (x_sums[next_end] - x_sums[end]) / count
+        avg_y = (y_sums[next_end] - y_sums[end]) / count
+
+        ax = xs[a]
+        ay = ys[a] if ys[a] == ys[a] else 0.0
+        best = start
+        best_area = -1.0
+        for j in range(start, end):
+            if ys[j] != ys[j]:
+                continue
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+        indices.append(best)
+        a = best
+
+    indices.append(size - 1)
+    return np.asarray(indices, dtype=np.int64)
+
+
+def window_bounds(days, first_day, last_day):
+    """
+    Posiciones [lo, hi) de una ventana de días, con un punto más a cada lado
+
+    El punto extra hace que la línea llegue a los bordes de la ventana visible.
+
+    Args:
+        days: Días (enteros) en orden creciente
+        first_day: Primer día de la ventana
+        last_day: Último día de la ventana
+
+    Returns:
+        tuple: (lo, hi)
+    """
+    lo = max(int(np.searchsorted(days, first_day, side='left')) - 1, 0)
+    hi = min(int(np.searchsorted(days, last_day, side='right')) + 1, len(days))
+    return lo, max(lo, hi)
@@ -0,0 +1,136 @@
+"""
+Proyección de pasos diarios con tendencia y estacionalidad semanal
+
+El modelo es una regresión por mínimos cuadrados sobre una ventana de días:
+pasos = nivel + pendiente * día + efecto del día de la semana. Las matrices
+de la regresión (XᵀX, Xᵀy, yᵀy) son sumas por fila, así que se guardan como
+sumas acumuladas: ajustar el modelo de cualquier ventana es una resta y un
+sistema de 8x8, sin recorrer los días, y añadir días nuevos solo acumula sus
+filas. La proyección y su banda de confianza se calculan para todo el
+horizonte con operaciones vectoriales.
+"""
+import numpy as np
+
+
+# Coeficientes: nivel, pendiente y efecto de martes a domingo respecto al lunes
+N_COEFFICIENTS = 8
+
+
+class TrendSeasonIndex:
+    """
+    Sumas acumuladas de la regresión de tendencia semanal
+
+    Los días sin pasos (0 o NaN: sin datos del dispositivo) no entran en la
+    regresión.
+
+    Args:
+        days: Día (desde 1970-01-01) de cada fila, en orden creciente
+        values: Pasos de cada fila
+    """
+
+    def __init__(self, days, values):
+        self.days = np.zeros(0, dtype=np.int64)
+        self.xtx = np.zeros((1, N_COEFFICIENTS, N_COEFFICIENTS))
+        self.xty = np.zeros((1, N_COEFFICIENTS))
+        self.yty = np.zeros(1)
+        self.extend(days, values)
+
+    def extend(self, days, values):
+        """
+        Añade filas al final (días posteriores a los ya indexados)
+
+        Solo se calculan las sumas de las filas nuevas a partir de las últimas
+        acumuladas.
+        """
+        days = np.asarray(days, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        valid = values > 0
+        features = _features(days) * valid[:, None]
+        values = np.where(valid, values, 0.0)
+
+        self.days = np.concatenate((self.days, days))
+        self.xtx = np.concatenate((self.xtx, self.xtx[-1] + np.cumsum(features[:, :, None] * features[:, None, :], axis=0)))
+        self.xty = np.concatenate((self.xty, self.xty[-1] + np.cumsum(features * values[:, None], axis=0)))
+        self.yty = np.concatenate((self.yty, self.yty[-1] + np.cumsum(values * values)))
+
+    def fit(self, end, window):
+        """
+        Ajusta el modelo de los días (window) que terminan en la fila end - 1
+
+        Args:
+            end: Fila siguiente a la última de la ventana
+            window: Días naturales de la ventana
+
+        Returns:
+            WeeklyTrendModel o None si la ventana tiene menos de
+            N_COEFFICIENTS + 2 días con pasos
+        """
+        if end <= 0:
+            return None
+        last_day = int(self.days[end - 1])
+        start = int(np.searchsorted(self.days[:end], last_day - window + 1, side='left'))
+        xtx = self.xtx[end] - self.xtx[start]
+        xty = self.xty[end] - self.xty[start]
+        yty = self.yty[end] - self.yty[start]
+        count = int(round(xtx[0, 0]))
+        if count < N_COEFFICIENTS + 2:
+            return None
+        return WeeklyTrendModel(xtx, xty, yty, count, last_day)
+
+
+class WeeklyTrendModel:
+    """
+    Regresión ajustada de una ventana
+
+    La pendiente se expresa respecto al día medio de la ventana (centrado) para
+    que el sistema esté bien condicionado aunque los días sean números grandes.
+    """
+
+    def __init__(self, xtx, xty, yty, count, last_day):
+        self.last_day = last_day
+        self.center = xtx[0, 1] / count
+        # Cambio de variable t -> t - center sobre las sumas ya acumuladas
+        shift = np.eye(N_COEFFICIENTS)
+        shift[1, 0] = -self.center
+        xtx = shift @ xtx @ shift.T
+        xty = shift @ xty
+        # Pseudoinversa: si algún día de la semana no tiene datos su efecto queda a 0
+        self.inverse = np.linalg.pinv(xtx)
+        self.coefficients = self.inverse @ xty
+        residual = max(yty - self.coefficients @ xty, 0.0)
+        self.sigma = np.sqrt(residual / max(count - N_COEFFICIENTS, 1))
+
+    def forecast(self, horizon, z):
+        """
+        Proyección de los días siguientes a la ventana
+
+        Args:
+            horizon: Días a proyectar
+            z: Cuantil normal de la banda (1.96 = 95%)
+
+        Returns:
+            dict: 'dates' (datetime64[D]), 'mean', 'lower' y 'upper' (pasos >= 0)
+        """
+        days = self.last_day + np.arange(1, horizon + 1, dtype=np.int64)
+        features = _features(days)
+        features[:, 1] -= self.center
+        mean = features @ self.coefficients
+        # Error de predicción: ruido del día + incertidumbre de los coeficientes
+        spread = z * self.sigma * np.sqrt(1 + np.einsum('ij,jk,ik->i', features, self.inverse, features))
+        return {
+            'dates': days.astype('datetime64[D]'),
+            'mean': np.maximum(mean, 0),
+            'lower': np.maximum(mean - spread, 0),
+            'upper': np.maximum(mean + spread, 0)
+        }
+
+
+def _features(days):
+    """Filas de la regresión: 1, día y un indicador por día de la semana (martes a domingo)"""
+    weekday = (days + 3) % 7
+    features = np.zeros((len(days), N_COEFFICIENTS))
+    features[:, 0] = 1
+    features[:, 1] = days
+    rows = np.flatnonzero(weekday > 0)
+    features[rows, weekday[rows] + 1] = 1
+    return features
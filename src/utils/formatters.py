@@ -1,6 +1,7 @@
 """
 Utilidades para formatear datos y textos
 """
+from decimal import Decimal, ROUND_HALF_UP
 import pandas as pd
 
 
@@ -23,6 +24,9 @@ def format_distance(km):
     # Manejar valores None o NaN
     if pd.isna(km):
         return "0.0 km"
+    # Redondeo en decimal del valor más corto que representa km: 1589.35 -> 1589.4
+    # (con el float, 1589.35 es 1589.3499... y se mostraría 1589.3)
+    km = Decimal(repr(float(km))).quantize(Decimal('0.1'), rounding=ROUND_HALF_UP)
     return f"{km:,.1f} km"
 
 
@@ -60,6 +64,39 @@ def format_time_minutes(minutes):
     return f"{hours:,} horas"
 
 
+def format_count(count, singular, plural):
+    """Formatea un conteo con el sustantivo en singular o plural (1 día, 3 días)"""
+    return f"{count:,} {singular if count == 1 else plural}"
+
+
 def format_world_laps(km):
     """Calcula porcentaje de vuelta al mundo (40,075 km)"""
     return f"≈ {km/40075*100:.1f}% vuelta al mundo"
+
+
+def format_summary_cards(stats):
+    """
+    Formatea los valores de las 4 tarjetas de estadísticas (valor y detalle)
+    
+    Args:
+        stats: Diccionario de calculate_summary_stats()
+        
+    Returns:
+        tuple: (pasos, promedio pasos, distancia, vuelta al mundo,
+                calorías, promedio calorías, minutos activos, horas activas)
+    """
+    active_days = stats['active_days']
+    total_distance = stats['total_distance']
+    total_calories = stats['total_calories']
+    total_active_minutes = stats['total_active_minutes']
+    
+    return (
+        format_number(stats['total_steps']),
+        f"~{format_number(stats['avg_steps'])} pasos/día" if active_days > 0 else "Sin datos",
+        format_distance(total_distance),
+        format_world_laps(total_distance),
+        format_number(total_calories),
+        f"~{format_number(total_calories/active_days)} kcal/día" if active_days > 0 else "Sin datos",
+        format_number(total_active_minutes),
+        format_time_minutes(total_active_minutes)
+    )
@@ -0,0 +1,113 @@
+"""
+Construcción concurrente de figuras dentro de un callback
+
+Los gráficos de un mismo callback son independientes entre sí: se reparten en
+un pool de hilos acotado (compartido por todos los callbacks del proceso) y se
+espera a todos, de modo que la latencia se acerca a la del gráfico más lento.
+Los hilos comparten el DataFrame sin copiarlo (solo se lee). Cada constructor
+registra su tiempo para poder ver qué gráfico domina la latencia.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import FIGURE_WORKERS
+
+
+class BuilderTimings:
+    """Tiempos acumulados de cada constructor (segura entre hilos)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings = {}
+
+    def record(self, name, seconds):
+        """Registra una ejecución de un constructor"""
+        with self._lock:
+            entry = self._timings.setdefault(name, {'count': 0, 'total_ms': 0.0, 'last_ms': 0.0, 'max_ms': 0.0})
+            ms = seconds * 1000
+            entry['count'] += 1
+            entry['total_ms'] += ms
+            entry['last_ms'] = ms
+            entry['max_ms'] = max(entry['max_ms'], ms)
+
+    def snapshot(self):
+        """
+        Copia de los tiempos registrados
+
+        Returns:
+            dict: Por constructor, número de ejecuciones y tiempos último/medio/máximo en ms
+        """
+        with self._lock:
+            return {
+                name: {**entry, 'avg_ms': entry['total_ms'] / entry['count']}
+                for name, entry in self._timings.items()
+            }
+
+
+BUILDER_TIMINGS = BuilderTimings()
+
+_executor = None
+_executor_lock = threading.Lock()
+_worker_state = threading.local()
+
+
+def _get_executor():
+    """Pool de hilos compartido (se crea en el primer uso)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=FIGURE_WORKERS, thread_name_prefix='figure-builder')
+        return _executor
+
+
+def _timed(name, builder):
+    """Ejecuta un constructor y registra su tiempo"""
+    _worker_state.active = True
+    start = time.perf_counter()
+    try:
+        return builder()
+    finally:
+        BUILDER_TIMINGS.record(name, time.perf_counter() - start)
+        _worker_state.active = False
+
+
+def run_builders(builders, group=None):
+    """
+    Ejecuta constructores independientes en paralelo y devuelve sus resultados
+
+    Con FIGURE_WORKERS <= 1, con un solo constructor o si se llama desde un
+    hilo del propio pool (para no bloquearlo) se ejecutan en serie. Las
+    excepciones de cualquier constructor se propagan al llamador.
+
+    Args:
+        builders: dict nombre -> función sin argumentos que construye una salida
+        group: Prefijo para los nombres en BUILDER_TIMINGS (p. ej. el callback)
+
+    Returns:
+        dict: nombre -> resultado, en el mismo orden que builders
+    """
+    names = {name: f'{group}.{name}' if group else name for name in builders}
+
+    if FIGURE_WORKERS <= 1 or len(builders) <= 1 or getattr(_worker_state, 'active', False):
+        results = {}
+        for name, builder in builders.items():
+            start = time.perf_counter()
+            try:
+                results[name] = builder()
+            finally:
+                BUILDER_TIMINGS.record(names[name], time.perf_counter() - start)
+        return results
+
+    executor = _get_executor()
+    futures = {name: executor.submit(_timed, names[name], builder) for name, builder in builders.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def get_builder_timings():
+    """
+    Tiempos por constructor desde el arranque del proceso
+
+    Returns:
+        dict: Ver BuilderTimings.snapshot
+    """
+    return BUILDER_TIMINGS.snapshot()
@@ -0,0 +1,155 @@
+"""
+Vista de un rango de fechas compartida por los constructores de gráficos
+
+Las tarjetas, los gráficos y las conclusiones de un mismo rango necesitan las
+mismas filas, las mismas máscaras (días con pasos, con peso...) y los mismos
+agregados. RangeView los calcula la primera vez que alguien los pide y los
+conserva; get_range_view() devuelve la misma vista para el mismo rango (misma
+versión de datos y mismos días) en las tres pestañas, así que cada derivado se
+construye una vez por rango y no una vez por gráfico.
+"""
+import weakref
+import numpy as np
+from config.settings import RANGE_VIEW_CACHE
+from src.utils.day_store import get_day_store, range_key
+from src.utils.result_cache import ResultCache
+from src.utils.conclusions_summary import summarize_conclusions
+from src.utils.data_loader import (
+    filter_data_by_date, calculate_summary_stats, aggregate_by_period, calendar_grid,
+    count_step_bands, count_goal_days, streak_stats, forecast_steps, rolling_overlays,
+    RECORD_COLUMN
+)
+
+
+class RangeView:
+    """
+    Rango de fechas de un DataFrame con sus derivados memorizados
+
+    Los valores devueltos se comparten entre callbacks y no deben modificarse
+    (por eso no se hacen copias defensivas). Si dos hilos piden a la vez un
+    valor que aún no está calculado, ambos lo calculan y se conserva el primero.
+
+    Args:
+        df: DataFrame con todos los datos (referencia débil, como el DayStore)
+        start_date: Fecha de inicio (None para desde el principio)
+        end_date: Fecha de fin (None para hasta el final)
+    """
+
+    def __init__(self, df, start_date=None, end_date=None):
+        self._frame = weakref.ref(df)
+        self.start_date = start_date
+        self.end_date = end_date
+        self._values = {}
+
+    @property
+    def frame(self):
+        """DataFrame completo del que sale el rango"""
+        return self._frame()
+
+    def _memo(self, key, compute):
+        """Valor memorizado de key (compute() la primera vez)"""
+        if key not in self._values:
+            self._values.setdefault(key, compute())
+        return self._values[key]
+
+    @property
+    def data(self):
+        """Filas del rango (vista sin copia con el DayStore)"""
+        return self._memo('data', lambda: filter_data_by_date(self.frame, self.start_date, self.end_date))
+
+    def recorded(self):
+        """Filas del rango que vienen del CSV (sin los días sin registro rellenados al cargar)"""
+        return self._memo('recorded', lambda: _recorded_rows(self.data))
+
+    def mask(self, column):
+        """Filas del rango con valor > 0 en column (np.ndarray bool; NaN no cuenta)"""
+        return self._memo(
+            ('mask', column),
+            lambda: self.data[column].to_numpy(dtype=np.float64, na_value=np.nan) > 0
+        )
+
+    def positive(self, column):
+        """Filas del rango con valor > 0 en column"""
+        return self._memo(('positive', column), lambda: self.data[self.mask(column)])
+
+    def summary(self):
+        """Totales del rango (calculate_summary_stats())"""
+        return self._memo('summary', lambda: calculate_summary_stats(self.frame, self.start_date, self.end_date))
+
+    def aggregate(self, level):
+        """Totales por periodo (aggregate_by_period())"""
+        return self._memo(
+            ('aggregate', level),
+            lambda: aggregate_by_period(self.frame, level, self.start_date, self.end_date)
+        )
+
+    def calendar(self):
+        """Rejilla del heatmap (calendar_grid())"""
+        return self._memo('calendar', lambda: calendar_grid(self.frame, self.start_date, self.end_date))
+
+    def step_bands(self):
+        """Días por tramo de pasos (count_step_bands())"""
+        return self._memo('step_bands', lambda: count_step_bands(self.frame, self.start_date, self.end_date))
+
+    def goal_days(self):
+        """Días que alcanzan cada objetivo (count_goal_days())"""
+        return self._memo('goal_days', lambda: count_goal_days(self.frame, self.start_date, self.end_date))
+
+    def streaks(self):
+        """Rachas de cada condición de STREAKS (streak_stats())"""
+        return self._memo('streaks', lambda: streak_stats(self.frame, self.start_date, self.end_date))
+
+    def conclusions(self):
+        """Estadísticas de la pestaña de conclusiones (summarize_conclusions())"""
+        return self._memo('conclusions', lambda: summarize_conclusions(self.frame, self.start_date, self.end_date))
+
+    def forecast(self):
+        """Proyección de pasos tras el final del rango (forecast_steps())"""
+        return self._memo('forecast', lambda: forecast_steps(self.frame, self.end_date))
+
+    def overlays(self, panel_id):
+        """Estadísticas móviles de un panel de series (rolling_overlays())"""
+        return self._memo(
+            ('overlays', panel_id),
+            lambda: rolling_overlays(self.frame, panel_id, self.start_date, self.end_date)
+        )
+
+
+def _recorded_rows(df):
+    """Filas con RECORD_COLUMN (todas si el DataFrame no la tiene o no hay huecos)"""
+    if RECORD_COLUMN not in df.columns:
+        return df
+    recorded = df[RECORD_COLUMN].to_numpy(dtype=bool)
+    return df if recorded.all() else df[recorded]
+
+
+# (versión de los datos, rango normalizado a días) -> RangeView
+RANGE_VIEWS = ResultCache(maxsize=RANGE_VIEW_CACHE['maxsize'])
+
+
+def get_range_view(df, start_date=None, end_date=None):
+    """
+    Devuelve la vista de un rango, compartida con los callbacks que piden el mismo
+
+    Con los DataFrame de load_fitness_data() las vistas se conservan por
+    (versión de datos, días del rango) en una caché LRU; sin DayStore cada
+    llamada crea una vista nueva.
+
+    Args:
+        df: DataFrame con todos los datos
+        start_date: Fecha de inicio (None para desde el principio)
+        end_date: Fecha de fin (None para hasta el final)
+
+    Returns:
+        RangeView
+    """
+    store = get_day_store(df)
+    if store is None:
+        return RangeView(df, start_date, end_date)
+
+    key = (store.version, range_key(start_date, end_date))
+    found, view = RANGE_VIEWS.get(key)
+    if not found or view.frame is not df:
+        view = RangeView(df, start_date, end_date)
+        RANGE_VIEWS.put(key, view)
+    return view
@@ -0,0 +1,141 @@
+"""
+Caché LRU de resultados de callbacks por rango de fechas
+
+Los callbacks de cada pestaña recalculan todas sus figuras aunque el rango ya
+se haya consultado (p. ej. al cambiar de pestaña, el Store compartido vuelve a
+disparar los callbacks con las mismas fechas). La caché guarda la salida de
+cada callback con clave (callback, versión de los datos, rango normalizado a
+días), con un tamaño máximo (LRU), caducidad opcional y contadores de aciertos.
+"""
+import functools
+import threading
+import time
+from collections import OrderedDict
+from config.settings import CALLBACK_CACHE
+from src.utils.day_store import get_day_store, range_key
+from src.utils.warmup import register_warmup
+
+
+class ResultCache:
+    """
+    Caché LRU con caducidad (TTL) y contadores, segura entre hilos
+
+    Args:
+        maxsize: Número máximo de entradas (se descarta la usada hace más tiempo)
+        ttl: Segundos de validez de cada entrada (None = sin caducidad)
+    """
+
+    def __init__(self, maxsize=64, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Devuelve (True, valor) si la clave está en caché y no ha caducado, o (False, None)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, key, value):
+        """Guarda un valor y descarta las entradas más antiguas si se supera maxsize"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Vacía la caché (los contadores se conservan)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Contadores de uso de la caché
+
+        Returns:
+            dict: Entradas, aciertos, fallos, descartes y tasa de aciertos
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+# Caché compartida por los callbacks del dashboard
+CALLBACK_RESULTS = ResultCache(maxsize=CALLBACK_CACHE['maxsize'], ttl=CALLBACK_CACHE['ttl'])
+
+
+def data_version(df):
+    """
+    Sello de versión de los datos para las claves de la caché
+
+    Args:
+        df: DataFrame con los datos
+
+    Returns:
+        str o tuple: Huella del contenido (igual en todos los workers) o, si el
+        DataFrame no tiene DayStore, su identidad en este proceso
+    """
+    store = get_day_store(df)
+    if store is not None:
+        return store.version
+    return ('id', id(df), len(df))
+
+
+def cached_range_callback(df, cache=None, name=None):
+    """
+    Decorador que memoriza un callback (start_date, end_date) -> salidas
+
+    Se aplica debajo de @callback. Las fechas se normalizan a días con la misma
+    regla que filter_data_by_date, así que dos rangos que seleccionan los mismos
+    días comparten entrada. Las excepciones (p. ej. PreventUpdate) no se guardan.
+    El callback queda registrado para el calentamiento al arrancar (warmup.py).
+
+    Args:
+        df: DataFrame con todos los datos (su versión forma parte de la clave)
+        cache: ResultCache a usar (por defecto CALLBACK_RESULTS)
+        name: Nombre de la entrada (por defecto el nombre cualificado de la función)
+    """
+    cache = cache or CALLBACK_RESULTS
+
+    def decorator(func):
+        if not CALLBACK_CACHE['enabled']:
+            register_warmup(name or func.__name__, func)
+            return func
+
+        @functools.wraps(func)
+        def wrapper(start_date, end_date):
+            key = (name or func.__qualname__, data_version(df), range_key(start_date, end_date))
+            found, value = cache.get(key)
+            if found:
+                return value
+            value = func(start_date, end_date)
+            cache.put(key, value)
+            return value
+
+        register_warmup(name or func.__name__, wrapper)
+        return wrapper
+
+    return decorator
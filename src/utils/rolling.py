@@ -0,0 +1,52 @@
+"""
+Estadísticas móviles de las series diarias (medias, medianas y cuantiles)
+
+Cada valor es el estadístico de los días con dato (valor > 0) de la ventana
+que termina en esa fila. Las medias salen de sumas acumuladas (una resta por
+fila) y los cuantiles de rolling().quantile de pandas (en C) sobre la serie
+con los días sin dato como NaN. Solo se calcula el estadístico pedido, una vez
+por métrica y ventana sobre todos los datos, y cada rango es un slice.
+"""
+import numpy as np
+import pandas as pd
+
+
+# Cuantiles disponibles además de la media: nombre -> probabilidad
+QUANTILES = {
+    'median': 0.5,
+    'p25': 0.25,
+    'p75': 0.75
+}
+
+
+def rolling_stat(values, stat, window):
+    """
+    Media o cuantil móvil de una serie
+
+    Args:
+        values: Valores diarios en orden (0 o NaN = día sin dato)
+        stat: 'mean' o una clave de QUANTILES
+        window: Filas de la ventana (incluida la propia fila)
+
+    Returns:
+        np.ndarray: float64, NaN si la ventana no tiene ningún día con dato
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = values > 0
+    if stat == 'mean':
+        return _rolling_mean(np.where(valid, values, 0.0), valid, window)
+    # Interpolación lineal, como np.quantile; min_periods cuenta solo los días con dato
+    series = pd.Series(np.where(valid, values, np.nan))
+    return series.rolling(window, min_periods=1).quantile(QUANTILES[stat]).to_numpy()
+
+
+def _rolling_mean(values, valid, window):
+    """Media de los días con dato de cada ventana con sumas acumuladas"""
+    sums = np.concatenate(([0.0], np.cumsum(values)))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    end = np.arange(1, len(values) + 1)
+    start = np.maximum(end - window, 0)
+    total = sums[end] - sums[start]
+    days = counts[end] - counts[start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(days > 0, total / days, np.nan)
@@ -0,0 +1,144 @@
+"""
+Cubo de agregados por año / mes / semana ISO / día de la semana
+
+Se construye una vez al cargar los datos a partir de las sumas prefijas del
+DayStore. Como el DataFrame está ordenado por fecha, cada año, mes o semana es
+un tramo contiguo de filas: una consulta por rango toma las celdas completas
+del cubo y solo recalcula las dos celdas de los extremos (días parciales) con
+las sumas prefijas. El coste depende del número de celdas, no de días.
+"""
+import numpy as np
+import pandas as pd
+from src.utils.calendar_codes import calendar_codes, month_labels
+
+
+# Métricas del cubo: clave del índice de sumas prefijas -> columna del resultado
+ROLLUP_METRICS = {
+    'total_steps': 'Recuento de pasos',
+    'total_distance': 'Distancia_km',
+    'total_calories': 'Calorías (kcal)',
+    'total_active_minutes': 'Recuento de Minutos Activos',
+    'active_days': 'dias_activos'
+}
+
+# Columnas clave de cada nivel
+LEVEL_KEYS = {
+    'year': ['Año'],
+    'month': ['Año', 'Mes', 'MesNombre'],
+    'week': ['AñoISO', 'SemanaISO'],
+    'weekday': ['DíaSemanaNum']
+}
+
+
+class RollupCube:
+    """
+    Agregados precalculados por periodo sobre un DayStore
+
+    Args:
+        store: DayStore con las sumas prefijas
+        daily: Valores diarios de cada métrica (los mismos que acumula el store)
+    """
+
+    def __init__(self, store, daily):
+        self.store = store
+        self._daily = {key: daily[key] for key in ROLLUP_METRICS}
+        codes = calendar_codes(store.days.astype('datetime64[D]'))
+
+        # Identificadores crecientes de cada periodo (las filas están ordenadas por fecha)
+        years = codes['year'].astype(np.int64)
+        months = years * 12 + codes['month'] - 1
+        iso_weeks = codes['iso_year'].astype(np.int64) * 53 + codes['iso_week']
+
+        self.levels = {
+            'year': self._build_level(years),
+            'month': self._build_level(months),
+            'week': self._build_level(iso_weeks)
+        }
+        first_rows = {level: self.levels[level]['starts'][:-1] for level in self.levels}
+        self.keys = {
+            'year': pd.DataFrame({'Año': years[first_rows['year']]}),
+            'month': pd.DataFrame({
+                'Año': years[first_rows['month']],
+                'Mes': codes['month'][first_rows['month']].astype(np.int64),
+                'MesNombre': month_labels(codes['month'][first_rows['month']])
+            }),
+            'week': pd.DataFrame({
+                'AñoISO': codes['iso_year'][first_rows['week']].astype(np.int64),
+                'SemanaISO': codes['iso_week'][first_rows['week']].astype(np.int64)
+            })
+        }
+
+        # Día de la semana: sumas prefijas por columna (lunes=0 ... domingo=6)
+        weekday = codes['weekday']
+        self.weekday_prefix = {}
+        for key, values in self._daily.items():
+            one_hot = np.zeros((len(values), 7), dtype=values.dtype)
+            one_hot[np.arange(len(values)), weekday] = values
+            self.weekday_prefix[key] = np.vstack((np.zeros((1, 7), dtype=values.dtype), np.cumsum(one_hot, axis=0)))
+        days_hot = np.zeros((len(store.days), 7), dtype=np.int64)
+        days_hot[np.arange(len(store.days)), weekday] = 1
+        self.weekday_prefix['days'] = np.vstack((np.zeros((1, 7), dtype=np.int64), np.cumsum(days_hot, axis=0)))
+
+    def _build_level(self, bucket_ids):
+        """Límites de los tramos contiguos de cada periodo y sus totales completos"""
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket_ids)) + 1, [len(bucket_ids)]))
+        # Las celdas completas se suman con groupby (suma compensada, como antes en
+        # cada gráfico) para que los totales mostrados no cambien por redondeo
+        bucket = np.repeat(np.arange(len(starts) - 1), np.diff(starts))
+        cells = {
+            key: pd.Series(values).groupby(bucket).sum().to_numpy()
+            for key, values in self._daily.items()
+        }
+        cells['days'] = np.diff(starts)
+        return {'starts': starts, 'cells': cells}
+
+    def aggregate(self, level, start_date=None, end_date=None):
+        """
+        Totales por periodo dentro de un rango de fechas
+
+        Args:
+            level: 'year', 'month', 'week' o 'weekday'
+            start_date: Fecha de inicio (None para sin límite)
+            end_date: Fecha de fin (None para sin límite)
+
+        Returns:
+            pd.DataFrame: Claves del periodo, sumas de ROLLUP_METRICS y 'dias'
+        """
+        start, end = self.store.bounds(start_date, end_date)
+        if level == 'weekday':
+            return self._aggregate_weekday(start, end)
+
+        starts = self.levels[level]['starts']
+        cells = self.levels[level]['cells']
+        first = int(np.searchsorted(starts, start, side='right')) - 1
+        last = int(np.searchsorted(starts, end, side='left'))
+        if end <= start:
+            first = last = 0
+
+        result = self.keys[level].iloc[first:last].reset_index(drop=True)
+        # Solo las celdas de los extremos recortadas por el rango se recalculan
+        edges = [
+            k for k in sorted({first, last - 1})
+            if first <= k < last and (starts[k] < start or starts[k + 1] > end)
+        ]
+        for key, col in ROLLUP_METRICS.items():
+            values = cells[key][first:last].copy()
+            for k in edges:
+                # Celdas de los extremos: solo los días dentro del rango
+                lo, hi = max(starts[k], start), min(starts[k + 1], end)
+                values[k - first] = self.store.range_sum(key, lo, hi)
+            result[col] = values
+        days = cells['days'][first:last].copy()
+        for k in edges:
+            days[k - first] = min(starts[k + 1], end) - max(starts[k], start)
+        result['dias'] = days
+        return result
+
+    def _aggregate_weekday(self, start, end):
+        """Totales por día de la semana con las sumas prefijas por columna"""
+        result = pd.DataFrame({'DíaSemanaNum': np.arange(7)})
+        for key, col in ROLLUP_METRICS.items():
+            prefix = self.weekday_prefix[key]
+            result[col] = prefix[end] - prefix[start]
+        result['dias'] = self.weekday_prefix['days'][end] - self.weekday_prefix['days'][start]
+        return result
@@ -0,0 +1,126 @@
+"""
+Rachas de días seguidos que cumplen una condición (codificación por tramos)
+
+Cada condición (días con pasos, días que alcanzan un objetivo) se reduce a sus
+rachas: pares (primer día, último día) de días consecutivos que la cumplen. Las
+rachas de todas las condiciones salen de una sola pasada vectorial sobre la
+matriz días x condiciones, y cualquier rango de fechas se responde con dos
+búsquedas binarias y recortando la primera y la última racha a los extremos
+del rango, sin volver a recorrer los días.
+"""
+import numpy as np
+import pandas as pd
+from config.settings import GOALS, STREAKS, STREAK_GAP_BINS
+
+
+class StreakIndex:
+    """
+    Rachas de varias condiciones sobre los mismos días
+
+    Dos filas seguidas pertenecen a la misma racha si ambas cumplen la
+    condición y sus días son consecutivos (un día sin fila corta la racha).
+
+    Args:
+        days: Día (desde 1970-01-01) de cada fila, en orden creciente
+        flags: Matriz booleana filas x condiciones
+        names: Nombre de cada condición (columnas de flags)
+    """
+
+    def __init__(self, days, flags, names):
+        days = np.asarray(days, dtype=np.int64)
+        flags = np.asarray(flags, dtype=bool).reshape(len(days), len(names))
+        self.names = list(names)
+
+        # Una fila continúa la racha de la anterior si las dos cumplen y no hay días entre ellas
+        follows = flags[1:] & flags[:-1] & (np.diff(days) == 1)[:, None]
+        first = flags.copy()
+        first[1:] &= ~follows
+        last = flags.copy()
+        last[:-1] &= ~follows
+
+        # nonzero sobre la traspuesta: ordenado por condición y, dentro de ella, por fila
+        conditions, first_rows = np.nonzero(first.T)
+        _, last_rows = np.nonzero(last.T)
+        limits = np.searchsorted(conditions, np.arange(len(self.names) + 1))
+        self.runs = {
+            name: (days[first_rows[lo:hi]], days[last_rows[lo:hi]])
+            for name, lo, hi in zip(self.names, limits[:-1], limits[1:])
+        }
+
+    def query(self, name, first_day, last_day):
+        """
+        Rachas de una condición entre dos días (ambos incluidos)
+
+        Las rachas que cruzan los extremos cuentan solo sus días dentro del rango.
+
+        Returns:
+            dict: 'days' (días que cumplen), 'runs' (número de rachas),
+            'longest' y 'longest_start' (racha más larga y su primer día),
+            'current' (racha que llega al último día, 0 si no cumple),
+            'longest_gap' (más días seguidos sin cumplir) y 'gaps' (huecos
+            por tramo de STREAK_GAP_BINS)
+        """
+        starts, ends = self.runs[name]
+        lo = int(np.searchsorted(ends, first_day, side='left'))
+        hi = int(np.searchsorted(starts, last_day, side='right'))
+        starts = np.maximum(starts[lo:hi], first_day)
+        ends = np.minimum(ends[lo:hi], last_day)
+        lengths = ends - starts + 1
+
+        if len(lengths):
+            gaps = np.concatenate(([starts[0] - first_day], starts[1:] - ends[:-1] - 1, [last_day - ends[-1]]))
+        else:
+            gaps = np.array([max(last_day - first_day + 1, 0)])
+        gaps = gaps[gaps > 0]
+
+        longest = int(np.argmax(lengths)) if len(lengths) else None
+        return {
+            'days': int(lengths.sum()),
+            'runs': len(lengths),
+            'longest': int(lengths[longest]) if longest is not None else 0,
+            'longest_start': int(starts[longest]) if longest is not None else None,
+            'current': int(lengths[-1]) if len(lengths) and ends[-1] == last_day else 0,
+            'longest_gap': int(gaps.max()) if len(gaps) else 0,
+            'gaps': gap_histogram(gaps)
+        }
+
+    def summary(self, first_day, last_day):
+        """Rachas de todas las condiciones entre dos días: nombre -> query()"""
+        return {name: self.query(name, first_day, last_day) for name in self.names}
+
+
+def with_dates(streaks):
+    """Pasa el primer día de la racha más larga ('longest_start') a pd.Timestamp en un summary()"""
+    for streak in streaks.values():
+        if streak['longest_start'] is not None:
+            streak['longest_start'] = pd.Timestamp(np.datetime64(streak['longest_start'], 'D'))
+    return streaks
+
+
+def gap_histogram(gaps):
+    """Número de huecos de cada tramo de STREAK_GAP_BINS"""
+    bins = np.searchsorted(STREAK_GAP_BINS, gaps, side='right') - 1
+    return np.bincount(bins[bins >= 0], minlength=len(STREAK_GAP_BINS)).tolist()
+
+
+def build_streak_index(days, steps, distance, calories):
+    """
+    Índice de rachas de las condiciones de STREAKS
+
+    Args:
+        days: Día (desde 1970-01-01) de cada fila, en orden creciente
+        steps, distance, calories: Valores diarios (en el orden de las filas)
+    """
+    values = {
+        'daily_steps': np.asarray(steps, dtype=np.float64),
+        'daily_distance': np.asarray(distance, dtype=np.float64),
+        'daily_calories': np.asarray(calories, dtype=np.float64)
+    }
+    columns = []
+    for streak in STREAKS.values():
+        if streak['goal'] is None:
+            columns.append(values['daily_steps'] > 0)
+        else:
+            columns.append(values[streak['goal']] >= GOALS[streak['goal']])
+    flags = np.column_stack(columns) if columns else np.zeros((len(days), 0), dtype=bool)
+    return StreakIndex(days, flags, STREAKS.keys())
@@ -0,0 +1,264 @@
+"""
+Importación de la exportación de Google Takeout con un CSV por día
+
+Takeout guarda en 'Fit/Daily activity metrics/' un archivo 'AAAA-MM-DD.csv'
+por día con filas de intervalos de 15 minutos. Los archivos se leen en paralelo
+con un pool de procesos y los intervalos ya leídos se guardan en la caché
+columnar junto con el tamaño y la fecha de modificación de cada archivo, de
+modo que una nueva importación solo lee los archivos nuevos o modificados.
+"""
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from config.settings import DATA_CACHE, TAKEOUT
+from src.utils.data_cache import read_cached_entry, write_cached_frame
+
+# Versión del formato de los intervalos cacheados (y de su reducción a días)
+INTERVALS_VERSION = 2
+
+# Archivos diarios: '2021-03-05.csv' (Takeout puede añadir sufijos, p. ej. '2021-03-05 (1).csv')
+DAY_FILE_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2}).*\.csv$')
+
+# Columnas de tiempo de cada intervalo (hora local con zona: '00:15:00.000+01:00')
+TIME_COLUMNS = ('Start time', 'End time')
+
+# Cabeceras de las columnas de tiempo según el idioma de la exportación
+TIME_COLUMN_NAMES = {
+    'Start time': 'Start time',
+    'End time': 'End time',
+    'Hora de inicio': 'Start time',
+    'Hora de finalización': 'End time'
+}
+
+# Cómo se combinan los intervalos de un día según una palabra de la cabecera
+# (exportaciones en inglés y en español); el resto de columnas se suman
+REDUCTION_WORDS = {
+    'average': 'mean', 'media': 'mean', 'medio': 'mean', 'promedio': 'mean',
+    'max': 'max', 'máxima': 'max', 'máximo': 'max',
+    'min': 'min', 'mínima': 'min', 'mínimo': 'min'
+}
+
+
+def find_day_files(directory):
+    """
+    Lista los CSV diarios de un directorio de Takeout
+
+    Args:
+        directory: Directorio 'Daily activity metrics' de la exportación
+
+    Returns:
+        list: Nombres de archivo ordenados por fecha
+    """
+    return sorted(name for name in os.listdir(directory) if DAY_FILE_PATTERN.match(name))
+
+
+def _file_manifest(directory, names):
+    """Tamaño y mtime de cada archivo: identifican si un archivo cambió"""
+    manifest = {}
+    for name in names:
+        stat = os.stat(os.path.join(directory, name))
+        manifest[name] = [stat.st_size, stat.st_mtime_ns]
+    return manifest
+
+
+def takeout_fingerprint(directory):
+    """
+    Huella de un directorio de Takeout (nombre, tamaño y mtime de cada archivo diario)
+
+    Args:
+        directory: Directorio de la exportación
+
+    Returns:
+        dict: Huella que cambia al añadir, quitar o modificar un archivo
+    """
+    manifest = _file_manifest(directory, find_day_files(directory))
+    digest = hashlib.blake2b(json.dumps(manifest, sort_keys=True).encode('utf-8'), digest_size=16)
+    return {'files': len(manifest), 'hash': digest.hexdigest(), 'intervals': INTERVALS_VERSION}
+
+
+def _parse_day_file(path):
+    """
+    Lee un CSV diario y devuelve sus intervalos (se ejecuta en los procesos del pool)
+
+    Args:
+        path: Ruta del archivo 'AAAA-MM-DD.csv'
+
+    Returns:
+        dict: Columnas (arrays NumPy) con 'Date', inicio/fin ('Start time' y
+        'End time' en cualquier idioma) como fecha y hora local y 'File'; se
+        devuelven arrays y no un DataFrame porque construir un DataFrame por
+        archivo cuesta más que leerlo
+    """
+    name = os.path.basename(path)
+    day = np.datetime64(DAY_FILE_PATTERN.match(name).group(1), 'ns')
+    try:
+        df = pd.read_csv(path, encoding='utf-8')
+    except UnicodeDecodeError:
+        df = pd.read_csv(path, encoding='latin-1')
+    df = df.rename(columns=TIME_COLUMN_NAMES)
+
+    columns = {'Date': np.full(len(df), day)}
+    for col in TIME_COLUMNS:
+        if col in df.columns:
+            columns[col] = day + _time_offsets(df[col])
+    if all(col in columns for col in TIME_COLUMNS):
+        # El último intervalo termina a las 00:00 del día siguiente
+        start, end = columns['Start time'], columns['End time']
+        columns['End time'] = np.where(end <= start, end + np.timedelta64(1, 'D'), end)
+    for col in df.columns:
+        if col not in TIME_COLUMNS and col not in columns:
+            columns[col] = df[col].to_numpy()
+    columns['File'] = np.full(len(df), name, dtype=object)
+    return columns
+
+
+# 'HH:MM:SS.mmm...' -> desfase desde medianoche (cada archivo repite las mismas 96 horas)
+_TIME_OFFSETS = {}
+
+
+def _time_offsets(values):
+    """
+    Convierte las horas locales de un archivo a desfases desde medianoche
+
+    La hora se toma como hora local: se descarta el desfase horario ('+01:00').
+    Cada hora distinta se convierte una sola vez por proceso.
+    """
+    codes, uniques = pd.factorize(values)
+    lookup = np.full(len(uniques) + 1, np.timedelta64('NaT'), dtype='timedelta64[ns]')
+    for i, text in enumerate(uniques):
+        offset = _TIME_OFFSETS.get(text)
+        if offset is None:
+            offset = pd.to_timedelta(str(text)[:12], errors='coerce')
+            offset = _TIME_OFFSETS[text] = np.timedelta64('NaT') if pd.isna(offset) else offset.to_timedelta64()
+        lookup[i] = offset
+    # Los valores vacíos tienen código -1: la última posición (NaT)
+    return lookup[codes]
+
+
+def load_takeout_intervals(directory, workers=None, use_cache=None):
+    """
+    Carga los intervalos de todos los CSV diarios de un directorio de Takeout
+
+    Los archivos que no han cambiado desde la última importación se toman de
+    la caché; el resto se leen en paralelo con un pool de procesos.
+
+    Args:
+        directory: Directorio 'Daily activity metrics' de la exportación
+        workers: Procesos del pool (por defecto TAKEOUT['workers'], None = núcleos)
+        use_cache: Reutilizar los intervalos cacheados (por defecto DATA_CACHE['enabled'])
+
+    Returns:
+        pd.DataFrame: Intervalos de todos los días ordenados por hora de inicio
+    """
+    if use_cache is None:
+        use_cache = DATA_CACHE['enabled']
+    if workers is None:
+        workers = TAKEOUT['workers']
+    cache_dir = os.path.join(DATA_CACHE['dir'], 'takeout')
+
+    names = find_day_files(directory)
+    manifest = _file_manifest(directory, names)
+
+    reused = []
+    pending = names
+    if use_cache:
+        entry = read_cached_entry(directory, INTERVALS_VERSION, cache_dir)
+        if entry is not None:
+            cached, cached_manifest = entry
+            unchanged = [name for name in names if cached_manifest.get(name) == manifest[name]]
+            if unchanged:
+                kept = cached[cached['File'].isin(unchanged)]
+                reused = [{col: kept[col].to_numpy() for col in kept.columns}]
+                unchanged = set(unchanged)
+                pending = [name for name in names if name not in unchanged]
+
+    parsed = _parse_files([os.path.join(directory, name) for name in pending], workers)
+    intervals = _concat_columns([part for part in reused + parsed if len(part['Date'])])
+    if intervals is None:
+        raise ValueError(f"No hay archivos diarios de Takeout en {directory}")
+
+    if use_cache and pending:
+        write_cached_frame(intervals, directory, manifest, INTERVALS_VERSION, cache_dir)
+    return intervals
+
+
+def _concat_columns(parts):
+    """Une las columnas de todos los archivos en un DataFrame ordenado por día y hora"""
+    if not parts:
+        return None
+
+    names = list(dict.fromkeys(col for part in parts for col in part))
+    columns = {}
+    for col in names:
+        # Archivos de exportaciones antiguas pueden no tener todas las columnas
+        columns[col] = np.concatenate([
+            part[col] if col in part else np.full(len(part['Date']), np.nan)
+            for part in parts
+        ])
+
+    keys = [columns['Date']] if 'Start time' not in columns else [columns['Start time'], columns['Date']]
+    order = np.lexsort(keys)
+    columns = {col: values[order] for col, values in columns.items()}
+    columns['File'] = pd.Categorical(columns['File'])
+    return pd.DataFrame(columns, copy=False)
+
+
+def _parse_files(paths, workers):
+    """Lee los archivos en un pool de procesos (o en serie si son pocos)"""
+    workers = workers or os.cpu_count() or 1
+    if len(paths) < TAKEOUT['min_parallel_files'] or workers == 1:
+        return [_parse_day_file(path) for path in paths]
+
+    # Archivos pequeños: repartirlos en lotes para no pagar un envío por archivo
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_parse_day_file, paths, chunksize=chunksize))
+
+
+def reduce_to_daily(intervals):
+    """
+    Agrega los intervalos a una fila por día con el esquema del CSV diario
+
+    Las columnas de medias ('Average ...', '... media (...)') se promedian, las
+    de máximos y mínimos ('Max ...', '... máxima (...)') toman el máximo y el
+    mínimo y el resto de columnas numéricas se suman (ver REDUCTION_WORDS).
+
+    Args:
+        intervals: Intervalos de load_takeout_intervals()
+
+    Returns:
+        pd.DataFrame: Una fila por día con 'Date' en formato 'AAAA-MM-DD'
+    """
+    columns = [
+        col for col in intervals.columns
+        if col not in ('Date', 'File') + TIME_COLUMNS and pd.api.types.is_numeric_dtype(intervals[col])
+    ]
+    by_kind = {'mean': [], 'max': [], 'min': [], 'sum': []}
+    for col in columns:
+        by_kind[_reduction(col)].append(col)
+
+    grouped = intervals.groupby('Date', sort=True)
+    parts = [
+        grouped[by_kind['mean']].mean(),
+        grouped[by_kind['max']].max(),
+        grouped[by_kind['min']].min(),
+        # min_count=1: un día sin ningún valor queda NaN, como en el CSV diario
+        grouped[by_kind['sum']].sum(min_count=1)
+    ]
+    daily = pd.concat(parts, axis=1)[columns].reset_index()
+    daily['Date'] = daily['Date'].dt.strftime('%Y-%m-%d')
+    return daily
+
+
+def _reduction(column):
+    """Reducción de una columna ('mean', 'max', 'min' o 'sum') por las palabras de su cabecera"""
+    # Las unidades entre paréntesis no cuentan: 'Velocidad media (m/s)' -> ['velocidad', 'media']
+    words = column.split('(', 1)[0].lower().split()
+    for word in words:
+        if word in REDUCTION_WORDS:
+            return REDUCTION_WORDS[word]
+    return 'sum'
@@ -0,0 +1,57 @@
+"""
+Índice de valores ordenados por año para contar días por encima de un umbral
+
+Para cada métrica se guardan los valores diarios ordenados dentro de cada año
+(los años son tramos contiguos de filas). Contar los días >= umbral en un rango
+es una búsqueda binaria por cada año completo del rango más una comparación
+directa en los días sueltos de los dos años de los extremos, sin máscaras
+sobre todo el rango: cada consulta cuesta microsegundos aunque el umbral
+cambie en cada petición (controles deslizantes).
+"""
+import numpy as np
+
+
+class ThresholdIndex:
+    """
+    Valores de una métrica ordenados dentro de cada tramo de filas
+
+    Args:
+        values: Valor diario de la métrica (en el orden de las filas; NaN nunca
+            alcanza un umbral)
+        starts: Posiciones de inicio de cada tramo (año), con 0 al principio y
+            el número de filas al final
+    """
+
+    def __init__(self, values, starts):
+        values = np.asarray(values, dtype=np.float64)
+        self.values = np.where(np.isnan(values), -np.inf, values)
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.sorted = self.values.copy()
+        for first, last in zip(self.starts[:-1], self.starts[1:]):
+            self.sorted[first:last].sort()
+
+    def count_at_least(self, threshold, start, end):
+        """
+        Días con valor >= threshold entre las posiciones [start, end)
+
+        Args:
+            threshold: Umbral (incluido)
+            start: Primera fila
+            end: Fila siguiente a la última
+        """
+        if end <= start:
+            return 0
+        # Tramos completos: los que empiezan en [start, ...) y terminan antes de end
+        first_block = int(np.searchsorted(self.starts, start, side='left'))
+        last_block = int(np.searchsorted(self.starts, end, side='right')) - 1
+        if first_block >= last_block:
+            return int(np.count_nonzero(self.values[start:end] >= threshold))
+
+        head_end = self.starts[first_block]
+        tail_start = self.starts[last_block]
+        count = np.count_nonzero(self.values[start:head_end] >= threshold)
+        count += np.count_nonzero(self.values[tail_start:end] >= threshold)
+        for block in range(first_block, last_block):
+            first, last = self.starts[block], self.starts[block + 1]
+            count += (last - first) - np.searchsorted(self.sorted[first:last], threshold, side='left')
+        return int(count)
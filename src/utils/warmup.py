@@ -0,0 +1,105 @@
+"""
+Calentamiento de los cálculos del dashboard al arrancar
+
+El primer visitante tras un despliegue pagaba las rutas de código en frío de
+pandas/plotly y el cálculo completo del rango por defecto. Los callbacks por
+rango (cached_range_callback) y otros cálculos se registran aquí con un
+nombre; start_warmup() los ejecuta en segundo plano con cada rango indicado
+mientras el worker ya acepta peticiones, de modo que sus resultados quedan en
+las cachés, y guarda cuánto tardó cada uno. warmup_status() es lo que devuelve
+el endpoint de disponibilidad: no está listo hasta que termina.
+"""
+import threading
+import time
+
+
+# Nombre -> función (start_date, end_date) a ejecutar en el calentamiento
+_TASKS = {}
+
+# Estado del último calentamiento (ver warmup_status)
+_STATUS = {'ready': False, 'seconds': None, 'tasks': {}}
+_LOCK = threading.Lock()
+
+
+def register_warmup(name, func):
+    """
+    Registra un cálculo para el calentamiento
+
+    Args:
+        name: Nombre con el que aparece en el informe (uno nuevo sustituye al anterior)
+        func: Función (start_date, end_date); su resultado se descarta (las
+            cachés de la propia función lo conservan)
+    """
+    with _LOCK:
+        _TASKS[name] = func
+
+
+def run_warmup(ranges):
+    """
+    Ejecuta todos los cálculos registrados con cada rango
+
+    Los errores de un cálculo se anotan en el informe y no detienen el resto.
+
+    Args:
+        ranges: dict etiqueta -> (start_date, end_date)
+
+    Returns:
+        dict: Estado final (warmup_status())
+    """
+    with _LOCK:
+        tasks = dict(_TASKS)
+        _STATUS.update(ready=False, seconds=None, tasks={})
+
+    started = time.perf_counter()
+    report = {}
+    for name, func in tasks.items():
+        entry = {'total_ms': 0.0, 'ranges': {}, 'error': None}
+        for label, (start_date, end_date) in ranges.items():
+            task_started = time.perf_counter()
+            try:
+                func(start_date, end_date)
+            except Exception as error:
+                entry['error'] = f'{label}: {type(error).__name__}: {error}'
+            ms = (time.perf_counter() - task_started) * 1000
+            entry['ranges'][label] = round(ms, 2)
+            entry['total_ms'] += ms
+        entry['total_ms'] = round(entry['total_ms'], 2)
+        report[name] = entry
+
+    with _LOCK:
+        _STATUS.update(ready=True, seconds=round(time.perf_counter() - started, 3), tasks=report)
+    return warmup_status()
+
+
+def start_warmup(ranges):
+    """
+    Ejecuta run_warmup(ranges) en un hilo en segundo plano
+
+    Returns:
+        threading.Thread: Hilo del calentamiento (daemon, ya iniciado)
+    """
+    thread = threading.Thread(target=run_warmup, args=(ranges,), name='warmup', daemon=True)
+    thread.start()
+    return thread
+
+
+def mark_ready():
+    """Marca el proceso como disponible sin calentar (calentamiento desactivado)"""
+    with _LOCK:
+        _STATUS['ready'] = True
+
+
+def warmup_status():
+    """
+    Estado del calentamiento
+
+    Returns:
+        dict: 'ready', 'seconds' (duración total) y 'tasks' (por cálculo: tiempo
+        total y por rango en ms y el último error, si lo hubo)
+    """
+    with _LOCK:
+        return {
+            'ready': _STATUS['ready'],
+            'seconds': _STATUS['seconds'],
+            'tasks': {name: {**entry, 'ranges': dict(entry['ranges'])} for name, entry in _STATUS['tasks'].items()}
+        }
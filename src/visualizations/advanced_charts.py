@@ -1,172 +1,149 @@
 """
 Funciones para crear visualizaciones avanzadas
 """
-import plotly.graph_objects as go
 import numpy as np
-from datetime import timedelta
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-from config.settings import COLORS, CHART_CONFIG, GOALS
+from config.settings import COLORS, GOALS, SERIES_RENDER, STREAKS, STREAK_GAP_BINS
+from src.visualizations.figure_builder import figure, trace, axis, message_figure
+from src.visualizations.series_traces import series_trace, overlay_traces
 
 
-def create_heatmap_calendar(df):
-    """Crea calendario heatmap de actividad"""
-    heatmap_data = df[df['Recuento de pasos'] > 0].copy()
-    heatmap_data['DíaSemana'] = heatmap_data['Fecha'].dt.dayofweek
-    heatmap_data['Semana'] = heatmap_data['Fecha'].dt.isocalendar().week
-    heatmap_data['Año'] = heatmap_data['Fecha'].dt.year
-    
-    pivot_data = heatmap_data.pivot_table(
-        values='Recuento de pasos',
-        index='Semana',
-        columns='DíaSemana',
-        aggfunc='sum',
-        fill_value=0
-    )
-    
-    for day in range(7):
-        if day not in pivot_data.columns:
-            pivot_data[day] = 0
-    
-    pivot_data = pivot_data.sort_index(axis=1)
-    
-    fig = go.Figure(data=go.Heatmap(
-        z=pivot_data.values,
+def create_heatmap_calendar(calendar):
+    """
+    Crea calendario heatmap de actividad
+    
+    Args:
+        calendar: Rejilla de calendar_grid(): una fila por semana (AñoISO,
+            SemanaISO) y columnas 0-6 con los pasos de lunes a domingo
+    """
+    labels = [f'{year} · Sem {week:02d}' for year, week in calendar.index]
+    
+    heatmap = trace(
+        'heatmap',
+        z=calendar.to_numpy(),
         x=['Lun', 'Mar', 'Mié', 'Jue', 'Vie', 'Sáb', 'Dom'],
-        y=[f'Semana {int(i)}' for i in pivot_data.index],
+        y=labels,
         colorscale=[[0, COLORS['surface']], [0.5, COLORS['warning']], [1, COLORS['success']]],
         showscale=True,
-        hovertemplate='%{x}<br>Semana %{y}<br>Pasos: %{z:,.0f}<extra></extra>',
-        colorbar=dict(title='Pasos')
-    ))
-    
-    fig.update_layout(
-        **CHART_CONFIG,
-        xaxis=dict(side='top'),
-        height=400
+        hovertemplate='%{x}<br>%{y}<br>Pasos: %{z:,.0f}<extra></extra>',
+        colorbar=dict(title=dict(text='Pasos'))
     )
     
-    return fig
+    return figure([heatmap], xaxis=dict(side='top'), height=400)
 
 
-def create_weight_trend_chart(df):
-    """Crea gráfico de evolución de peso"""
+def create_weight_trend_chart(view, max_points=SERIES_RENDER['max_points'], x_range=None, overlays=None):
+    """Crea gráfico de evolución de peso (RangeView, LTTB, zoom y estadísticas móviles como create_steps_trend_chart)"""
+    df = view.data
     # Verificar si existe la columna y tiene datos
-    if 'Peso medio (kg)' not in df.columns or df['Peso medio (kg)'].sum() == 0:
+    if 'Peso medio (kg)' not in df.columns or not view.mask('Peso medio (kg)').any():
         # Crear gráfico vacío con mensaje
-        fig = go.Figure()
-        fig.add_annotation(
-            text="No hay datos de peso disponibles",
-            xref="paper", yref="paper",
-            x=0.5, y=0.5, showarrow=False,
-            font=dict(size=16, color="#8892ab")
-        )
-        fig.update_layout(**CHART_CONFIG, height=300)
-        return fig
-    
-    weight_data = df[df['Peso medio (kg)'] > 0].copy()
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=weight_data['Fecha'],
-        y=weight_data['Peso medio (kg)'],
+        return message_figure("No hay datos de peso disponibles", height=300)
+    
+    weight_data = view.positive('Peso medio (kg)')
+    
+    weight = series_trace(
+        weight_data['Fecha'],
+        weight_data['Peso medio (kg)'],
+        max_points,
+        x_range,
         mode='lines+markers',
         name='Peso',
         line=dict(color=COLORS['secondary'], width=3),
         marker=dict(size=6),
         fill='tozeroy',
         fillcolor='rgba(255, 107, 157, 0.1)'
-    ))
+    )
     
-    fig.update_layout(
-        **CHART_CONFIG,
-        xaxis=dict(gridcolor='rgba(255,255,255,0.05)'),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.05)', title='Peso (kg)'),
+    return figure(
+        [weight, *overlay_traces(df['Fecha'], overlays, max_points, x_range)],
+        xaxis=axis(),
+        yaxis=axis('Peso (kg)'),
         hovermode='x unified'
     )
-    
-    return fig
 
 
-def create_speed_analysis_chart(df):
-    """Crea gráfico de análisis de velocidad y pace"""
-    speed_data = df[df['Velocidad_kmh'] > 0].copy()
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=speed_data['Fecha'],
-        y=speed_data['Velocidad_kmh'],
+def create_speed_analysis_chart(view, max_points=SERIES_RENDER['max_points'], x_range=None, overlays=None):
+    """Crea gráfico de análisis de velocidad y pace (RangeView, LTTB, zoom y estadísticas móviles como create_steps_trend_chart)"""
+    df = view.data
+    speed_data = view.positive('Velocidad_kmh')
+    
+    speed = series_trace(
+        speed_data['Fecha'],
+        speed_data['Velocidad_kmh'],
+        max_points,
+        x_range,
         mode='lines',
         name='Velocidad (km/h)',
         line=dict(color=COLORS['primary'], width=2)
-    ))
-    fig.add_trace(go.Scatter(
-        x=speed_data['Fecha'],
-        y=speed_data['Pace_min_km'],
+    )
+    pace = series_trace(
+        speed_data['Fecha'],
+        speed_data['Pace_min_km'],
+        max_points,
+        x_range,
         mode='lines',
         name='Pace (min/km)',
         line=dict(color=COLORS['warning'], width=2),
         yaxis='y2'
-    ))
+    )
     
-    fig.update_layout(
-        **CHART_CONFIG,
+    return figure(
+        [speed, pace, *overlay_traces(df['Fecha'], overlays, max_points, x_range)],
         showlegend=True,
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-        xaxis=dict(gridcolor='rgba(255,255,255,0.05)'),
-        yaxis=dict(title='Velocidad (km/h)', gridcolor='rgba(255,255,255,0.05)'),
-        yaxis2=dict(title='Pace (min/km)', overlaying='y', side='right', gridcolor='rgba(255,255,255,0.05)')
+        xaxis=axis(),
+        yaxis=axis('Velocidad (km/h)'),
+        yaxis2=axis('Pace (min/km)', overlaying='y', side='right')
     )
-    
-    return fig
 
 
-def create_heart_rate_chart(df):
-    """Crea gráfico de frecuencia cardíaca"""
+def create_heart_rate_chart(view, max_points=SERIES_RENDER['max_points'], x_range=None, overlays=None):
+    """Crea gráfico de frecuencia cardíaca (RangeView, LTTB, zoom y estadísticas móviles como create_steps_trend_chart)"""
+    df = view.data
     # Verificar si existe la columna y tiene datos
-    if 'Frecuencia cardiaca media (ppm)' not in df.columns or df['Frecuencia cardiaca media (ppm)'].sum() == 0:
+    if 'Frecuencia cardiaca media (ppm)' not in df.columns or not view.mask('Frecuencia cardiaca media (ppm)').any():
         # Crear gráfico vacío con mensaje
-        fig = go.Figure()
-        fig.add_annotation(
-            text="No hay datos de frecuencia cardíaca disponibles",
-            xref="paper", yref="paper",
-            x=0.5, y=0.5, showarrow=False,
-            font=dict(size=16, color="#8892ab")
-        )
-        fig.update_layout(**CHART_CONFIG, height=300)
-        return fig
+        return message_figure("No hay datos de frecuencia cardíaca disponibles", height=300)
     
-    hr_data = df[df['Frecuencia cardiaca media (ppm)'] > 0].copy()
+    hr_data = view.positive('Frecuencia cardiaca media (ppm)')
     
-    fig = go.Figure()
+    traces = []
     
     # Verificar qué columnas de frecuencia cardíaca existen
     has_max = 'Frecuencia cardiaca máxima (ppm)' in hr_data.columns and hr_data['Frecuencia cardiaca máxima (ppm)'].sum() > 0
     has_min = 'Frecuencia cardiaca mínima (ppm)' in hr_data.columns and hr_data['Frecuencia cardiaca mínima (ppm)'].sum() > 0
     
     if has_max:
-        fig.add_trace(go.Scatter(
-            x=hr_data['Fecha'],
-            y=hr_data['Frecuencia cardiaca máxima (ppm)'],
+        traces.append(series_trace(
+            hr_data['Fecha'],
+            hr_data['Frecuencia cardiaca máxima (ppm)'],
+            max_points,
+            x_range,
             mode='lines',
             name='FC Máxima',
             line=dict(color=COLORS['secondary'], width=1),
             fill=None
         ))
     
-    fig.add_trace(go.Scatter(
-        x=hr_data['Fecha'],
-        y=hr_data['Frecuencia cardiaca media (ppm)'],
+    traces.append(series_trace(
+        hr_data['Fecha'],
+        hr_data['Frecuencia cardiaca media (ppm)'],
+        max_points,
+        x_range,
         mode='lines',
         name='FC Media',
         line=dict(color=COLORS['primary'], width=2)
     ))
     
     if has_min:
-        fig.add_trace(go.Scatter(
-            x=hr_data['Fecha'],
-            y=hr_data['Frecuencia cardiaca mínima (ppm)'],
+        traces.append(series_trace(
+            hr_data['Fecha'],
+            hr_data['Frecuencia cardiaca mínima (ppm)'],
+            max_points,
+            x_range,
             mode='lines',
             name='FC Mínima',
             line=dict(color=COLORS['success'], width=1),
@@ -174,160 +151,239 @@ def create_heart_rate_chart(df):
             fillcolor='rgba(0, 212, 255, 0.1)'
         ))
     
-    fig.update_layout(
-        **CHART_CONFIG,
+    traces.extend(overlay_traces(df['Fecha'], overlays, max_points, x_range))
+    
+    return figure(
+        traces,
         showlegend=True,
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-        xaxis=dict(gridcolor='rgba(255,255,255,0.05)'),
-        yaxis=dict(title='BPM', gridcolor='rgba(255,255,255,0.05)'),
+        xaxis=axis(),
+        yaxis=axis('BPM'),
         hovermode='x unified'
     )
-    
-    return fig
 
 
-def create_year_comparison_chart(df):
-    """Crea comparativa año vs año"""
-    yearly_comparison = df.groupby('Año').agg({
-        'Recuento de pasos': 'sum',
-        'Distancia_km': 'sum',
-        'Calorías (kcal)': 'sum'
-    }).reset_index()
-    
-    fig = go.Figure()
-    fig.add_trace(go.Bar(
+def create_year_comparison_chart(yearly_comparison):
+    """
+    Crea comparativa año vs año
+    
+    Args:
+        yearly_comparison: Totales por año (aggregate_by_period(df, 'year'))
+    """
+    bars = trace(
+        'bar',
         x=yearly_comparison['Año'],
         y=yearly_comparison['Recuento de pasos'],
         name='Pasos',
-        marker_color=COLORS['primary'],
+        marker=dict(color=COLORS['primary']),
         text=yearly_comparison['Recuento de pasos'].apply(lambda x: f'{int(x/1000)}K'),
         textposition='outside'
-    ))
+    )
     
-    fig.update_layout(
-        **CHART_CONFIG,
+    return figure(
+        [bars],
         showlegend=False,
-        xaxis=dict(gridcolor='rgba(255,255,255,0.05)', type='category'),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.05)', title='Pasos Totales')
+        xaxis=axis(type='category'),
+        yaxis=axis('Pasos Totales')
     )
-    
-    return fig
 
 
-def create_goals_progress_chart(df):
-    """Crea gráfico de progreso hacia objetivos"""
-    dias_con_datos = len(df[df['Recuento de pasos'] > 0])
-    dias_objetivo_pasos = len(df[df['Recuento de pasos'] >= GOALS['daily_steps']])
-    dias_objetivo_distancia = len(df[df['Distancia_km'] >= GOALS['daily_distance']])
-    dias_objetivo_calorias = len(df[df['Calorías (kcal)'] >= GOALS['daily_calories']])
-    
-    porcentaje_pasos = (dias_objetivo_pasos / dias_con_datos * 100) if dias_con_datos > 0 else 0
-    porcentaje_distancia = (dias_objetivo_distancia / dias_con_datos * 100) if dias_con_datos > 0 else 0
-    porcentaje_calorias = (dias_objetivo_calorias / dias_con_datos * 100) if dias_con_datos > 0 else 0
-    
-    fig = go.Figure()
-    fig.add_trace(go.Bar(
-        x=[porcentaje_pasos, porcentaje_distancia, porcentaje_calorias],
-        y=[f'{GOALS["daily_steps"]:,} Pasos/día', f'{GOALS["daily_distance"]} km/día', f'{GOALS["daily_calories"]:,} kcal/día'],
+def create_goals_progress_chart(goal_days, goals=GOALS):
+    """
+    Crea gráfico de progreso hacia objetivos
+    
+    Args:
+        goal_days: Días activos y días que alcanzan cada objetivo (count_goal_days()
+            o count_days_at_least() con los mismos goals)
+        goals: Objetivos mostrados (mismas claves que GOALS)
+    """
+    bars = trace(
+        'bar',
+        **goal_bars(goal_days, goals),
         orientation='h',
         marker=dict(color=[COLORS['primary'], COLORS['success'], COLORS['secondary']]),
-        text=[f'{porcentaje_pasos:.1f}%', f'{porcentaje_distancia:.1f}%', f'{porcentaje_calorias:.1f}%'],
         textposition='outside'
-    ))
+    )
     
-    fig.update_layout(
-        **CHART_CONFIG,
+    return figure(
+        [bars],
         showlegend=False,
-        xaxis=dict(gridcolor='rgba(255,255,255,0.05)', title='% de días alcanzando objetivo', range=[0, 100]),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.05)')
+        xaxis=axis('% de días alcanzando objetivo', range=[0, 100]),
+        yaxis=axis()
+    )
+
+
+def goal_bars(goal_days, goals=GOALS):
+    """
+    Valores de las barras del gráfico de objetivos (x, y, text)
+    
+    El explorador de objetivos actualiza solo estas tres propiedades (Patch)
+    en lugar de reconstruir la figura.
+    
+    Args:
+        goal_days: Días activos y días que alcanzan cada objetivo (count_goal_days()
+            o count_days_at_least())
+        goals: Objetivos (mismas claves que GOALS)
+    
+    Returns:
+        dict: Porcentaje de días activos que alcanza cada objetivo, etiquetas y textos
+    """
+    dias_con_datos = goal_days['active_days']
+    dias_objetivo = [goal_days['steps'], goal_days['distance'], goal_days['calories']]
+    porcentajes = [(dias / dias_con_datos * 100) if dias_con_datos > 0 else 0 for dias in dias_objetivo]
+    return {
+        'x': porcentajes,
+        'y': [f'{goals["daily_steps"]:,} Pasos/día', f'{goals["daily_distance"]} km/día', f'{goals["daily_calories"]:,} kcal/día'],
+        'text': [f'{porcentaje:.1f}%' for porcentaje in porcentajes]
+    }
+
+
+def create_streaks_chart(streaks):
+    """
+    Crea gráfico de rachas: racha más larga y actual de cada condición (izquierda)
+    y distribución de los huecos entre rachas de días activos (derecha)
+    
+    Args:
+        streaks: Rachas del rango (streak_stats())
+    """
+    labels = [STREAKS[name]['label'] for name in streaks]
+    longest = trace(
+        'bar',
+        x=labels,
+        y=[streak['longest'] for streak in streaks.values()],
+        name='Racha más larga',
+        marker=dict(color=COLORS['primary']),
+        textposition='outside',
+        text=[f"{streak['longest']:,}" for streak in streaks.values()]
+    )
+    current = trace(
+        'bar',
+        x=labels,
+        y=[streak['current'] for streak in streaks.values()],
+        name='Racha actual',
+        marker=dict(color=COLORS['success']),
+        textposition='outside',
+        text=[f"{streak['current']:,}" for streak in streaks.values()]
+    )
+    
+    # Etiquetas de los tramos de huecos: 1, 2-3, 4-7... y el último abierto
+    bounds = STREAK_GAP_BINS + [None]
+    gap_labels = [
+        f'{low}' if high == low + 1 else f'{low}-{high - 1}' if high else f'{low}+'
+        for low, high in zip(bounds[:-1], bounds[1:])
+    ]
+    gaps = trace(
+        'bar',
+        x=gap_labels,
+        y=streaks['active']['gaps'] if 'active' in streaks else [0] * len(gap_labels),
+        name='Huecos sin actividad',
+        marker=dict(color=COLORS['secondary']),
+        xaxis='x2',
+        yaxis='y2'
     )
     
-    return fig
+    return figure(
+        [longest, current, gaps],
+        barmode='group',
+        showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        xaxis=axis(domain=[0, 0.55]),
+        yaxis=axis('Días seguidos'),
+        xaxis2=axis('Días seguidos sin actividad', domain=[0.65, 1], type='category', anchor='y2'),
+        yaxis2=axis('Huecos', anchor='x2')
+    )
 
 
-def create_intensity_chart(df):
-    """Crea gráfico de intensidad de entrenamiento"""
+def create_intensity_chart(view):
+    """Crea gráfico de intensidad de entrenamiento (días del RangeView con minutos de cardio)"""
     # Verificar si existen las columnas y tienen datos
-    if 'Minutos de cardio' not in df.columns or df['Minutos de cardio'].sum() == 0:
+    if 'Minutos de cardio' not in view.data.columns or not view.mask('Minutos de cardio').any():
         # Crear gráfico vacío con mensaje
-        fig = go.Figure()
-        fig.add_annotation(
-            text="No hay datos de intensidad de cardio disponibles",
-            xref="paper", yref="paper",
-            x=0.5, y=0.5, showarrow=False,
-            font=dict(size=16, color="#8892ab")
-        )
-        fig.update_layout(**CHART_CONFIG, height=300)
-        return fig
-    
-    intensity_data = df[df['Minutos de cardio'] > 0].copy()
+        return message_figure("No hay datos de intensidad de cardio disponibles", height=300)
+    
+    intensity_data = view.positive('Minutos de cardio')
     
     # Verificar si existe columna de Puntos Cardio
-    if 'Puntos Cardio' not in intensity_data.columns:
-        intensity_data['Puntos Cardio'] = 0
+    if 'Puntos Cardio' in intensity_data.columns:
+        points = intensity_data['Puntos Cardio']
+    else:
+        points = np.zeros(len(intensity_data))
     
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
+    cardio = trace(
+        'scatter',
         x=intensity_data['Fecha'],
-        y=intensity_data['Puntos Cardio'],
+        y=points,
         mode='lines+markers',
         name='Puntos Cardio',
         line=dict(color=COLORS['secondary'], width=2),
         fill='tozeroy',
         fillcolor='rgba(255, 107, 157, 0.2)'
-    ))
+    )
     
-    fig.update_layout(
-        **CHART_CONFIG,
+    return figure(
+        [cardio],
         showlegend=False,
-        xaxis=dict(gridcolor='rgba(255,255,255,0.05)'),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.05)', title='Puntos Cardio')
+        xaxis=axis(),
+        yaxis=axis('Puntos Cardio')
     )
-    
-    return fig
 
 
-def create_predictive_chart(df):
-    """Crea gráfico de análisis predictivo"""
-    recent_data = df.tail(30)
-    
-    if len(recent_data) > 1:
-        z = np.polyfit(range(len(recent_data)), recent_data['Recuento de pasos'], 1)
-        p = np.poly1d(z)
-        
-        future_days = 30
-        import pandas as pd
-        future_dates = pd.date_range(df['Fecha'].max() + timedelta(days=1), periods=future_days)
-        future_steps = [p(len(recent_data) + i) for i in range(future_days)]
-    else:
-        future_dates = []
-        future_steps = []
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
+def create_predictive_chart(view):
+    """
+    Crea gráfico de análisis predictivo
+    
+    Args:
+        view: RangeView del rango: serie real (días con registro) y proyección
+            de forecast_steps() con su banda de confianza (sin proyección solo
+            se muestra la serie)
+    """
+    df = view.recorded()
+    forecast = view.forecast()
+    traces = [trace(
+        'scatter',
         x=df['Fecha'],
         y=df['Recuento de pasos'],
         mode='lines',
         name='Datos Reales',
         line=dict(color=COLORS['primary'], width=2)
-    ))
-    
-    if len(future_dates) > 0:
-        fig.add_trace(go.Scatter(
-            x=future_dates,
-            y=future_steps,
+    )]
+    
+    if forecast is not None:
+        # Banda: límite superior invisible y el inferior rellena hasta él
+        traces.append(trace(
+            'scatter',
+            x=forecast['dates'],
+            y=forecast['upper'],
+            mode='lines',
+            line=dict(width=0),
+            showlegend=False,
+            hoverinfo='skip'
+        ))
+        traces.append(trace(
+            'scatter',
+            x=forecast['dates'],
+            y=forecast['lower'],
+            mode='lines',
+            name='Intervalo de confianza',
+            line=dict(width=0),
+            fill='tonexty',
+            fillcolor='rgba(255, 217, 61, 0.15)',
+            hoverinfo='skip'
+        ))
+        traces.append(trace(
+            'scatter',
+            x=forecast['dates'],
+            y=forecast['mean'],
             mode='lines',
             name='Proyección',
             line=dict(color=COLORS['warning'], width=2, dash='dash')
         ))
     
-    fig.update_layout(
-        **CHART_CONFIG,
+    return figure(
+        traces,
         showlegend=True,
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-        xaxis=dict(gridcolor='rgba(255,255,255,0.05)'),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.05)', title='Pasos'),
+        xaxis=axis(),
+        yaxis=axis('Pasos'),
         hovermode='x unified'
     )
-    
-    return fig
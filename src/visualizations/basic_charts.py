@@ -1,73 +1,75 @@
 """
 Funciones para crear visualizaciones básicas
 """
-import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-from config.settings import COLORS, CHART_CONFIG
+from config.settings import COLORS, SERIES_RENDER
+from src.utils.calendar_codes import month_labels, WEEKDAY_NAMES
+from src.visualizations.figure_builder import figure, trace, axis, horizontal_line
+from src.visualizations.series_traces import series_trace, overlay_traces
 
 
-def create_steps_trend_chart(df):
-    """Crea gráfico de tendencia de pasos"""
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=df['Fecha'],
-        y=df['Recuento de pasos'],
+def create_steps_trend_chart(view, max_points=SERIES_RENDER['max_points'], x_range=None, overlays=None):
+    """
+    Crea gráfico de tendencia de pasos
+    
+    La serie (días con registro de view, un RangeView) se reduce con LTTB a
+    max_points (None = todos los días) y x_range limita los puntos a la
+    ventana visible tras un zoom; el promedio es siempre el del rango
+    completo. overlays son las medias y medianas móviles de
+    rolling_overlays(), alineadas con las filas del rango.
+    """
+    df = view.data
+    recorded = view.recorded()
+    steps = series_trace(
+        recorded['Fecha'],
+        recorded['Recuento de pasos'],
+        max_points,
+        x_range,
         mode='lines',
         name='Pasos diarios',
         line=dict(color=COLORS['primary'], width=2),
         fill='tozeroy',
         fillcolor='rgba(0, 212, 255, 0.1)',
         hovertemplate='<b>%{x|%d/%m/%Y}</b><br>Pasos: %{y:,.0f}<extra></extra>'
-    ))
-    
-    avg_steps = df[df['Recuento de pasos'] > 0]['Recuento de pasos'].mean()
-    fig.add_hline(
-        y=avg_steps,
-        line_dash="dash",
-        line_color=COLORS['warning'],
-        annotation_text=f"Promedio: {int(avg_steps):,}",
-        annotation_position="right"
     )
     
-    fig.update_layout(
-        **CHART_CONFIG,
-        xaxis=dict(gridcolor='rgba(255,255,255,0.05)', title='Fecha'),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.05)', title='Pasos'),
+    # Sin días con pasos en el rango no hay promedio (NaN): sin línea, como setMeanLine
+    avg_steps = view.summary()['avg_steps']
+    shapes, annotations = [], []
+    if not pd.isna(avg_steps):
+        mean_line, mean_label = horizontal_line(avg_steps, f"Promedio: {int(avg_steps):,}", COLORS['warning'])
+        shapes, annotations = [mean_line], [mean_label]
+    
+    return figure(
+        [steps, *overlay_traces(df['Fecha'], overlays, max_points, x_range)],
+        xaxis=axis('Fecha'),
+        yaxis=axis('Pasos'),
         hovermode='x unified',
-        height=400
+        height=400,
+        shapes=shapes,
+        annotations=annotations
     )
-    
-    return fig
 
 
-def create_activity_pie_chart(df):
-    """Crea gráfico de pastel de distribución de actividad"""
-    df_active = df[df['Recuento de pasos'] > 0]
-    
-    categories = []
-    values = []
-    colors_list = []
-    
-    if len(df_active[df_active['Recuento de pasos'] >= 10000]) > 0:
-        categories.append('🏆 Excelente (≥10k)')
-        values.append(len(df_active[df_active['Recuento de pasos'] >= 10000]))
-        colors_list.append(COLORS['success'])
-    
-    if len(df_active[(df_active['Recuento de pasos'] >= 5000) & (df_active['Recuento de pasos'] < 10000)]) > 0:
-        categories.append('😊 Bueno (5k-10k)')
-        values.append(len(df_active[(df_active['Recuento de pasos'] >= 5000) & (df_active['Recuento de pasos'] < 10000)]))
-        colors_list.append(COLORS['warning'])
-    
-    if len(df_active[df_active['Recuento de pasos'] < 5000]) > 0:
-        categories.append('📉 Bajo (<5k)')
-        values.append(len(df_active[df_active['Recuento de pasos'] < 5000]))
-        colors_list.append(COLORS['secondary'])
-    
-    fig = go.Figure(data=[go.Pie(
+def create_activity_pie_chart(band_counts):
+    """
+    Crea gráfico de pastel de distribución de actividad
+    
+    Args:
+        band_counts: Días por tramo de pasos de count_step_bands() (los tramos
+            sin días no se muestran)
+    """
+    bands = [band for band in band_counts if band['days'] > 0]
+    categories = [band['label'] for band in bands]
+    values = [band['days'] for band in bands]
+    colors_list = [band['color'] for band in bands]
+    
+    pie = trace(
+        'pie',
         labels=categories,
         values=values,
         hole=0.4,
@@ -75,10 +77,10 @@ def create_activity_pie_chart(df):
         textinfo='label+percent',
         textfont=dict(size=14, color=COLORS['text']),
         hovertemplate='<b>%{label}</b><br>Días: %{value}<br>%{percent}<extra></extra>'
-    )])
+    )
     
-    fig.update_layout(
-        **CHART_CONFIG,
+    return figure(
+        [pie],
         showlegend=True,
         legend=dict(
             orientation="h",
@@ -90,55 +92,46 @@ def create_activity_pie_chart(df):
         ),
         height=400
     )
-    
-    return fig
 
 
-def create_monthly_metrics_chart(df):
-    """Crea gráfico de métricas mensuales"""
-    monthly_data = df.groupby(['Año', 'Mes']).agg({
-        'Recuento de pasos': 'sum',
-        'Distancia_km': 'sum',
-        'Calorías (kcal)': 'sum'
-    }).reset_index()
-    
-    monthly_data['Mes-Año'] = pd.to_datetime(
-        monthly_data['Año'].astype(str) + '-' + monthly_data['Mes'].astype(str) + '-01'
-    ).dt.strftime('%b %Y')
-    
-    fig = go.Figure()
+def create_monthly_metrics_chart(monthly_data):
+    """
+    Crea gráfico de métricas mensuales
+    
+    Args:
+        monthly_data: Totales por mes (aggregate_by_period(df, 'month', ...))
+    """
+    monthly_data = monthly_data.copy()
+    monthly_data['Mes-Año'] = (
+        pd.Series(month_labels(monthly_data['Mes'], abbr=True), index=monthly_data.index).astype(str)
+        + ' ' + monthly_data['Año'].astype(str)
+    )
     
-    fig.add_trace(go.Bar(
+    steps = trace(
+        'bar',
         x=monthly_data['Mes-Año'],
         y=monthly_data['Recuento de pasos'],
         name='Pasos',
-        marker_color=COLORS['primary'],
+        marker=dict(color=COLORS['primary']),
         yaxis='y',
         hovertemplate='<b>%{x}</b><br>Pasos: %{y:,.0f}<extra></extra>'
-    ))
+    )
     
-    fig.add_trace(go.Scatter(
+    distance = trace(
+        'scatter',
         x=monthly_data['Mes-Año'],
         y=monthly_data['Distancia_km'],
         name='Distancia (km)',
         line=dict(color=COLORS['success'], width=3),
         yaxis='y2',
         hovertemplate='<b>%{x}</b><br>Distancia: %{y:.1f} km<extra></extra>'
-    ))
+    )
     
-    fig.update_layout(
-        **CHART_CONFIG,
-        xaxis=dict(gridcolor='rgba(255,255,255,0.05)', title='Mes'),
-        yaxis=dict(
-            title='Pasos',
-            gridcolor='rgba(255,255,255,0.05)'
-        ),
-        yaxis2=dict(
-            title='Distancia (km)',
-            overlaying='y',
-            side='right',
-            gridcolor='rgba(255,255,255,0.05)'
-        ),
+    return figure(
+        [steps, distance],
+        xaxis=axis('Mes'),
+        yaxis=axis('Pasos'),
+        yaxis2=axis('Distancia (km)', overlaying='y', side='right'),
         showlegend=True,
         legend=dict(
             orientation="h",
@@ -150,38 +143,36 @@ def create_monthly_metrics_chart(df):
         hovermode='x unified',
         height=400
     )
-    
-    return fig
 
 
-def create_weekday_chart(df):
-    """Crea gráfico de actividad por día de la semana"""
-    dias_orden = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    dias_es = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
-    
-    weekday_data = df[df['Recuento de pasos'] > 0].groupby('DíaSemana').agg({
-        'Recuento de pasos': 'mean'
-    }).reindex(dias_orden).reset_index()
-    
-    weekday_data['DíaSemana_ES'] = dias_es
-    
-    colors_weekday = [COLORS['success'] if day in ['Saturday', 'Sunday'] 
-                     else COLORS['primary'] for day in weekday_data['DíaSemana']]
-    
-    fig = go.Figure(data=[go.Bar(
-        x=weekday_data['DíaSemana_ES'],
-        y=weekday_data['Recuento de pasos'],
-        marker_color=colors_weekday,
-        text=weekday_data['Recuento de pasos'].apply(lambda x: f'{int(x):,}'),
+def create_weekday_chart(weekday_data):
+    """
+    Crea gráfico de actividad por día de la semana
+    
+    Args:
+        weekday_data: Totales por día de la semana (aggregate_by_period(df, 'weekday', ...))
+    """
+    # Promedio de pasos de los días con actividad (lunes=0 ... domingo=6)
+    weekday_data = weekday_data.sort_values('DíaSemanaNum')
+    active_days = weekday_data['dias_activos'].to_numpy()
+    avg_steps = pd.Series(weekday_data['Recuento de pasos'].to_numpy() / np.where(active_days > 0, active_days, np.nan))
+    
+    colors_weekday = [COLORS['success'] if day >= 5 
+                     else COLORS['primary'] for day in weekday_data['DíaSemanaNum']]
+    
+    bars = trace(
+        'bar',
+        x=WEEKDAY_NAMES,
+        y=avg_steps,
+        marker=dict(color=colors_weekday),
+        text=avg_steps.apply(lambda x: f'{int(x):,}' if pd.notna(x) else ''),
         textposition='outside',
         hovertemplate='<b>%{x}</b><br>Promedio: %{y:,.0f} pasos<extra></extra>'
-    )])
+    )
     
-    fig.update_layout(
-        **CHART_CONFIG,
-        xaxis=dict(gridcolor='rgba(255,255,255,0.05)', title='Día de la Semana'),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.05)', title='Promedio de Pasos'),
+    return figure(
+        [bars],
+        xaxis=axis('Día de la Semana'),
+        yaxis=axis('Promedio de Pasos'),
         height=400
     )
-    
-    return fig
@@ -0,0 +1,170 @@
+"""
+Figuras como dict y listas, sin pasar por los objetos de plotly
+
+go.Figure valida cada propiedad de cada traza al construirla y otra vez al
+serializarla, y eso es casi todo el tiempo de CPU de un gráfico. Las funciones
+de basic_charts.py y advanced_charts.py construyen directamente el JSON de la
+figura (el mismo que produciría plotly) a partir de un layout base que se
+valida una sola vez al importar: CHART_CONFIG más la plantilla por defecto de
+plotly. Dash serializa el dict tal cual.
+
+Con FIGURE_CHECK (FITNESS_FIGURE_CHECK=1) cada figura se compara con la que
+genera plotly para las mismas trazas y layout, y cualquier diferencia
+(propiedad inválida, valor que plotly normalizaría...) lanza ValueError.
+"""
+import base64
+import json
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.io.json import to_json_plotly
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from config.settings import CHART_CONFIG, FIGURE_CHECK
+
+
+# Color de la rejilla de los ejes de todos los gráficos
+GRID_COLOR = 'rgba(255,255,255,0.05)'
+
+# Layout común: CHART_CONFIG y la plantilla que plotly añade a cada figura
+BASE_LAYOUT = go.Layout(
+    template=pio.templates[pio.templates.default], **CHART_CONFIG
+).to_plotly_json()
+
+
+def figure(data, **layout):
+    """
+    Crea una figura (dict) con el layout base
+
+    Args:
+        data: Trazas (dicts de trace())
+        **layout: Propiedades del layout que se añaden o sustituyen a las del
+            layout base (con la estructura de plotly: title={'text': ...})
+
+    Returns:
+        dict: {'data': [...], 'layout': {...}}
+    """
+    fig = {'data': list(data), 'layout': {**BASE_LAYOUT, **layout}}
+    if FIGURE_CHECK:
+        check_figure(fig)
+    return fig
+
+
+def trace(trace_type, **props):
+    """
+    Crea una traza (dict)
+
+    Las Series, índices y arrays se pasan a arrays de numpy; las fechas a
+    cadenas 'AAAA-MM-DD' (los datos son diarios). Las propiedades a None no
+    se incluyen (como en plotly).
+
+    Args:
+        trace_type: Tipo de traza de plotly ('scatter', 'bar', 'pie'...)
+        **props: Propiedades de la traza con la estructura de plotly
+            (marker={'color': ...} en lugar de marker_color)
+    """
+    props = {key: _plain_array(value) for key, value in props.items() if value is not None}
+    return {'type': trace_type, **props}
+
+
+def axis(title=None, **props):
+    """Eje con la rejilla común (title como texto)"""
+    props = {'gridcolor': GRID_COLOR, **props}
+    if title is not None:
+        props['title'] = {'text': title}
+    return props
+
+
+def horizontal_line(y, text, color, dash='dash'):
+    """
+    Línea horizontal a lo ancho del gráfico con su etiqueta a la derecha
+
+    Equivale a fig.add_hline(y, line_dash=dash, line_color=color,
+    annotation_text=text, annotation_position='right').
+
+    Returns:
+        tuple: (shape, annotation) para layout['shapes'] y layout['annotations']
+    """
+    shape = {
+        'type': 'line', 'xref': 'x domain', 'x0': 0, 'x1': 1, 'yref': 'y', 'y0': y, 'y1': y,
+        'line': {'color': color, 'dash': dash}
+    }
+    annotation = {
+        'text': text, 'showarrow': False, 'xref': 'x domain', 'x': 1, 'xanchor': 'left',
+        'yref': 'y', 'y': y, 'yanchor': 'middle'
+    }
+    return shape, annotation
+
+
+def message_figure(text, **layout):
+    """Figura vacía con un mensaje centrado (p. ej. sin datos en el rango)"""
+    annotation = {
+        'text': text, 'xref': 'paper', 'yref': 'paper', 'x': 0.5, 'y': 0.5,
+        'showarrow': False, 'font': {'size': 16, 'color': '#8892ab'}
+    }
+    return figure([], annotations=[annotation], **layout)
+
+
+def check_figure(fig):
+    """
+    Compara una figura con la que genera plotly para las mismas trazas y layout
+
+    Raises:
+        ValueError: Si plotly rechaza alguna propiedad o su JSON es distinto
+    """
+    expected = _normalize(json.loads(pio.to_json(go.Figure(fig), validate=False)))
+    actual = _normalize(json.loads(to_json_plotly(fig)))
+    difference = _first_difference(expected, actual, 'figure')
+    if difference:
+        raise ValueError(f"La figura no coincide con la de plotly en {difference}")
+
+
+def _plain_array(value):
+    """Series/índices a arrays de numpy y fechas a 'AAAA-MM-DD'"""
+    if isinstance(value, (pd.Series, pd.Index)):
+        value = value.to_numpy()
+    if isinstance(value, np.ndarray) and np.issubdtype(value.dtype, np.datetime64):
+        return np.datetime_as_string(value, unit='D')
+    return value
+
+
+def _normalize(value):
+    """Arrays binarios de plotly a listas y NaN a None (para comparar)"""
+    if isinstance(value, dict):
+        if 'bdata' in value and 'dtype' in value:
+            array = np.frombuffer(base64.b64decode(value['bdata']), dtype=np.dtype(value['dtype']))
+            if array.dtype == np.float32:
+                # Como los serializa el codificador JSON (representación más corta en float32)
+                array = np.array([float(str(item)) for item in array])
+            if 'shape' in value:
+                array = array.reshape([int(size) for size in str(value['shape']).split(',')])
+            return _normalize(array.tolist())
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def _first_difference(expected, actual, path):
+    """Ruta de la primera diferencia entre dos JSON normalizados (None si son iguales)"""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        for key in sorted(set(expected) | set(actual)):
+            if key not in expected or key not in actual:
+                return f'{path}.{key}'
+            difference = _first_difference(expected[key], actual[key], f'{path}.{key}')
+            if difference:
+                return difference
+        return None
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return f'{path} ({len(expected)} != {len(actual)} elementos)'
+        for position, (left, right) in enumerate(zip(expected, actual)):
+            difference = _first_difference(left, right, f'{path}[{position}]')
+            if difference:
+                return difference
+        return None
+    return None if expected == actual else f'{path} ({expected!r} != {actual!r})'
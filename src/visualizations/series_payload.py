@@ -0,0 +1,111 @@
+"""
+Series temporales diarias para recortar por rango en el navegador
+
+Las gráficas de pasos, peso, velocidad y frecuencia cardíaca solo muestran la
+serie diaria del rango elegido. En lugar de reconstruirlas en el servidor en
+cada cambio de fechas, se construyen una vez con todos los datos (con las
+mismas funciones de siempre) y se envían al navegador en un dcc.Store; el
+callback de cliente de assets/series_slice.js recorta las trazas al rango y
+las reduce con LTTB al ancho del gráfico.
+"""
+import numpy as np
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from config.settings import SERIES_RENDER
+from src.utils.range_view import RangeView, get_range_view
+from src.visualizations.basic_charts import create_steps_trend_chart
+from src.visualizations.advanced_charts import (
+    create_weight_trend_chart, create_speed_analysis_chart, create_heart_rate_chart
+)
+
+
+# ID del Store con las series completas (en el layout raíz, se envía una vez)
+SERIES_STORE = 'series-store'
+
+# Paneles de series por ID del componente. Lo que depende del rango se recalcula
+# en el navegador:
+#   mean_line: línea y anotación del promedio de los días con pasos
+#   required: traza sin la que se muestra la figura vacía (sin datos en el rango)
+#   optional: trazas que se quitan si suman 0 en el rango
+SERIES_PANELS = {
+    'steps-trend': {'builder': create_steps_trend_chart, 'mean_line': True},
+    'weight-trend': {'builder': create_weight_trend_chart, 'required': 'Peso'},
+    'speed-analysis': {'builder': create_speed_analysis_chart},
+    'heart-rate-analysis': {
+        'builder': create_heart_rate_chart,
+        'required': 'FC Media',
+        'optional': ['FC Máxima', 'FC Mínima']
+    }
+}
+
+
+def build_series_payload(df):
+    """
+    Construye las figuras completas de los paneles de series para el Store
+
+    Args:
+        df: DataFrame con todos los datos
+
+    Returns:
+        dict: ID del panel -> {'figure', 'empty', 'required', 'optional', 'mean_line',
+        'max_points', 'webgl_threshold'}, con todos los días de cada traza (fechas
+        'AAAA-MM-DD' y valores como listas)
+    """
+    view = get_range_view(df)
+    no_rows = df.iloc[:0]
+    payload = {}
+    for panel_id, spec in SERIES_PANELS.items():
+        figure = _plain_figure(build_series_figure(view, panel_id, max_points=None))
+        # Figura que muestra el propio gráfico cuando el rango no tiene datos
+        empty = _plain_figure(spec['builder'](RangeView(no_rows), max_points=None)) if spec.get('required') else None
+        payload[panel_id] = {
+            'figure': figure,
+            'empty': empty,
+            'required': spec.get('required'),
+            'optional': spec.get('optional', []),
+            'mean_line': spec.get('mean_line', False),
+            'max_points': SERIES_RENDER['max_points'],
+            'webgl_threshold': SERIES_RENDER['webgl_threshold']
+        }
+    return payload
+
+
+def build_series_figure(view, panel_id, **kwargs):
+    """
+    Construye un panel de series en un rango con sus estadísticas móviles
+
+    Args:
+        view: RangeView del rango (get_range_view())
+        panel_id: ID del panel (clave de SERIES_PANELS)
+        **kwargs: max_points / x_range del constructor
+
+    Returns:
+        dict: Figura del constructor del panel
+    """
+    return SERIES_PANELS[panel_id]['builder'](view, overlays=view.overlays(panel_id), **kwargs)
+
+
+def _plain_figure(fig):
+    """Pasa x/y de las trazas a listas JSON que el navegador pueda recortar"""
+    for trace in fig['data']:
+        trace['x'] = trace['x'].tolist()
+        trace['y'] = _plain_values(trace['y'])
+    return fig
+
+
+def _plain_values(values):
+    """
+    Lista de valores (enteros si no hay decimales, None en lugar de NaN)
+
+    Las columnas float32 (COMPACT_SCHEMA) se pasan a float64 por su
+    representación más corta, para enviar 3.36 y no 3.359999895095825.
+    """
+    values = np.asarray(values)
+    if values.dtype == np.float32:
+        values = values.astype(str)
+    values = values.astype(np.float64)
+    missing = np.isnan(values)
+    if not missing.any() and np.array_equal(values, np.round(values)):
+        return values.astype(np.int64).tolist()
+    return [None if empty else value for empty, value in zip(missing.tolist(), values.tolist())]
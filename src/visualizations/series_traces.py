@@ -0,0 +1,128 @@
+"""
+Trazas de series diarias con reducción LTTB y WebGL
+
+Con años de datos diarios cada traza tiene miles de puntos: se reducen con
+LTTB al número de puntos que el gráfico puede mostrar (≈ su ancho en px) y,
+si aun así la traza es larga, se dibuja con Scattergl en lugar de SVG.
+"""
+import numpy as np
+import pandas as pd
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from config.settings import SERIES_RENDER
+from src.utils.downsample import lttb_indices, window_bounds
+from src.visualizations.figure_builder import trace
+
+
+# Nombre en la leyenda de cada estadístico móvil ('mean' y claves de QUANTILES en rolling.py)
+OVERLAY_LABELS = {
+    'mean': 'Media',
+    'median': 'Mediana',
+    'p25': 'Percentil 25',
+    'p75': 'Percentil 75'
+}
+
+# Colores de las estadísticas móviles, en el orden de ROLLING_OVERLAYS
+OVERLAY_COLORS = ['#ffffff', '#c084fc', '#fb923c', '#94a3b8']
+
+
+def series_trace(dates, values, max_points=None, x_range=None, **props):
+    """
+    Crea la traza de una serie diaria
+
+    Args:
+        dates: Fechas de los puntos (en orden)
+        values: Valores de los puntos
+        max_points: Puntos a conservar con LTTB (None = todos)
+        x_range: (primer día, último día) visibles, en días desde 1970-01-01
+        **props: Propiedades de la traza (mode, name, line...)
+
+    Returns:
+        dict: Traza 'scatter' o 'scattergl' (por encima de SERIES_RENDER['webgl_threshold'] puntos)
+    """
+    dates = np.asarray(dates, dtype='datetime64[ns]')
+    values = np.asarray(values)
+    days = dates.astype('datetime64[D]').astype(np.int64)
+    if x_range is not None:
+        lo, hi = window_bounds(days, *x_range)
+        dates, values, days = dates[lo:hi], values[lo:hi], days[lo:hi]
+
+    keep = lttb_indices(days, values, max_points)
+    trace_type = 'scattergl' if len(keep) > SERIES_RENDER['webgl_threshold'] else 'scatter'
+    return trace(trace_type, x=dates[keep], y=values[keep], **props)
+
+
+def overlay_traces(dates, overlays, max_points=None, x_range=None):
+    """
+    Trazas de las estadísticas móviles de un panel (rolling_overlays())
+
+    La primera se muestra al cargar y el resto quedan en la leyenda. Los
+    días sin ningún dato en la ventana no se dibujan.
+
+    Args:
+        dates: Fechas de las filas (las mismas que los valores de cada estadístico)
+        overlays: Lista de rolling_overlays() (None = ninguna)
+        max_points: Puntos a conservar con LTTB (None = todos)
+        x_range: (primer día, último día) visibles tras un zoom
+
+    Returns:
+        list: Trazas (dict)
+    """
+    dates = np.asarray(dates)
+    traces = []
+    for position, overlay in enumerate(overlays or []):
+        values = overlay['values']
+        known = ~np.isnan(values)
+        traces.append(series_trace(
+            dates[known],
+            values[known].round(overlay['decimals']),
+            max_points,
+            x_range,
+            mode='lines',
+            name=f"{OVERLAY_LABELS[overlay['stat']]} {overlay['window']} días",
+            line=dict(color=OVERLAY_COLORS[position % len(OVERLAY_COLORS)], width=2),
+            visible=True if position == 0 else 'legendonly'
+        ))
+    return traces
+
+
+def zoom_ranges(relayout):
+    """
+    Rangos de ejes pedidos por un zoom del usuario (relayoutData de dcc.Graph)
+
+    Args:
+        relayout: relayoutData del gráfico
+
+    Returns:
+        dict o None: eje -> [inicio, fin] (vacío si vuelve al rango completo), o
+        None si el evento no cambia el eje x (p. ej. 'autosize')
+    """
+    relayout = relayout or {}
+    if relayout.get('xaxis.autorange'):
+        return {}
+
+    ranges = {}
+    for key, value in relayout.items():
+        axis, _, prop = key.partition('.')
+        if prop == 'range':
+            ranges[axis] = list(value)
+        elif prop in ('range[0]', 'range[1]'):
+            ranges.setdefault(axis, [None, None])[int(prop[-2])] = value
+    if 'xaxis' not in ranges or None in ranges['xaxis']:
+        return None
+    return ranges
+
+
+def day_window(x_range):
+    """
+    Días (desde 1970-01-01) que cubre un rango del eje x
+
+    Args:
+        x_range: [inicio, fin] como fechas (p. ej. '2025-03-01 12:00:00.5')
+
+    Returns:
+        tuple: (primer día, último día)
+    """
+    first, last = (pd.Timestamp(value).floor('D') for value in x_range)
+    return tuple(int(np.datetime64(day.date(), 'D').astype(np.int64)) for day in (first, last))
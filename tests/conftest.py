@@ -0,0 +1,59 @@
+"""
+Datos de prueba compartidos
+
+tests/fixtures/daily_activity.csv es un extracto de una exportación de Google
+Fit (2021-11-20 a 2022-03-10): cruza un cambio de año, tiene días sin fila,
+días con 0 pasos y métricas vacías, como los datos reales.
+"""
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.utils.data_loader import load_fitness_data
+
+
+FIXTURE_CSV = os.path.join(os.path.dirname(__file__), 'fixtures', 'daily_activity.csv')
+
+# Rangos de las comparaciones: todo, dentro de un año, cruzando el cambio de año,
+# un día, un hueco del CSV, antes y después de los datos, invertido y con horas
+DATE_RANGES = [
+    (None, None),
+    ('2022-01-10', '2022-02-10'),
+    ('2021-12-15', '2022-01-20'),
+    ('2022-03-05', '2022-03-05'),
+    ('2021-11-21', '2021-11-21'),
+    ('2020-01-01', '2021-11-25'),
+    ('2022-03-01', '2030-01-01'),
+    ('2030-01-01', '2030-02-01'),
+    ('2022-02-01', '2022-01-01'),
+    ('2021-12-01T12:00:00', '2022-01-31T08:30:00')
+]
+
+
+@pytest.fixture(scope='session')
+def fitness_df():
+    """DataFrame del CSV de prueba tal como lo carga la app (sin caché en disco)"""
+    return load_fitness_data(FIXTURE_CSV, use_cache=False)
+
+
+@pytest.fixture(scope='session')
+def shuffled_df(fitness_df):
+    """Las mismas filas desordenadas: sin DayStore, las funciones usan el cálculo directo en pandas"""
+    return fitness_df.sample(frac=1, random_state=0)
+
+
+@pytest.fixture(params=DATE_RANGES, ids=str)
+def date_range(request):
+    """(start_date, end_date) de DATE_RANGES"""
+    return request.param
+
+
+def rows_between(df, start_date, end_date):
+    """Filas del rango con máscaras sobre 'Fecha' (ambos extremos incluidos), ordenadas por fecha"""
+    mask = df['Fecha'].notna()
+    if start_date is not None:
+        mask &= df['Fecha'] >= start_date
+    if end_date is not None:
+        mask &= df['Fecha'] <= end_date
+    return df[mask].sort_values('Fecha')
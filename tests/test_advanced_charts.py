@@ -0,0 +1,17 @@
+"""
+Pruebas de los gráficos avanzados
+"""
+import pandas as pd
+from src.utils.range_view import get_range_view
+from src.visualizations.advanced_charts import create_predictive_chart
+from tests.conftest import FIXTURE_CSV, rows_between
+
+
+def test_predictive_real_data_only_draws_recorded_days(fitness_df, date_range):
+    """La línea 'Datos Reales' no baja a 0 en los días sin fila en el CSV"""
+    csv = pd.read_csv(FIXTURE_CSV, parse_dates=['Date']).rename(columns={'Date': 'Fecha'})
+    rows = rows_between(csv, *date_range)
+    real = create_predictive_chart(get_range_view(fitness_df, *date_range))['data'][0]
+    assert real['name'] == 'Datos Reales'
+    assert list(real['x']) == list(rows['Fecha'].dt.strftime('%Y-%m-%d'))
+    assert list(real['y']) == list(rows['Step count'])
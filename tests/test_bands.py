@@ -0,0 +1,43 @@
+"""
+Pruebas de los conteos por tramo frente a máscaras sobre las filas
+"""
+import numpy as np
+import pytest
+from config.settings import GOALS, STEP_BANDS
+from src.utils.bands import BandIndex
+from src.utils.data_loader import count_goal_days, count_step_bands
+from tests.conftest import rows_between
+
+
+def test_band_index_matches_masks():
+    rng = np.random.default_rng(16)
+    values = rng.integers(-2, 30, 200).astype(np.float64)
+    values[rng.random(200) < 0.1] = np.nan
+    index = BandIndex(values, [5, 10, 20])
+    for _ in range(50):
+        start, end = sorted(rng.integers(0, 201, 2))
+        block = values[start:end]
+        assert index.at_least(0, start, end) == np.count_nonzero(block > 0)
+        for edge in [5, 10, 20]:
+            assert index.at_least(edge, start, end) == np.count_nonzero(block >= edge)
+    with pytest.raises(ValueError):
+        index.at_least(7, 0, 200)
+
+
+def test_step_bands_and_goal_days_match_masks(fitness_df, shuffled_df, date_range):
+    rows = rows_between(fitness_df, *date_range)
+    steps = rows['Recuento de pasos'].fillna(0)
+    limits = sorted([band['min'] for band in STEP_BANDS] + [np.inf])
+    expected_bands = [
+        int(((steps > 0) & (steps >= band['min']) & (steps < limits[limits.index(band['min']) + 1])).sum())
+        for band in STEP_BANDS
+    ]
+    expected_goals = {
+        'active_days': int((steps > 0).sum()),
+        'steps': int((steps >= GOALS['daily_steps']).sum()),
+        'distance': int((rows['Distancia_km'] >= GOALS['daily_distance']).sum()),
+        'calories': int((rows['Calorías (kcal)'] >= GOALS['daily_calories']).sum())
+    }
+    for df in [fitness_df, shuffled_df]:
+        assert [band['days'] for band in count_step_bands(df, *date_range)] == expected_bands
+        assert count_goal_days(df, *date_range) == expected_goals
@@ -0,0 +1,39 @@
+"""
+Pruebas de los gráficos básicos
+"""
+import pandas as pd
+from src.utils.range_view import get_range_view
+from src.visualizations.basic_charts import create_steps_trend_chart
+from tests.conftest import FIXTURE_CSV, rows_between
+
+
+def test_steps_trend_without_steps_has_no_mean_line(fitness_df):
+    """Un rango sin días con pasos no tiene promedio: la figura sale sin línea ni etiqueta"""
+    # 2022-03-04 tiene fila pero 0 pasos; 2021-11-21 es un hueco del CSV rellenado con 0
+    for start, end in [('2022-03-04', '2022-03-04'), ('2021-11-21', '2021-11-21'),
+                       ('2030-01-01', '2030-02-01'), ('2022-03-06', '2022-03-01')]:
+        view = get_range_view(fitness_df, start, end)
+        assert (view.data['Recuento de pasos'].fillna(0) == 0).all()
+        fig = create_steps_trend_chart(view)
+        assert fig['layout']['shapes'] == []
+        assert fig['layout']['annotations'] == []
+
+
+def test_steps_trend_mean_line_is_mean_of_active_days(fitness_df):
+    """El promedio es el de los días con pasos del rango"""
+    view = get_range_view(fitness_df, '2022-01-01', '2022-01-31')
+    steps = view.data['Recuento de pasos']
+    expected = steps[steps > 0].mean()
+    fig = create_steps_trend_chart(view)
+    assert fig['layout']['shapes'][0]['y0'] == expected
+    assert fig['layout']['annotations'][0]['text'] == f"Promedio: {int(expected):,}"
+
+
+def test_steps_trend_only_draws_recorded_days(fitness_df, date_range):
+    """Los días sin fila en el CSV (rellenados con 0 al cargar) no son puntos de la serie"""
+    csv = pd.read_csv(FIXTURE_CSV, parse_dates=['Date']).rename(columns={'Date': 'Fecha'})
+    rows = rows_between(csv, *date_range)
+    fig = create_steps_trend_chart(get_range_view(fitness_df, *date_range), max_points=None)
+    steps = fig['data'][0]
+    assert list(steps['x']) == list(rows['Fecha'].dt.strftime('%Y-%m-%d'))
+    assert list(steps['y']) == list(rows['Step count'])
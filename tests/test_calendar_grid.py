@@ -0,0 +1,57 @@
+"""
+Pruebas de la rejilla del heatmap frente a agrupar por semana ISO
+"""
+import numpy as np
+import pandas as pd
+from src.utils.calendar_grid import CalendarGrid
+from src.utils.data_loader import calendar_grid
+from tests.conftest import rows_between
+
+
+def _brute_force(dates, steps, first, last):
+    """Rejilla con groupby (año ISO, semana ISO, día de la semana) sobre las semanas de first a last"""
+    frame = pd.DataFrame({'Fecha': pd.to_datetime(dates), 'steps': steps})
+    frame = frame[frame['steps'] > 0]
+    iso = frame['Fecha'].dt.isocalendar()
+    sums = frame.groupby([iso['year'], iso['week'], frame['Fecha'].dt.dayofweek])['steps'].sum()
+
+    mondays = pd.date_range(first - pd.Timedelta(days=first.dayofweek), last, freq='7D')
+    weeks = mondays.isocalendar()
+    index = pd.MultiIndex.from_arrays(
+        [weeks['year'].astype(np.int64), weeks['week'].astype(np.int64)], names=['AñoISO', 'SemanaISO']
+    )
+    grid = pd.DataFrame(0.0, index=index, columns=range(7))
+    for (year, week, weekday), value in sums.items():
+        grid.loc[(year, week), weekday] = value
+    return grid
+
+
+def test_grid_matches_groupby_with_repeated_days():
+    rng = np.random.default_rng(15)
+    days = rng.integers(18900, 19300, 300)
+    steps = rng.integers(0, 5, 300).astype(np.float64)
+    dates = days.astype('datetime64[D]')
+    grid = CalendarGrid(days, steps)
+    for first, last in [(None, None), (18990, 19100), (19000, 19000), (18000, 18950), (19100, 19000)]:
+        got = grid.slice(first, last)
+        first = days.min() if first is None else max(first, days.min())
+        last = days.max() if last is None else min(last, days.max())
+        if last < first:
+            assert got.empty
+            continue
+        inside = (days >= first) & (days <= last)
+        bounds = np.array([first, last]).astype('datetime64[D]')
+        expected = _brute_force(dates[inside], steps[inside], pd.Timestamp(bounds[0]), pd.Timestamp(bounds[1]))
+        pd.testing.assert_frame_equal(got.astype(np.float64), expected)
+
+
+def test_calendar_grid_matches_groupby(fitness_df, shuffled_df, date_range):
+    rows = rows_between(fitness_df, *date_range)
+    for df in [fitness_df, shuffled_df]:
+        got = calendar_grid(df, *date_range)
+        if rows.empty:
+            assert got.empty
+            continue
+        expected = _brute_force(rows['Fecha'], rows['Recuento de pasos'].fillna(0), rows['Fecha'].iloc[0],
+                                rows['Fecha'].iloc[-1])
+        pd.testing.assert_frame_equal(got.astype(np.float64), expected)
@@ -0,0 +1,36 @@
+"""
+Pruebas del resumen de conclusiones frente a sumas directas en pandas
+"""
+import numpy as np
+import pytest
+from config.settings import STEP_BANDS
+from src.utils.conclusions_summary import summarize_conclusions
+from src.utils.data_loader import streak_stats
+from tests.conftest import rows_between
+
+
+def test_summary_matches_pandas(fitness_df, shuffled_df, date_range):
+    rows = rows_between(fitness_df, *date_range)
+    steps = rows['Recuento de pasos'].fillna(0)
+    active = steps[steps > 0]
+    total_days = max((rows['Fecha'].iloc[-1] - rows['Fecha'].iloc[0]).days + 1, 1) if len(rows) else 1
+    # Cada día activo cuenta en el primer tramo (de mayor a menor) cuyo mínimo alcanza
+    bands = sorted(STEP_BANDS, key=lambda band: band['min'], reverse=True)
+    band_days = {band['label']: 0 for band in STEP_BANDS}
+    for value in active:
+        band_days[next(band['label'] for band in bands if value >= band['min'])] += 1
+
+    for df in [fitness_df, shuffled_df]:
+        summary = summarize_conclusions(df, *date_range)
+        assert summary.total_steps == int(steps.sum())
+        assert summary.total_distance == pytest.approx(float(rows['Distancia_km'].sum()), rel=1e-6)
+        assert summary.total_calories == int(rows['Calorías (kcal)'].sum())
+        assert summary.active_hours == int(rows['Recuento de Minutos Activos'].sum() / 60)
+        assert summary.active_days == len(active)
+        assert summary.total_days == total_days
+        assert summary.avg_steps == pytest.approx(active.mean() if len(active) else 0.0)
+        assert summary.consistency == pytest.approx(len(active) / total_days * 100)
+        assert summary.years == pytest.approx(total_days / 365.25)
+        assert {band['label']: band['days'] for band in summary.step_bands} == band_days
+        assert summary.streaks == streak_stats(fitness_df, *date_range)
+        assert all(isinstance(value, (int, float, list, dict)) for value in summary)
@@ -0,0 +1,63 @@
+"""
+Pruebas del DayStore (rangos y sumas prefijas) frente a máscaras de pandas
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.data_loader import calculate_summary_stats, filter_data_by_date, load_fitness_data
+from src.utils.formatters import format_distance, format_summary_cards
+from src.utils.day_store import get_day_store
+from tests.conftest import rows_between
+
+
+def test_filter_matches_masks(fitness_df, date_range):
+    pd.testing.assert_frame_equal(filter_data_by_date(fitness_df, *date_range), rows_between(fitness_df, *date_range))
+
+
+def test_summary_stats_match_pandas(fitness_df, shuffled_df, date_range):
+    rows = rows_between(fitness_df, *date_range)
+    steps = rows['Recuento de pasos']
+    for df in [fitness_df, shuffled_df]:
+        stats = calculate_summary_stats(df, *date_range)
+        assert stats['total_steps'] == steps.sum()
+        assert stats['total_distance'] == pytest.approx(rows['Distancia_km'].sum(), rel=1e-6)
+        assert stats['total_calories'] == pytest.approx(rows['Calorías (kcal)'].sum(), rel=1e-6)
+        assert stats['total_active_minutes'] == rows['Recuento de Minutos Activos'].sum()
+        assert stats['active_days'] == int((steps > 0).sum())
+        if (steps > 0).any():
+            assert stats['avg_steps'] == pytest.approx(steps[steps > 0].mean())
+        else:
+            assert np.isnan(stats['avg_steps'])
+        assert pd.isna(stats['first_date']) if rows.empty else stats['first_date'] == rows['Fecha'].iloc[0]
+        assert pd.isna(stats['last_date']) if rows.empty else stats['last_date'] == rows['Fecha'].iloc[-1]
+
+
+def test_only_loaded_frames_have_a_store(fitness_df, date_range):
+    """Recortes y copias del DataFrame cargado no tienen DayStore y dan los mismos totales"""
+    assert get_day_store(fitness_df) is not None
+    for df in [fitness_df.iloc[10:60], fitness_df.copy()]:
+        assert get_day_store(df) is None
+        rows = rows_between(df, *date_range)
+        stats = calculate_summary_stats(df, *date_range)
+        assert stats['total_steps'] == rows['Recuento de pasos'].sum()
+        assert stats['active_days'] == int((rows['Recuento de pasos'] > 0).sum())
+
+
+def test_distance_card_uses_exact_total(tmp_path):
+    # 2176 días sintéticos: la resta de sumas prefijas float64 daba 1634.9499999999998
+    days = pd.date_range('2020-01-11', periods=2176)
+    meters = (np.arange(len(days)) * 1007) % 9001.0
+    path = tmp_path / 'daily_activity.csv'
+    pd.DataFrame({
+        'Date': days.strftime('%Y-%m-%d'),
+        'Move Minutes count': meters // 100,
+        'Calories (kcal)': meters / 4,
+        'Distance (m)': meters,
+        'Step count': meters * 1.3
+    }).to_csv(path, index=False)
+    df = load_fitness_data(str(path), use_cache=False)
+    rows = rows_between(df, '2025-01-01', '2025-12-31')
+    cents = int(np.rint(rows['Distancia_km'].to_numpy() * 100).sum())
+    stats = calculate_summary_stats(df, '2025-01-01', '2025-12-31')
+    assert format_summary_cards(stats)[2] == format_distance(cents / 100) == '1,635.0 km'
+    assert stats['total_distance'] == cents / 100
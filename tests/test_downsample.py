@@ -0,0 +1,52 @@
+"""
+Pruebas de LTTB frente a la versión directa del algoritmo
+"""
+import numpy as np
+from src.utils.downsample import lttb_indices, window_bounds
+
+
+def _brute_force(x, y, max_points):
+    """LTTB tal como se describe: medias del cubo siguiente con np.mean, áreas una a una"""
+    size = len(x)
+    every = (size - 2) / (max_points - 2)
+    indices = [0]
+    for bucket in range(max_points - 2):
+        start, end = int(bucket * every) + 1, int((bucket + 1) * every) + 1
+        following = slice(end, min(int((bucket + 2) * every) + 1, size))
+        avg_x, avg_y = np.mean(x[following]), np.mean(np.nan_to_num(y[following]))
+        ax, ay = x[indices[-1]], np.nan_to_num(y[indices[-1]])
+        areas = [
+            -np.inf if np.isnan(y[j]) else abs((ax - avg_x) * (y[j] - ay) - (ax - x[j]) * (avg_y - ay))
+            for j in range(start, end)
+        ]
+        indices.append(start + int(np.argmax(areas)))
+    indices.append(size - 1)
+    return indices
+
+
+def test_lttb_matches_brute_force():
+    rng = np.random.default_rng(14)
+    for _ in range(100):
+        size = int(rng.integers(3, 400))
+        x = np.cumsum(rng.integers(1, 3, size)).astype(np.float64)
+        y = rng.integers(0, 1000, size).astype(np.float64)
+        y[rng.random(size) < 0.05] = np.nan
+        max_points = int(rng.integers(3, size + 1))
+        assert lttb_indices(x, y, max_points).tolist() == _brute_force(x, y, max_points)
+
+
+def test_lttb_keeps_every_point_below_limit():
+    x = np.arange(10.0)
+    for max_points in [None, 2, 10, 50]:
+        assert lttb_indices(x, x, max_points).tolist() == list(range(10))
+
+
+def test_window_bounds_adds_one_point_each_side():
+    """La ventana llega hasta el último punto anterior y el primero posterior"""
+    days = np.array([1, 2, 4, 7, 8, 12])
+    for first in range(0, 14):
+        for last in range(first, 14):
+            before = np.nonzero(days < first)[0]
+            after = np.nonzero(days > last)[0]
+            expected = (before[-1] if len(before) else 0, after[0] + 1 if len(after) else len(days))
+            assert window_bounds(days, first, last) == expected
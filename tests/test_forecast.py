@@ -0,0 +1,75 @@
+"""
+Pruebas de la proyección de pasos frente a una regresión directa
+"""
+import numpy as np
+from config.settings import FORECAST
+from src.utils.forecast import TrendSeasonIndex, N_COEFFICIENTS
+from src.utils.data_loader import forecast_steps
+from tests.conftest import rows_between
+
+
+def _brute_force(days, values, window, horizon, z):
+    """Mínimos cuadrados con np.linalg.lstsq sobre los días con pasos de la ventana (pinv si falta un día de la semana)"""
+    last_day = days[-1]
+    keep = (days > last_day - window) & (values > 0)
+    if keep.sum() < N_COEFFICIENTS + 2:
+        return None
+
+    def design(d):
+        return np.column_stack([np.ones(len(d)), d - last_day] + [((d + 3) % 7 == w) * 1.0 for w in range(1, 7)])
+
+    x, y = design(days[keep]), values[keep]
+    coefficients, *_ = np.linalg.lstsq(x, y, rcond=None)
+    sigma = np.sqrt(np.sum((y - x @ coefficients) ** 2) / (len(y) - N_COEFFICIENTS))
+    future = design(last_day + np.arange(1, horizon + 1))
+    mean = future @ coefficients
+    spread = z * sigma * np.sqrt(1 + np.einsum('ij,jk,ik->i', future, np.linalg.pinv(x.T @ x), future))
+    return {
+        'mean': np.maximum(mean, 0),
+        'lower': np.maximum(mean - spread, 0),
+        'upper': np.maximum(mean + spread, 0)
+    }
+
+
+def test_fit_matches_least_squares():
+    rng = np.random.default_rng(19)
+    for _ in range(50):
+        size = int(rng.integers(5, 200))
+        days = 19000 + np.cumsum(rng.integers(1, 3, size))
+        values = 8000 + 20 * (days - days[0]) + 1500 * ((days + 3) % 7 >= 5) + rng.normal(0, 800, size)
+        values[rng.random(size) < 0.15] = 0
+        window = int(rng.integers(14, 120))
+        index = TrendSeasonIndex(days, values)
+        model = index.fit(size, window)
+        expected = _brute_force(days, values, window, 30, 1.96)
+        if expected is None:
+            assert model is None
+            continue
+        got = model.forecast(30, 1.96)
+        assert got['dates'][0] == np.datetime64(int(days[-1]) + 1, 'D')
+        for key in ['mean', 'lower', 'upper']:
+            np.testing.assert_allclose(got[key], expected[key], rtol=1e-6, atol=1e-3)
+
+
+def test_extend_matches_building_at_once():
+    rng = np.random.default_rng(7)
+    days = 19000 + np.arange(120)
+    values = rng.integers(0, 15000, 120).astype(np.float64)
+    whole = TrendSeasonIndex(days, values)
+    parts = TrendSeasonIndex(days[:50], values[:50])
+    parts.extend(days[50:], values[50:])
+    np.testing.assert_allclose(parts.xtx, whole.xtx)
+    np.testing.assert_allclose(parts.xty, whole.xty)
+    np.testing.assert_allclose(parts.yty, whole.yty)
+
+
+def test_forecast_steps_matches_least_squares(fitness_df, shuffled_df):
+    for end_date in [None, '2022-02-15', '2022-01-03']:
+        rows = rows_between(fitness_df, None, end_date)
+        days = rows['Fecha'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        values = rows['Recuento de pasos'].to_numpy(dtype=np.float64, na_value=0.0)
+        expected = _brute_force(days, values, FORECAST['window'], FORECAST['horizon'], FORECAST['z'])
+        for df in [fitness_df, shuffled_df]:
+            got = forecast_steps(df, end_date)
+            for key in ['mean', 'lower', 'upper']:
+                np.testing.assert_allclose(got[key], expected[key], rtol=1e-6, atol=1e-3)
@@ -0,0 +1,42 @@
+"""
+Pruebas de las estadísticas móviles frente al cálculo ventana a ventana
+"""
+import numpy as np
+import pytest
+from config.settings import ROLLING_OVERLAYS
+from src.utils.rolling import rolling_stat, QUANTILES
+from src.utils.data_loader import rolling_overlays, filter_data_by_date
+
+
+def _brute_force(values, stat, window):
+    """Estadístico de los días con dato (> 0) de cada ventana, recorriéndolas una a una"""
+    result = np.full(len(values), np.nan)
+    for row in range(len(values)):
+        block = values[max(row - window + 1, 0):row + 1]
+        block = block[block > 0]
+        if len(block):
+            result[row] = block.mean() if stat == 'mean' else np.quantile(block, QUANTILES[stat])
+    return result
+
+
+@pytest.mark.parametrize('stat', ['mean', *QUANTILES])
+@pytest.mark.parametrize('window', [1, 3, 7, 30])
+def test_rolling_stat_matches_brute_force(stat, window):
+    rng = np.random.default_rng(window)
+    for size in [0, 1, 5, 60]:
+        values = rng.integers(0, 50, size).astype(np.float64)
+        values[rng.random(size) < 0.3] = 0
+        values[rng.random(size) < 0.1] = np.nan
+        np.testing.assert_allclose(rolling_stat(values, stat, window), _brute_force(values, stat, window))
+
+
+def test_rolling_overlays_are_slices_of_whole_series(fitness_df):
+    """Las ventanas de un rango incluyen los días anteriores al rango"""
+    spec = ROLLING_OVERLAYS['steps-trend']
+    values = fitness_df[spec['column']].to_numpy(dtype=np.float64, na_value=np.nan)
+    rows = fitness_df.index.get_indexer(filter_data_by_date(fitness_df, '2022-01-10', '2022-02-10').index)
+    overlays = rolling_overlays(fitness_df, 'steps-trend', '2022-01-10', '2022-02-10')
+    assert [(o['stat'], o['window']) for o in overlays] == spec['stats']
+    for overlay in overlays:
+        expected = _brute_force(values, overlay['stat'], overlay['window'])[rows]
+        np.testing.assert_allclose(overlay['values'], expected)
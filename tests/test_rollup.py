@@ -0,0 +1,40 @@
+"""
+Pruebas del cubo de agregados frente a groupby sobre las filas del rango
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.data_loader import aggregate_by_period
+from tests.conftest import rows_between
+
+
+# Claves numéricas de cada nivel (columnas del resultado) y cómo obtenerlas de la fecha
+GROUP_KEYS = {
+    'year': (['Año'], lambda dates: [dates.dt.year]),
+    'month': (['Año', 'Mes'], lambda dates: [dates.dt.year, dates.dt.month]),
+    'week': (['AñoISO', 'SemanaISO'], lambda dates: [dates.dt.isocalendar()['year'], dates.dt.isocalendar()['week']]),
+    'weekday': (['DíaSemanaNum'], lambda dates: [dates.dt.dayofweek])
+}
+
+
+@pytest.mark.parametrize('level', list(GROUP_KEYS))
+def test_aggregate_matches_groupby(fitness_df, shuffled_df, date_range, level):
+    keys, group_keys = GROUP_KEYS[level]
+    rows = rows_between(fitness_df, *date_range)
+    steps = rows['Recuento de pasos'].fillna(0)
+    values = pd.DataFrame({
+        'Recuento de pasos': steps,
+        'Distancia_km': rows['Distancia_km'].fillna(0),
+        'dias_activos': (steps > 0).astype(np.int64),
+        'dias': 1
+    })
+    expected = values.groupby(group_keys(rows['Fecha'])).sum()
+    if level == 'weekday':
+        expected = expected.reindex(range(7), fill_value=0)
+    expected_keys = np.array(expected.index.tolist(), dtype=np.int64).reshape(len(expected), len(keys))
+
+    for df in [fitness_df, shuffled_df]:
+        got = aggregate_by_period(df, level, *date_range).sort_values(keys)
+        np.testing.assert_array_equal(got[keys].to_numpy(np.int64), expected_keys)
+        for col in values.columns:
+            np.testing.assert_allclose(got[col].to_numpy(np.float64), expected[col].to_numpy(np.float64), rtol=1e-6)
@@ -0,0 +1,22 @@
+"""
+Pruebas de las series enviadas al navegador
+"""
+import numpy as np
+from src.visualizations.series_payload import build_series_payload, _plain_values
+
+
+def test_plain_values_keep_float32_shortest_repr():
+    values = np.array([3.36, 17.86, np.nan, 72.5], dtype=np.float32)
+    assert _plain_values(values) == [3.36, 17.86, None, 72.5]
+    assert _plain_values(np.array([1.0, 2.0], dtype=np.float32)) == [1, 2]
+
+
+def test_payload_values_round_trip_to_frame_values(fitness_df):
+    """Cada valor enviado vuelve al float32 de la columna sin ruido de float64"""
+    speed = build_series_payload(fitness_df)['speed-analysis']['figure']['data'][0]
+    column = fitness_df['Velocidad_kmh'].to_numpy()
+    column = column[column > 0]
+    assert column.dtype == np.float32
+    sent = np.array([np.nan if value is None else value for value in speed['y']], dtype=np.float32)
+    np.testing.assert_array_equal(sent, column)
+    assert all(repr(value) == str(np.float32(value)) for value in speed['y'] if value is not None)
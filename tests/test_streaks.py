@@ -0,0 +1,75 @@
+"""
+Pruebas de las rachas frente a recorrer los días uno a uno
+"""
+import numpy as np
+import pandas as pd
+from config.settings import GOALS, STREAKS, STREAK_GAP_BINS
+from src.utils.streaks import StreakIndex
+from src.utils.data_loader import streak_stats
+from tests.conftest import rows_between
+
+
+def _brute_force(flagged, first_day, last_day):
+    """Rachas y huecos recorriendo cada día natural de first_day a last_day"""
+    runs, gaps = [], []
+    current_run = current_gap = 0
+    for day in range(first_day, last_day + 1):
+        if day in flagged:
+            if current_gap:
+                gaps.append(current_gap)
+            current_gap = 0
+            if not current_run:
+                runs.append([day, 0])
+            current_run += 1
+            runs[-1][1] = current_run
+        else:
+            current_run = 0
+            current_gap += 1
+    if current_gap:
+        gaps.append(current_gap)
+
+    longest = max(runs, key=lambda run: run[1]) if runs else None
+    return {
+        'days': sum(length for _, length in runs),
+        'runs': len(runs),
+        'longest': longest[1] if longest else 0,
+        'longest_start': longest[0] if longest else None,
+        'current': current_run,
+        'longest_gap': max(gaps, default=0),
+        'gaps': [sum(1 for gap in gaps if low <= gap < high)
+                 for low, high in zip(STREAK_GAP_BINS, [*STREAK_GAP_BINS[1:], np.inf])]
+    }
+
+
+def test_query_matches_day_by_day_walk():
+    rng = np.random.default_rng(21)
+    for _ in range(200):
+        size = int(rng.integers(0, 50))
+        days = np.sort(rng.choice(np.arange(100), size=size, replace=False))
+        flags = rng.random((size, 2)) < 0.6
+        index = StreakIndex(days, flags, ['a', 'b'])
+        for _ in range(5):
+            first_day, last_day = sorted(rng.integers(-5, 105, 2))
+            for column, name in enumerate(['a', 'b']):
+                flagged = set(days[flags[:, column]].tolist())
+                assert index.query(name, first_day, last_day) == _brute_force(flagged, first_day, last_day)
+
+
+def test_streak_stats_match_day_by_day_walk(fitness_df, shuffled_df, date_range):
+    rows = rows_between(fitness_df, *date_range)
+    days = rows['Fecha'].to_numpy().astype('datetime64[D]').astype(np.int64)
+    first_day, last_day = (int(days[0]), int(days[-1])) if len(days) else (0, -1)
+    values = {
+        'daily_steps': rows['Recuento de pasos'].fillna(0).to_numpy(),
+        'daily_distance': rows['Distancia_km'].fillna(0).to_numpy(),
+        'daily_calories': rows['Calorías (kcal)'].fillna(0).to_numpy()
+    }
+    expected = {}
+    for name, streak in STREAKS.items():
+        met = values['daily_steps'] > 0 if streak['goal'] is None else values[streak['goal']] >= GOALS[streak['goal']]
+        expected[name] = _brute_force(set(days[met].tolist()), first_day, last_day)
+        if expected[name]['longest_start'] is not None:
+            expected[name]['longest_start'] = pd.Timestamp(np.datetime64(expected[name]['longest_start'], 'D'))
+
+    assert streak_stats(fitness_df, *date_range) == expected
+    assert streak_stats(shuffled_df, *date_range) == expected
@@ -0,0 +1,60 @@
+"""
+Pruebas de la importación de Takeout con un CSV por día (inglés y español)
+"""
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.takeout_loader import load_takeout_intervals, reduce_to_daily
+from src.utils.data_loader import load_fitness_data
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+# Mismos intervalos con las cabeceras de cada idioma: (directorio, columnas de
+# peso medio, velocidad máxima, velocidad mínima, FC media y pasos)
+EXPORTS = {
+    'en': ('takeout_en', 'Average weight (kg)', 'Max speed (m/s)', 'Min speed (m/s)',
+           'Average heart rate (bpm)', 'Step count'),
+    'es': ('takeout_es', 'Peso medio (kg)', 'Velocidad máxima (m/s)', 'Velocidad mínima (m/s)',
+           'Frecuencia cardiaca media (ppm)', 'Recuento de pasos')
+}
+
+
+@pytest.mark.parametrize('language', list(EXPORTS))
+def test_reduce_to_daily_by_column_kind(language):
+    directory, weight, max_speed, min_speed, heart_rate, steps = EXPORTS[language]
+    intervals = load_takeout_intervals(os.path.join(FIXTURES, directory), workers=1, use_cache=False)
+    daily = reduce_to_daily(intervals).set_index('Date')
+
+    assert list(daily.index) == ['2024-01-15', '2024-01-16']
+    assert daily[weight].tolist() == [70.0, 71.5]
+    assert daily[max_speed].tolist() == [3.0, 2.5]
+    assert daily[min_speed].tolist() == [0.25, 0.75]
+    assert daily[heart_rate].tolist() == [90.0, 100.0]
+    assert daily[steps].tolist() == [2400, 2000]
+
+
+@pytest.mark.parametrize('language', list(EXPORTS))
+def test_interval_times_in_both_languages(language):
+    intervals = load_takeout_intervals(os.path.join(FIXTURES, EXPORTS[language][0]), workers=1, use_cache=False)
+    first = intervals.iloc[0]
+    assert first['Start time'] == pd.Timestamp('2024-01-15 08:00')
+    assert first['End time'] == pd.Timestamp('2024-01-15 08:15')
+    # El intervalo de las 23:45 termina a medianoche del día siguiente
+    last_of_day = intervals[intervals['Date'] == pd.Timestamp('2024-01-15')].iloc[-1]
+    assert last_of_day['End time'] == pd.Timestamp('2024-01-16 00:00')
+    assert 'Hora de inicio' not in intervals.columns
+
+
+def test_both_languages_load_the_same_frame():
+    """El DataFrame del dashboard es el mismo con las dos exportaciones"""
+    frames = [
+        load_fitness_data(os.path.join(FIXTURES, directory), use_cache=False)
+        for directory, *_ in EXPORTS.values()
+    ]
+    columns = ['Fecha', 'Recuento de pasos', 'Distancia_km', 'Calorías (kcal)', 'Recuento de Minutos Activos',
+               'Peso medio (kg)', 'Frecuencia cardiaca media (ppm)', 'Velocidad_kmh', 'Velocidad_max_kmh']
+    pd.testing.assert_frame_equal(frames[0][columns], frames[1][columns])
+    assert np.allclose(frames[1]['Peso medio (kg)'], [70.0, 71.5])
+    assert np.allclose(frames[1]['Velocidad_max_kmh'], [3.0 * 3.6, 2.5 * 3.6])
@@ -0,0 +1,36 @@
+"""
+Pruebas del índice de umbrales frente a contar con máscaras
+"""
+import numpy as np
+from config.settings import GOALS
+from src.utils.threshold_index import ThresholdIndex
+from src.utils.data_loader import count_days_at_least
+from tests.conftest import rows_between
+
+
+def test_count_at_least_matches_brute_force():
+    rng = np.random.default_rng(17)
+    for _ in range(200):
+        size = int(rng.integers(0, 60))
+        values = rng.integers(0, 20, size).astype(np.float64)
+        values[rng.random(size) < 0.1] = np.nan
+        cuts = np.sort(rng.choice(np.arange(1, size), size=min(size - 1, 4), replace=False)) if size > 1 else []
+        index = ThresholdIndex(values, [0, *cuts, size])
+        for _ in range(10):
+            start, end = sorted(rng.integers(0, size + 1, 2))
+            threshold = rng.integers(-1, 22)
+            assert index.count_at_least(threshold, start, end) == np.count_nonzero(values[start:end] >= threshold)
+
+
+def test_count_days_at_least_matches_masks(fitness_df, shuffled_df, date_range):
+    rows = rows_between(fitness_df, *date_range)
+    for scale in [0.5, 1, 1.5]:
+        goals = {goal: value * scale for goal, value in GOALS.items()}
+        expected = {
+            'active_days': int((rows['Recuento de pasos'] > 0).sum()),
+            'steps': int((rows['Recuento de pasos'] >= goals['daily_steps']).sum()),
+            'distance': int((rows['Distancia_km'] >= goals['daily_distance']).sum()),
+            'calories': int((rows['Calorías (kcal)'] >= goals['daily_calories']).sum())
+        }
+        assert count_days_at_least(fitness_df, goals, *date_range) == expected
+        assert count_days_at_least(shuffled_df, goals, *date_range) == expected